@@ -17,7 +17,7 @@ class CareerGoalAnalyzerAgent:
         return [
             f"https://www.indeed.com/jobs?q={q}",
             f"https://www.linkedin.com/jobs/search/?keywords={q}",
-            #f"https://www.glassdoor.com/Job/jobs.htm?sc.keyword={q}"
+            f"https://www.glassdoor.com/Job/jobs.htm?sc.keyword={q}"
         ]
         
     def create_job_market_analyzer_agent(self):
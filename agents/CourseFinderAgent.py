@@ -5,7 +5,7 @@ from textwrap import dedent
 from agents.tools.course_website_crawler import crawl_course_websites
 from urllib.parse import quote_plus
 import json
-from typing import List
+from typing import Dict, List
 from agents.tools import async_course_crawler
 
 
@@ -103,6 +103,10 @@ from agents.tools import async_course_crawler
 
 
 class CourseFinderAgent:
+    # Platforms crawled per skill (the first N of _generate_course_urls)
+    PLATFORMS_PER_SKILL = 2
+    PLATFORMS = ["coursera", "udemy", "edx"]
+
     def __init__(self):
         self.llm = ChatOpenAI(model="gpt-4o-mini", temperature=0.0)
         
@@ -114,6 +118,34 @@ class CourseFinderAgent:
             f"https://www.udemy.com/courses/search/?q={q}",
             f"https://www.edx.org/search?q={q}",
         ]
+
+    @classmethod
+    def searched_platforms(cls) -> List[str]:
+        """Platforms actually crawled for each skill"""
+        return cls.PLATFORMS[:cls.PLATFORMS_PER_SKILL]
+
+    @classmethod
+    def platform_of(cls, course: Dict) -> str:
+        """Best-effort platform name for a course, 'other' if unknown"""
+        if not isinstance(course, dict):
+            return "other"
+        hint = f"{course.get('platform', '')} {course.get('course_url') or course.get('url') or ''}".lower()
+        for platform in cls.PLATFORMS:
+            if platform in hint:
+                return platform
+        return "other"
+
+    def group_by_platform(self, courses: List[Dict]) -> Dict[str, List[Dict]]:
+        """
+        Split courses by platform; every searched platform gets an entry, even if empty.
+        Courses from platforms that weren't searched go under 'other', since the
+        per-skill cache only reads back the searched platforms and 'other'.
+        """
+        grouped = {platform: [] for platform in self.searched_platforms() + ["other"]}
+        for course in courses:
+            platform = self.platform_of(course)
+            grouped[platform if platform in grouped else "other"].append(course)
+        return grouped
         
     def create_course_discovery_agent(self):
         return Agent(
@@ -132,7 +164,7 @@ class CourseFinderAgent:
         all_urls = []
         for skill in missing_skills[:2]:  # Limit to 2 skills
             urls = self._generate_course_urls(skill)
-            all_urls.extend(urls[:2])  # Only 2 platforms per skill
+            all_urls.extend(urls[:self.PLATFORMS_PER_SKILL])
         
         return Task(
             description=f"""
@@ -3,6 +3,41 @@ from crewai import Agent, Task, Crew
 from langchain_openai import ChatOpenAI
 from textwrap import dedent
 import json
+from agents.direct_llm import run_with_mode, structured_call
+
+EVALUATION_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "top_courses": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "index": {"type": "integer"},
+                    "score": {"type": "number"},
+                    "strengths": {"type": "array", "items": {"type": "string"}},
+                    "weaknesses": {"type": "array", "items": {"type": "string"}},
+                },
+                "required": ["index", "score", "strengths", "weaknesses"],
+                "additionalProperties": False,
+            },
+        },
+        "learning_path": {"type": "string"},
+    },
+    "required": ["top_courses", "learning_path"],
+    "additionalProperties": False,
+}
+# Course fields shown to the model in direct mode, each read from the first key present (the
+# same fallbacks the local ranker accepts); descriptions are cut to keep the prompt small
+_PROMPT_FIELDS = {
+    "course_title": ("course_title", "title"),
+    "platform": ("platform",),
+    "rating": ("rating",),
+    "price": ("price",),
+    "duration": ("duration",),
+    "course_description": ("course_description", "description"),
+}
+_DESCRIPTION_CHARS = 300
 
 class EvaluatorAgent:
     def __init__(self):
@@ -26,7 +61,7 @@ class EvaluatorAgent:
             Evaluate these courses for learning these skills: {missing_skills}
             
             Courses to evaluate:
-            {json.dumps(courses, indent=2)}
+            {json.dumps(courses, separators=(",", ":"))}
             
             Evaluate based on:
             - Relevance to missing skills
@@ -50,6 +85,56 @@ class EvaluatorAgent:
     
 
     def run(self, missing_skills, courses):
+        """Evaluation in the configured mode (EVALUATOR_MODE / AGENT_MODE)"""
+        return run_with_mode(
+            "evaluator",
+            lambda: self.run_direct(missing_skills, courses),
+            lambda: self.run_agentic(missing_skills, courses)
+        )
+
+    @staticmethod
+    def _prompt_fields(course):
+        fields = {}
+        for name, keys in _PROMPT_FIELDS.items():
+            value = next((course[k] for k in keys if course.get(k)), None)
+            if value:
+                fields[name] = str(value)[:_DESCRIPTION_CHARS]
+        return fields
+
+    def run_direct(self, missing_skills, courses):
+        """
+        One structured LLM call. The model ranks courses by index, and the chosen
+        courses are copied from the input, so titles and URLs can't be altered.
+        """
+        if not courses:
+            return {"top_courses": [], "learning_path": ""}
+        listing = [
+            {"index": i, **self._prompt_fields(c)} for i, c in enumerate(courses)
+        ]
+        result = structured_call(self.llm, f"""
+            Evaluate these courses for learning these skills: {missing_skills}
+
+            Courses to evaluate (JSON lines):
+            {chr(10).join(json.dumps(c, separators=(',', ':')) for c in listing)}
+
+            Judge relevance to the missing skills, quality indicators, difficulty, practical
+            applicability and value for money. Return the 5 best courses, best first, by their
+            index with an overall score (1-10), strengths and weaknesses, plus a short learning
+            path recommendation covering the order to take them in.
+            """, "course_evaluation", EVALUATION_SCHEMA)
+
+        top_courses, seen = [], set()
+        for ranked in result["top_courses"]:
+            index = ranked["index"]
+            if 0 <= index < len(courses) and index not in seen:
+                seen.add(index)
+                top_courses.append({**courses[index], "score": ranked["score"],
+                                    "strengths": ranked["strengths"], "weaknesses": ranked["weaknesses"]})
+        if not top_courses:
+            raise ValueError("evaluation ranked no valid courses")
+        return {"top_courses": top_courses[:5], "learning_path": result["learning_path"]}
+
+    def run_agentic(self, missing_skills, courses):
         agent = self.create_evaluation_specialist_agent()
         task = self.create_evaluation_task(agent, missing_skills, courses)
         
@@ -3,31 +3,37 @@ from crewai import Agent, Task, Crew
 from langchain_openai import ChatOpenAI
 from textwrap import dedent
 import json
-from agents.tools.analyze_resume_text import analyze_resume_text  # Import the new tool
+from agents.tools.analyze_resume_text import make_resume_skills_tool
+from agents.direct_llm import run_with_mode, structured_call
+
+SKILLS_SCHEMA = {
+    "type": "object",
+    "properties": {"skills": {"type": "array", "items": {"type": "string"}}},
+    "required": ["skills"],
+    "additionalProperties": False,
+}
 
 class ResumeSkillExtractorAgent:
     def __init__(self):
         self.llm = ChatOpenAI(model="gpt-4o-mini", temperature=0.0)
         
-    def create_resume_analyzer_agent(self):
+    def create_resume_analyzer_agent(self, resume_text):
         return Agent(
             role="Resume Analysis Specialist",
             goal="Extract and categorize technical skills from resume text",
             backstory="""You are an expert HR professional and resume analyst who specializes in 
             identifying technical skills from resume content using advanced analysis tools.""",
-            tools=[analyze_resume_text],  # Add the tool here
+            tools=[make_resume_skills_tool(resume_text)],
             verbose=True,
             llm=self.llm,
             allow_delegation=False
         )
     
-    def create_skill_extraction_task(self, agent, resume_text):
+    def create_skill_extraction_task(self, agent):
+        # The resume itself is bound to the tool, so it isn't sent to the model twice
         return Task(
-            description=f"""
-            Use the analyze_resume_text tool to extract technical skills from this resume:
-            
-            Resume Text:
-            {resume_text}
+            description="""
+            Use the analyze_resume tool (it takes no input) to extract technical skills from the candidate's resume.
             
             The tool will return a JSON array of technical skills. Use that result directly.
             """,
@@ -36,8 +42,28 @@ class ResumeSkillExtractorAgent:
         )
     
     def run(self, resume_text):
-        agent = self.create_resume_analyzer_agent()
-        task = self.create_skill_extraction_task(agent, resume_text)
+        """Skills in the configured mode (RESUME_EXTRACTOR_MODE / AGENT_MODE)"""
+        return run_with_mode(
+            "resume_extractor",
+            lambda: self.run_direct(resume_text),
+            lambda: self.run_agentic(resume_text)
+        )
+
+    def run_direct(self, resume_text):
+        """One structured LLM call instead of the agent -> tool -> answer round trips"""
+        result = structured_call(self.llm, f"""
+            Extract ONLY the technical skills from this resume: programming languages, frameworks
+            and tools, databases, cloud platforms and other technical skills. Use each skill's
+            common name (e.g. "Python", "React", "AWS", "Docker") and list each skill once.
+
+            Resume Text:
+            {resume_text}
+            """, "resume_skills", SKILLS_SCHEMA)
+        return [skill.strip() for skill in result["skills"] if skill.strip()]
+
+    def run_agentic(self, resume_text):
+        agent = self.create_resume_analyzer_agent(resume_text)
+        task = self.create_skill_extraction_task(agent)
         
         crew = Crew(
             agents=[agent],
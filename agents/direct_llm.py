@@ -0,0 +1,84 @@
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Tuple
+
+# "agentic" runs the crewai Agent/Task/Crew loop; "direct" makes one schema-constrained LLM call
+# and falls back to the crew if that call fails. AGENT_MODE applies to every agent unless
+# overridden per agent, e.g. RESUME_EXTRACTOR_MODE=direct or EVALUATOR_MODE=agentic.
+AGENT_MODES = ("agentic", "direct")
+AGENT_MODE = os.getenv('AGENT_MODE', 'agentic').lower()
+
+
+def agent_mode(agent: str) -> str:
+    """Configured execution mode for one agent ("resume_extractor", "evaluator", ...)"""
+    mode = os.getenv(f"{agent.upper()}_MODE", AGENT_MODE).lower()
+    if mode not in AGENT_MODES:
+        print(f"Unknown mode '{mode}' for {agent}, using agentic")
+        return "agentic"
+    return mode
+
+
+def structured_call(llm, prompt: str, name: str, schema: Dict[str, Any]) -> Dict[str, Any]:
+    """One LLM call whose response is constrained to the JSON schema (OpenAI strict structured outputs)"""
+    structured = llm.with_structured_output(
+        {"name": name, "schema": schema, "strict": True}, method="json_schema"
+    )
+    result = structured.invoke(prompt)
+    if not isinstance(result, dict):
+        raise ValueError(f"{name}: expected a JSON object, got {type(result).__name__}")
+    return result
+
+
+class AgentLatency:
+    """Call counts and latency per agent and execution mode (thread-safe; agents run in the pipeline pool)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats: Dict[Tuple[str, str], Dict[str, float]] = {}
+
+    def record(self, agent: str, mode: str, seconds: float, ok: bool = True):
+        with self._lock:
+            entry = self._stats.setdefault((agent, mode), {"calls": 0, "failures": 0, "seconds": 0.0, "max_seconds": 0.0})
+            entry["calls"] += 1
+            entry["failures"] += 0 if ok else 1
+            entry["seconds"] += seconds
+            entry["max_seconds"] = max(entry["max_seconds"], seconds)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            result: Dict[str, Dict[str, Any]] = {}
+            for (agent, mode), entry in sorted(self._stats.items()):
+                result.setdefault(agent, {"mode": agent_mode(agent)})[mode] = {
+                    "calls": entry["calls"],
+                    "failures": entry["failures"],
+                    "avg_seconds": round(entry["seconds"] / entry["calls"], 3),
+                    "max_seconds": round(entry["max_seconds"], 3),
+                }
+            return result
+
+
+agent_latency = AgentLatency()
+
+
+def _timed(agent: str, mode: str, func: Callable[[], Any]) -> Any:
+    start = time.perf_counter()
+    try:
+        result = func()
+    except Exception:
+        agent_latency.record(agent, mode, time.perf_counter() - start, ok=False)
+        raise
+    seconds = time.perf_counter() - start
+    agent_latency.record(agent, mode, seconds)
+    print(f"{agent} ({mode}) took {seconds:.2f}s")
+    return result
+
+
+def run_with_mode(agent: str, direct: Callable[[], Any], agentic: Callable[[], Any]) -> Any:
+    """Run the agent's configured mode; a failed direct call falls back to the agentic path"""
+    if agent_mode(agent) == "direct":
+        try:
+            return _timed(agent, "direct", direct)
+        except Exception as e:
+            print(f"{agent} direct call failed, falling back to the crew: {e}")
+    return _timed(agent, "agentic", agentic)
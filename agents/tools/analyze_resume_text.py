@@ -5,30 +5,49 @@ import os
 from langchain_openai import ChatOpenAI
 
 
-@tool
-def analyze_resume_text(resume_text: str) -> str:
-    """Analyze resume text and extract technical skills using LLM."""
-    try:
-        llm = ChatOpenAI(model="gpt-4o-mini", temperature=0.0)
-        
-        prompt = f"""
+def build_skill_prompt(resume_text: str) -> str:
+    return f"""
         Analyze this resume text and extract ONLY technical skills. Return a JSON array of skill strings.
-        
+
         Resume Text:
         {resume_text}
-        
+
         Extract:
         - Programming languages (Python, Java, JavaScript, etc.)
         - Tools and frameworks (React, Django, TensorFlow, etc.)
         - Databases (MySQL, MongoDB, PostgreSQL, etc.)
         - Cloud platforms (AWS, Azure, GCP, etc.)
         - Other technical skills
-        
+
         Return ONLY a JSON array like: ["Python", "React", "AWS", "Docker"]
         """
-        
-        response = llm.invoke(prompt)
+
+
+def _analyze(resume_text: str) -> str:
+    try:
+        llm = ChatOpenAI(model="gpt-4o-mini", temperature=0.0)
+        response = llm.invoke(build_skill_prompt(resume_text))
         return response.content
-        
+
     except Exception as e:
-        return f"Error analyzing resume: {str(e)}"
\ No newline at end of file
+        return f"Error analyzing resume: {str(e)}"
+
+
+@tool
+def analyze_resume_text(resume_text: str) -> str:
+    """Analyze resume text and extract technical skills using LLM."""
+    return _analyze(resume_text)
+
+
+def make_resume_skills_tool(resume_text: str):
+    """
+    A tool bound to one resume, called without arguments. The resume then only
+    reaches the model inside the tool's prompt, instead of also being pasted
+    into the task description and echoed back by the agent as the tool input.
+    """
+    @tool("analyze_resume")
+    def analyze_resume() -> str:
+        """Extract the technical skills from the candidate's resume. Takes no input; returns a JSON array."""
+        return _analyze(resume_text)
+
+    return analyze_resume
@@ -0,0 +1,109 @@
+# agents/tools/async_worker.py
+import asyncio
+import concurrent.futures
+import os
+import threading
+from typing import Any, Coroutine, Dict, Optional
+
+# Default deadline for a single tool call submitted from sync code
+TOOL_CALL_TIMEOUT = float(os.getenv('TOOL_CALL_TIMEOUT_SECONDS', 120))
+
+
+class AsyncWorker:
+    """
+    One long-running background event loop that synchronous code (crewai tools)
+    submits coroutines to.
+
+    Async resources such as pooled browsers are created on this loop and reused
+    across calls. Every submission returns a concurrent.futures.Future; cancelling
+    it, or missing the deadline in run(), cancels the task on the loop.
+    """
+
+    def __init__(self, name: str = "tool-worker"):
+        self.name = name
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._submitted = 0
+        self._timed_out = 0
+        self._pending = set()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=self._loop.run_forever, name=self.name, daemon=True)
+                self._thread.start()
+            return self._loop
+
+    def submit(self, coro: Coroutine) -> concurrent.futures.Future:
+        """Schedule a coroutine on the worker loop and return its future"""
+        future = asyncio.run_coroutine_threadsafe(coro, self.loop)
+        self._submitted += 1
+        self._pending.add(future)
+        future.add_done_callback(self._pending.discard)
+        return future
+
+    def run(self, coro: Coroutine, timeout: float = TOOL_CALL_TIMEOUT) -> Any:
+        """
+        Run a coroutine on the worker loop and wait for its result.
+        Raises TimeoutError (after cancelling the task) if the deadline passes.
+        """
+        if self._thread is not None and threading.current_thread() is self._thread:
+            raise RuntimeError("AsyncWorker.run() called from the worker loop; await the coroutine instead")
+
+        future = self.submit(coro)
+        try:
+            return future.result(timeout)
+        except concurrent.futures.TimeoutError:
+            self._timed_out += 1
+            future.cancel()
+            raise TimeoutError(f"Tool call exceeded {timeout}s deadline")
+        except BaseException:
+            future.cancel()
+            raise
+
+    def stop(self, timeout: float = 10):
+        """Cancel outstanding work, stop the loop and wait for its thread"""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop, self._thread = None, None
+        if loop is None:
+            return
+        for future in list(self._pending):
+            future.cancel()
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout)
+        if not thread.is_alive():
+            loop.close()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "running": self._loop is not None,
+            "submitted": self._submitted,
+            "pending": len(self._pending),
+            "timed_out": self._timed_out,
+        }
+
+
+_worker: Optional[AsyncWorker] = None
+_worker_lock = threading.Lock()
+
+
+def get_async_worker() -> AsyncWorker:
+    """Return the process-wide tool worker, creating it on first use"""
+    global _worker
+    with _worker_lock:
+        if _worker is None:
+            _worker = AsyncWorker()
+        return _worker
+
+
+def shutdown_async_worker(timeout: float = 10):
+    """Stop the process-wide tool worker (FastAPI shutdown)"""
+    global _worker
+    with _worker_lock:
+        worker, _worker = _worker, None
+    if worker is not None:
+        worker.stop(timeout)
@@ -0,0 +1,144 @@
+# agents/tools/browser_pool.py
+import asyncio
+import os
+import threading
+from contextlib import asynccontextmanager
+from typing import Any, Dict, List, Optional
+from crawl4ai import AsyncWebCrawler, BrowserConfig
+from agents.tools.async_worker import get_async_worker
+
+
+class _PooledCrawler:
+    """A started crawler plus the bookkeeping used to decide when to recycle it"""
+
+    def __init__(self, crawler: AsyncWebCrawler):
+        self.crawler = crawler
+        self.navigations = 0
+        self.healthy = True
+
+
+class BrowserPool:
+    """
+    Process-wide pool of long-lived headless crawl4ai browsers.
+
+    Browsers are started lazily up to `size`, handed out one caller at a time,
+    and recycled after `max_navigations` page loads or when a health check fails.
+    All pool methods must run on the tool worker loop (see get_async_worker).
+    """
+
+    def __init__(self, size: int = None, max_navigations: int = None):
+        self.size = size or int(os.getenv('BROWSER_POOL_SIZE', 3))
+        self.max_navigations = max_navigations or int(os.getenv('BROWSER_MAX_NAVIGATIONS', 50))
+        self._idle: List[_PooledCrawler] = []
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._started = 0
+        self._recycled = 0
+        self._closed = False
+
+    async def _start_crawler(self) -> _PooledCrawler:
+        crawler = AsyncWebCrawler(config=BrowserConfig(headless=True))
+        await crawler.start()
+        self._started += 1
+        return _PooledCrawler(crawler)
+
+    async def _close_crawler(self, pooled: _PooledCrawler):
+        try:
+            await pooled.crawler.close()
+        except Exception as e:
+            print(f"Error closing browser: {e}")
+
+    def _is_healthy(self, pooled: _PooledCrawler) -> bool:
+        if not pooled.healthy or not getattr(pooled.crawler, 'ready', True):
+            return False
+        # Chromium may have crashed or been killed underneath us
+        strategy = getattr(pooled.crawler, 'crawler_strategy', None)
+        browser = getattr(getattr(strategy, 'browser_manager', None), 'browser', None)
+        if browser is not None and hasattr(browser, 'is_connected'):
+            return browser.is_connected()
+        return True
+
+    async def _checkout(self) -> _PooledCrawler:
+        while self._idle:
+            pooled = self._idle.pop()
+            if self._is_healthy(pooled) and pooled.navigations < self.max_navigations:
+                return pooled
+            self._recycled += 1
+            await self._close_crawler(pooled)
+        return await self._start_crawler()
+
+    async def _checkin(self, pooled: _PooledCrawler):
+        if self._closed or not self._is_healthy(pooled) or pooled.navigations >= self.max_navigations:
+            self._recycled += 1
+            await self._close_crawler(pooled)
+        else:
+            self._idle.append(pooled)
+
+    @asynccontextmanager
+    async def acquire(self):
+        """Borrow a pooled browser (its .crawler is started) for the duration of the block"""
+        if self._closed:
+            raise RuntimeError("Browser pool is shut down")
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.size)
+
+        async with self._semaphore:
+            pooled = await self._checkout()
+            try:
+                yield pooled
+            except (Exception, asyncio.CancelledError):
+                # Errors or a timeout mid-navigation can leave the browser in a bad state
+                pooled.healthy = False
+                raise
+            finally:
+                await self._checkin(pooled)
+
+    async def arun(self, url: str, config) -> Any:
+        """Crawl one URL on a pooled browser"""
+        async with self.acquire() as pooled:
+            pooled.navigations += 1
+            return await pooled.crawler.arun(url=url, config=config)
+
+    async def close(self):
+        """Close every idle browser; browsers in use are closed when returned"""
+        self._closed = True
+        idle, self._idle = self._idle, []
+        for pooled in idle:
+            await self._close_crawler(pooled)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "size": self.size,
+            "idle": len(self._idle),
+            "started": self._started,
+            "recycled": self._recycled,
+            "max_navigations": self.max_navigations,
+            "closed": self._closed,
+        }
+
+
+# Playwright objects are bound to the event loop that created them, so the pool
+# lives on the shared tool worker loop (agents/tools/async_worker.py).
+_browser_pool: Optional[BrowserPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_browser_pool() -> BrowserPool:
+    """Return the shared browser pool, creating it on first use"""
+    global _browser_pool
+    with _pool_lock:
+        if _browser_pool is None:
+            _browser_pool = BrowserPool()
+        return _browser_pool
+
+
+def shutdown_browser_pool(timeout: float = 30):
+    """Close all pooled browsers on the worker loop (FastAPI shutdown)"""
+    global _browser_pool
+    with _pool_lock:
+        pool, _browser_pool = _browser_pool, None
+    if pool is None:
+        return
+    try:
+        get_async_worker().run(pool.close(), timeout=timeout)
+    except Exception as e:
+        print(f"Error shutting down browser pool: {e}")
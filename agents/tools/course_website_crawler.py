@@ -1,9 +1,8 @@
 # agents/tools/course_website_crawler.py
-import asyncio
-import threading
-import queue
-from crawl4ai import AsyncWebCrawler, CrawlerRunConfig, LLMConfig, BrowserConfig, CacheMode, LLMExtractionStrategy
+from crawl4ai import CrawlerRunConfig, LLMConfig, CacheMode, LLMExtractionStrategy
 from crewai.tools.base_tool import tool
+from agents.tools.fetch_engine import iter_crawl
+from agents.tools.async_worker import get_async_worker
 from typing import Dict, List
 import json
 import os
@@ -24,61 +23,42 @@ def crawl_course_websites(course_urls: List[str], skill: str) -> str:
             "course_url": "list of course URLs"
         }
         
-        # Use threading to avoid event loop conflicts
-        result_queue = queue.Queue()
-        
-        def run_async():
-            async def _crawl():
-                browser_config = BrowserConfig(headless=True)
-                crawler_config = CrawlerRunConfig(
-                    cache_mode=CacheMode.BYPASS,
-                    word_count_threshold=1,
-                    page_timeout=60000,
-                    extraction_strategy=LLMExtractionStrategy(
-                        llm_config=LLMConfig(
-                            provider="openai/gpt-4o-mini",
-                            api_token=os.getenv("OPENAI_API_KEY")
-                        ),
-                        schema=schema,
-                        extraction_type="schema",
-                        instruction=f"""Extract course information for learning "{skill}". 
-                        Focus on course titles, descriptions, platforms, ratings, prices, and durations.
-                        Make sure to capture the full course URL for each course found.""",
-                        max_scroll_steps=5
+        # Runs on the shared tool worker loop, reusing pooled browsers
+        async def _crawl():
+            crawler_config = CrawlerRunConfig(
+                cache_mode=CacheMode.BYPASS,
+                word_count_threshold=1,
+                page_timeout=60000,
+                extraction_strategy=LLMExtractionStrategy(
+                    llm_config=LLMConfig(
+                        provider="openai/gpt-4o-mini",
+                        api_token=os.getenv("OPENAI_API_KEY")
                     ),
-                )
-                
-                all_results = []
-                async with AsyncWebCrawler(config=browser_config) as crawler:
-                    for url in course_urls:
-                        try:
-                            result = await crawler.arun(url=url, config=crawler_config)
-                            if result.extracted_content:
-                                all_results.append({
-                                    "url": url,
-                                    "skill": skill,
-                                    "data": result.extracted_content
-                                })
-                        except Exception as e:
-                            print(f"Error crawling {url}: {e}")
-                            continue
-                
-                return json.dumps(all_results)
+                    schema=schema,
+                    extraction_type="schema",
+                    instruction=f"""Extract course information for learning "{skill}". 
+                    Focus on course titles, descriptions, platforms, ratings, prices, and durations.
+                    Make sure to capture the full course URL for each course found.""",
+                    max_scroll_steps=5
+                ),
+            )
             
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            try:
-                result = loop.run_until_complete(_crawl())
-                result_queue.put(result)
-            finally:
-                loop.close()
-        
-        # Run in separate thread
-        thread = threading.Thread(target=run_async)
-        thread.start()
-        thread.join()
+            # Pages are crawled in parallel; results are collected as each one finishes
+            all_results = []
+            async for outcome in iter_crawl(course_urls, crawler_config):
+                result = outcome.get("result")
+                if result is not None and result.extracted_content:
+                    all_results.append({
+                        "url": outcome["url"],
+                        "skill": skill,
+                        "data": result.extracted_content
+                    })
+            
+            return json.dumps(all_results)
         
-        return result_queue.get()
+        return get_async_worker().run(_crawl())
         
+    except TimeoutError:
+        return json.dumps({"error": "Crawling timeout"})
     except Exception as e:
         return f"Error crawling course websites: {str(e)}"
\ No newline at end of file
@@ -0,0 +1,199 @@
+# agents/tools/crawl_cache.py
+import asyncio
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+from urllib.parse import urlparse
+
+import aiohttp
+
+# Hours a crawled page stays fresh, per domain (search results on job boards churn fastest)
+DEFAULT_DOMAIN_TTLS = {
+    "indeed.com": 6,
+    "linkedin.com": 6,
+    "glassdoor.com": 6,
+    "coursera.org": 48,
+    "udemy.com": 48,
+    "edx.org": 48,
+}
+
+
+def _parse_domain_ttls(value: str) -> Dict[str, float]:
+    """Parse CRAWL_CACHE_DOMAIN_TTLS, e.g. "indeed.com=3,coursera.org=72" (hours)"""
+    ttls = {}
+    for item in filter(None, (part.strip() for part in value.split(','))):
+        domain, _, hours = item.partition('=')
+        try:
+            ttls[domain.strip().lower()] = float(hours)
+        except ValueError:
+            print(f"Ignoring invalid crawl cache TTL: {item}")
+    return ttls
+
+
+class CachedCrawlResult:
+    """Stand-in for a crawl4ai CrawlResult built from a cached page"""
+
+    def __init__(self, url: str, page: Dict[str, Any], extracted_content: Optional[str], from_cache: bool = True):
+        self.url = url
+        self.html = page.get("html", "")
+        self.markdown = page.get("markdown", "")
+        self.response_headers = page.get("headers", {})
+        self.extracted_content = extracted_content
+        self.success = True
+        self.from_cache = from_cache
+
+
+class CrawlCache:
+    """
+    Persistent on-disk cache of crawled pages and their extractions.
+
+    Pages (rendered HTML + markdown + validators) are keyed by URL; extractions are
+    keyed by URL and the extraction schema/instruction, and are only served while
+    the page they were extracted from is still the cached one. Stale pages with an
+    ETag or Last-Modified header are revalidated with a conditional GET.
+    Reads and writes (gzip of whole pages) run in a thread, off the shared tool event loop.
+    """
+
+    def __init__(self, directory: str = None):
+        self.directory = Path(directory or os.getenv('CRAWL_CACHE_DIR', '.crawl_cache'))
+        self.enabled = os.getenv('CRAWL_CACHE_ENABLED', 'true').lower() not in ('0', 'false', 'no')
+        self.default_ttl = float(os.getenv('CRAWL_CACHE_TTL_HOURS', 24)) * 3600
+        self.domain_ttls = {
+            domain: hours * 3600
+            for domain, hours in {**DEFAULT_DOMAIN_TTLS, **_parse_domain_ttls(os.getenv('CRAWL_CACHE_DOMAIN_TTLS', ''))}.items()
+        }
+
+    def ttl_for(self, url: str) -> float:
+        host = (urlparse(url).hostname or '').lower()
+        for domain, ttl in self.domain_ttls.items():
+            if host == domain or host.endswith('.' + domain):
+                return ttl
+        return self.default_ttl
+
+    @staticmethod
+    def extraction_key(config) -> Optional[str]:
+        """Identify an extraction by its strategy type, schema and instruction"""
+        strategy = getattr(config, 'extraction_strategy', None)
+        if strategy is None:
+            return None
+        key_data = json.dumps({
+            "strategy": type(strategy).__name__,
+            "schema": getattr(strategy, 'schema', None),
+            "instruction": getattr(strategy, 'instruction', None),
+        }, sort_keys=True, default=str)
+        return hashlib.sha256(key_data.encode()).hexdigest()
+
+    def _path(self, kind: str, *parts: str) -> Path:
+        digest = hashlib.sha256('\n'.join(parts).encode()).hexdigest()
+        return self.directory / kind / digest[:2] / f"{digest}.json.gz"
+
+    def _read(self, path: Path) -> Optional[Dict[str, Any]]:
+        try:
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"Crawl cache read error for {path}: {e}")
+            return None
+
+    def _write(self, path: Path, data: Dict[str, Any]):
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+                json.dump(data, f)
+            os.replace(tmp_path, path)  # Atomic, so readers never see a partial file
+        except Exception as e:
+            print(f"Crawl cache write error for {path}: {e}")
+
+    async def get_page(self, url: str) -> Optional[Dict[str, Any]]:
+        """Cached page for a URL, with 'fresh' set according to the domain TTL"""
+        if not self.enabled:
+            return None
+        page = await asyncio.to_thread(self._read, self._path("pages", url))
+        if page is not None:
+            page["fresh"] = time.time() - page.get("fetched_at", 0) < self.ttl_for(url)
+        return page
+
+    async def put_page(self, url: str, html: str, markdown: str, headers: Dict[str, str] = None) -> Dict[str, Any]:
+        headers = {k.lower(): v for k, v in (headers or {}).items()}
+        page = {
+            "url": url,
+            "html": html or "",
+            "markdown": markdown or "",
+            "headers": headers,
+            "etag": headers.get("etag"),
+            "last_modified": headers.get("last-modified"),
+            "fetched_at": time.time(),
+        }
+        # Extractions are tied to the download they came from, not to later revalidations
+        page["page_version"] = page["fetched_at"]
+        if self.enabled:
+            await asyncio.to_thread(self._write, self._path("pages", url), page)
+        return page
+
+    async def touch_page(self, url: str, page: Dict[str, Any]):
+        """Mark a revalidated page as fresh again without re-downloading it"""
+        page = {k: v for k, v in page.items() if k != "fresh"}
+        page["fetched_at"] = time.time()
+        await asyncio.to_thread(self._write, self._path("pages", url), page)
+
+    async def get_extraction(self, url: str, extraction_key: str, page: Dict[str, Any]) -> Optional[str]:
+        """Cached extracted_content, only if it was produced from this version of the page"""
+        if not self.enabled or not extraction_key or page is None:
+            return None
+        extraction = await asyncio.to_thread(self._read, self._path("extractions", url, extraction_key))
+        if extraction and extraction.get("page_version") == page.get("page_version"):
+            return extraction.get("extracted_content")
+        return None
+
+    async def put_extraction(self, url: str, extraction_key: str, page: Dict[str, Any], extracted_content: str):
+        if not self.enabled or not extraction_key or not extracted_content:
+            return
+        await asyncio.to_thread(self._write, self._path("extractions", url, extraction_key), {
+            "url": url,
+            "page_version": page.get("page_version"),
+            "extracted_content": extracted_content,
+        })
+
+    async def revalidate(self, url: str, page: Dict[str, Any]) -> bool:
+        """
+        Ask the origin whether a stale page changed, using its ETag/Last-Modified.
+        Returns True if it is unchanged (304, or the same ETag), False otherwise.
+        """
+        headers = {}
+        if page.get("etag"):
+            headers["If-None-Match"] = page["etag"]
+        if page.get("last_modified"):
+            headers["If-Modified-Since"] = page["last_modified"]
+        if not headers:
+            return False
+
+        try:
+            timeout = aiohttp.ClientTimeout(total=10)
+            async with aiohttp.ClientSession(timeout=timeout) as session:
+                async with session.get(url, headers=headers, allow_redirects=True) as response:
+                    if response.status == 304:
+                        return True
+                    etag = response.headers.get("ETag")
+                    return response.status == 200 and etag is not None and etag == page.get("etag")
+        except Exception as e:
+            print(f"Revalidation failed for {url}: {e}")
+            return False
+
+
+_crawl_cache: Optional[CrawlCache] = None
+
+
+def get_crawl_cache() -> CrawlCache:
+    """Return the process-wide crawl cache"""
+    global _crawl_cache
+    if _crawl_cache is None:
+        _crawl_cache = CrawlCache()
+    return _crawl_cache
@@ -0,0 +1,101 @@
+# agents/tools/fetch_engine.py
+import asyncio
+import os
+from typing import Any, AsyncIterator, Dict, List
+from agents.tools.browser_pool import get_browser_pool
+from agents.tools.crawl_cache import CachedCrawlResult, get_crawl_cache
+from agents.tools.structured_extractors import get_rule_extractor
+
+# Bounded fan-out shared by every crawl tool
+CRAWL_MAX_CONCURRENCY = int(os.getenv('CRAWL_MAX_CONCURRENCY', 3))
+CRAWL_URL_TIMEOUT = float(os.getenv('CRAWL_URL_TIMEOUT_SECONDS', 90))
+
+
+async def _crawl_with_cache(url: str, config) -> Dict[str, Any]:
+    cache = get_crawl_cache()
+    extraction_key = cache.extraction_key(config)
+    strategy = getattr(config, 'extraction_strategy', None)
+    rule_extractor = get_rule_extractor(url, getattr(strategy, 'schema', None))
+    pool = get_browser_pool()
+
+    page = await cache.get_page(url)
+    if page is not None and not page["fresh"] and await cache.revalidate(url, page):
+        await cache.touch_page(url, page)
+        page["fresh"] = True
+
+    if page is not None and page["fresh"]:
+        extracted_content = await cache.get_extraction(url, extraction_key, page)
+        if extracted_content or extraction_key is None:
+            return {"url": url, "result": CachedCrawlResult(url, page, extracted_content), "success": True, "cached": True}
+    if page is None or not page["fresh"] or not page.get("html"):
+        # Known sites are fetched without the LLM; their HTML goes through the rules below
+        fetch_config = config.clone(extraction_strategy=None) if rule_extractor else config
+        result = await pool.arun(url=url, config=fetch_config)
+        if not getattr(result, 'success', True):
+            return {"url": url, "result": result, "success": False, "cached": False}
+        page = await cache.put_page(
+            url,
+            getattr(result, 'html', ''),
+            str(getattr(result, 'markdown', '') or ''),
+            getattr(result, 'response_headers', None)
+        )
+        if not rule_extractor:
+            await cache.put_extraction(url, extraction_key, page, getattr(result, 'extracted_content', None))
+            return {"url": url, "result": result, "success": True, "cached": False}
+
+    if rule_extractor:
+        extracted_content = rule_extractor(url, page["html"])
+        if extracted_content:
+            await cache.put_extraction(url, extraction_key, page, extracted_content)
+            return {"url": url, "result": CachedCrawlResult(url, page, extracted_content, from_cache=False),
+                    "success": True, "cached": False}
+        print(f"No extraction rules matched {url}, falling back to LLM extraction")
+
+    if not page.get("html"):
+        return {"url": url, "error": "empty page", "success": False}
+
+    # LLM extraction over the stored render, without navigating again
+    result = await pool.arun(url="raw:" + page["html"], config=config)
+    success = bool(getattr(result, 'success', True))
+    if success:
+        await cache.put_extraction(url, extraction_key, page, getattr(result, 'extracted_content', None))
+    return {"url": url, "result": result, "success": success, "cached": False}
+
+
+async def _fetch_one(url: str, config, semaphore: asyncio.Semaphore, timeout: float) -> Dict[str, Any]:
+    async with semaphore:
+        try:
+            return await asyncio.wait_for(_crawl_with_cache(url, config), timeout)
+        except asyncio.TimeoutError:
+            print(f"Timed out crawling {url} after {timeout}s")
+            return {"url": url, "error": "timeout", "success": False}
+        except Exception as e:
+            print(f"Error crawling {url}: {e}")
+            return {"url": url, "error": str(e), "success": False}
+
+
+async def iter_crawl(urls: List[str], config, max_concurrency: int = None,
+                     url_timeout: float = None) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Crawl URLs concurrently on the shared browser pool and yield each outcome as it finishes.
+
+    Each item is {"url", "success", "cached", "result"} or {"url", "success": False, "error"}.
+    Pages and extractions are served from the on-disk crawl cache when fresh, and
+    known sites are extracted by rules before falling back to the LLM strategy.
+    At most `max_concurrency` URLs are in flight, and each gets its own `url_timeout`.
+    Outstanding crawls are cancelled if the consumer stops iterating early.
+    """
+    semaphore = asyncio.Semaphore(max_concurrency or CRAWL_MAX_CONCURRENCY)
+    timeout = url_timeout or CRAWL_URL_TIMEOUT
+    tasks = [asyncio.create_task(_fetch_one(url, config, semaphore, timeout)) for url in dict.fromkeys(urls)]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def crawl_all(urls: List[str], config, **kwargs) -> List[Dict[str, Any]]:
+    """Collect iter_crawl outcomes in completion order"""
+    return [outcome async for outcome in iter_crawl(urls, config, **kwargs)]
@@ -0,0 +1,299 @@
+# agents/tools/structured_extractors.py
+"""
+Deterministic extraction for the course and job sites we crawl.
+
+Each extractor reads rendered HTML (JSON-LD / schema.org first, then per-site
+CSS selectors) and returns the same fields as the LLM extraction schemas in
+the crawl tools. An empty result means "no rule matched" and the caller falls
+back to LLMExtractionStrategy.
+"""
+import json
+import re
+from typing import Any, Callable, Dict, List, Optional
+from urllib.parse import urljoin, urlparse
+
+from bs4 import BeautifulSoup
+
+# Card layouts per site: links that identify a result, plus optional field selectors
+COURSE_SITE_RULES = {
+    "coursera.org": {
+        "platform": "Coursera",
+        "link": re.compile(r"/(learn|specializations|professional-certificates|projects)/"),
+        "instructor": "[class*='partner'], [class*='Partner']",
+    },
+    "udemy.com": {
+        "platform": "Udemy",
+        "link": re.compile(r"/course/"),
+        "instructor": "[class*='instructor'], [data-purpose*='instructor']",
+    },
+    "edx.org": {
+        "platform": "edX",
+        "link": re.compile(r"/(learn|course|certificates|masters|bachelors)/"),
+        "instructor": "[class*='partner'], [class*='school']",
+    },
+}
+
+JOB_SITE_RULES = {
+    "indeed.com": {
+        "title": "h2.jobTitle, a[data-jk] span[title], [class*='jobTitle']",
+        "snippet": "div.job-snippet, [class*='job-snippet'], [data-testid*='snippet']",
+    },
+    "linkedin.com": {
+        "title": "h3.base-search-card__title, [class*='job-card-list__title']",
+        "snippet": "[class*='job-search-card__snippet'], [class*='base-search-card__metadata']",
+    },
+    "glassdoor.com": {
+        "title": "[data-test='job-title'], [class*='JobCard_jobTitle']",
+        "snippet": "[data-test='descSnippet'], [class*='JobCard_jobDescriptionSnippet']",
+    },
+}
+
+# Technical skills recognised in job titles and snippets when JSON-LD has no "skills"
+TECH_SKILL_KEYWORDS = [
+    "Python", "Java", "JavaScript", "TypeScript", "C++", "C#", "Go", "Rust", "Scala", "R", "SQL",
+    "NoSQL", "Bash", "Kotlin", "Swift", "PHP", "Ruby", "HTML", "CSS", "React", "Angular", "Vue",
+    "Node.js", "Django", "Flask", "FastAPI", "Spring", ".NET", "AWS", "Azure", "GCP", "Docker",
+    "Kubernetes", "Terraform", "Ansible", "Jenkins", "CI/CD", "Git", "Linux", "Spark", "Hadoop",
+    "Kafka", "Airflow", "Snowflake", "Databricks", "Tableau", "Power BI", "Excel", "Pandas", "NumPy",
+    "scikit-learn", "TensorFlow", "PyTorch", "Machine Learning", "Deep Learning", "NLP",
+    "Computer Vision", "Statistics", "Data Analysis", "ETL", "PostgreSQL", "MySQL", "MongoDB",
+    "Redis", "Elasticsearch", "GraphQL", "REST", "Microservices", "LLM", "Generative AI",
+]
+
+# Skills that are also ordinary English words ("Go the extra mile", "take rest", "excel at R&D").
+# They only count when written with their exact casing inside a list ("Python, Go, SQL") or in
+# one of the listed unambiguous phrases.
+AMBIGUOUS_SKILLS = {
+    "Go": [r"Golang"],
+    "R": [r"R programming", r"R language", r"RStudio"],
+    "Rust": [],
+    "Swift": [r"SwiftUI"],
+    "Spring": [r"Spring Boot", r"Spring Framework"],
+    "Excel": [r"(?:MS|Microsoft|Advanced) Excel", r"Excel (?:VBA|macros|pivot tables?)"],
+    "REST": [r"REST(?:ful)?\s+(?:APIs?|services?)", r"RESTful"],
+}
+# Separator-delimited list item: preceded by or followed by , ; / ( ) | : or the end of the text
+_LIST_BEFORE = r"(?:(?<=[,;/(|:•])|(?<=[,;/(|:•]\s)|(?<=^))"
+_LIST_AFTER = r"(?=\s?[,;/)|]|\s*$)"
+
+
+def _skill_pattern(skill: str):
+    word = r"(?<![\w+#.])" + re.escape(skill) + r"(?![\w+#&])"
+    if skill not in AMBIGUOUS_SKILLS:
+        return re.compile(word, re.IGNORECASE if len(skill) > 2 else 0)
+    # After a separator, the next word must not continue a sentence ("Go the extra mile")
+    in_list = rf"(?:{_LIST_BEFORE}{word}(?!\s(?!(?:and|or)\b)\w)|{word}{_LIST_AFTER})"
+    phrases = "".join(rf"|(?i:\b{phrase}\b)" for phrase in AMBIGUOUS_SKILLS[skill])
+    return re.compile(in_list + phrases, re.MULTILINE)
+
+
+_SKILL_PATTERNS = [(skill, _skill_pattern(skill)) for skill in TECH_SKILL_KEYWORDS]
+_RATING_RE = re.compile(r"\b([1-5]\.\d)\b(?=\s*(?:\(|stars?|out of|rating|★|\d[\d,.]*\s*(?:reviews|ratings)))", re.IGNORECASE)
+_PRICE_RE = re.compile(r"(?:[$€£₹]\s?\d[\d,]*(?:\.\d{2})?|\bFree\b)", re.IGNORECASE)
+_DURATION_RE = re.compile(r"\b\d+(?:\.\d+)?\s*(?:-\s*\d+\s*)?(?:total\s+)?(?:hours?|hrs?|weeks?|months?)\b", re.IGNORECASE)
+_EXPERIENCE_RE = re.compile(r"\b\d+\+?\s*(?:-\s*\d+\s*)?years?(?:\s+of)?\s+(?:\w+\s+){0,3}experience\b", re.IGNORECASE)
+_EDUCATION_RE = re.compile(r"\b(?:Bachelor'?s?|Master'?s?|Ph\.?D\.?|BS|MS|BA|MBA)\b(?:\s+degree)?(?:\s+in\s+[\w ]{3,40})?")
+
+
+def _domain_rules(url: str, rules: Dict[str, Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    host = (urlparse(url).hostname or "").lower()
+    for domain, site_rules in rules.items():
+        if host == domain or host.endswith("." + domain):
+            return site_rules
+    return None
+
+
+def _text(node) -> str:
+    return re.sub(r"\s+", " ", node.get_text(" ", strip=True)).strip() if node is not None else ""
+
+
+def _as_list(value) -> List[Any]:
+    if value is None:
+        return []
+    return value if isinstance(value, list) else [value]
+
+
+def _name(value) -> str:
+    if isinstance(value, dict):
+        return str(value.get("name", "")).strip()
+    return str(value or "").strip()
+
+
+def extract_json_ld(soup: BeautifulSoup) -> List[Dict[str, Any]]:
+    """All schema.org objects on the page, with @graph and ItemList entries flattened"""
+    objects = []
+
+    def _walk(item):
+        if isinstance(item, list):
+            for entry in item:
+                _walk(entry)
+        elif isinstance(item, dict):
+            objects.append(item)
+            _walk(item.get("@graph"))
+            for element in _as_list(item.get("itemListElement")):
+                _walk(element.get("item", element) if isinstance(element, dict) else element)
+
+    for script in soup.find_all("script", type="application/ld+json"):
+        try:
+            _walk(json.loads(script.string or ""))
+        except (ValueError, TypeError):
+            continue
+    return objects
+
+
+def _types(obj: Dict[str, Any]) -> List[str]:
+    return [str(t) for t in _as_list(obj.get("@type"))]
+
+
+def _empty_course_fields() -> Dict[str, List[str]]:
+    return {
+        "course_titles": [], "course_descriptions": [], "platforms": [], "ratings": [],
+        "prices": [], "durations": [], "instructors": [], "course_url": []
+    }
+
+
+def _add_course(fields, seen, title, description, platform, rating, price, duration, instructor, url):
+    if not title or not url or url in seen:
+        return
+    seen.add(url)
+    fields["course_titles"].append(title)
+    fields["course_descriptions"].append(description)
+    fields["platforms"].append(platform)
+    fields["ratings"].append(rating)
+    fields["prices"].append(price)
+    fields["durations"].append(duration)
+    fields["instructors"].append(instructor)
+    fields["course_url"].append(url)
+
+
+def extract_courses(url: str, html: str) -> Dict[str, List[str]]:
+    """Course search results as the course extraction schema; empty lists if nothing matched"""
+    site_rules = _domain_rules(url, COURSE_SITE_RULES)
+    fields = _empty_course_fields()
+    if not html or site_rules is None:
+        return fields
+
+    soup = BeautifulSoup(html, "html.parser")
+    platform = site_rules["platform"]
+    seen = set()
+
+    # 1) schema.org Course objects
+    for obj in extract_json_ld(soup):
+        if "Course" not in _types(obj):
+            continue
+        rating = obj.get("aggregateRating") or {}
+        offers = _as_list(obj.get("offers"))
+        offer = offers[0] if offers and isinstance(offers[0], dict) else {}
+        price = str(offer.get("price", "")).strip()
+        if price and offer.get("priceCurrency"):
+            price = f"{offer['priceCurrency']} {price}"
+        instance = next((i for i in _as_list(obj.get("hasCourseInstance")) if isinstance(i, dict)), {})
+        instructors = ", ".join(filter(None, (_name(i) for i in _as_list(obj.get("instructor") or instance.get("instructor") or obj.get("creator")))))
+        _add_course(
+            fields, seen,
+            title=_name(obj.get("name")),
+            description=str(obj.get("description", "")).strip(),
+            platform=_name(obj.get("provider")) or platform,
+            rating=str(rating.get("ratingValue", "")) if isinstance(rating, dict) else "",
+            price="Free" if offer.get("category") == "Free" or price in ("0", "0.0") else price,
+            duration=str(obj.get("timeRequired") or instance.get("courseWorkload") or ""),
+            instructor=instructors,
+            url=urljoin(url, str(obj.get("url", ""))) if obj.get("url") else "",
+        )
+
+    # 2) Result cards identified by their course links
+    for link in soup.find_all("a", href=site_rules["link"]):
+        card = link.find_parent(["li", "article"]) or link.find_parent("div", class_=re.compile("card", re.I)) or link
+        heading = card.find(["h2", "h3", "h4"])
+        card_text = _text(card)
+        rating = _RATING_RE.search(card_text)
+        price = _PRICE_RE.search(card_text)
+        duration = _DURATION_RE.search(card_text)
+        instructor = card.select_one(site_rules["instructor"]) if site_rules.get("instructor") else None
+        # First paragraph that isn't the partner/instructor line
+        description = next((p for p in card.find_all("p") if p is not instructor), None)
+        _add_course(
+            fields, seen,
+            title=_text(heading) or _text(link),
+            description=_text(description),
+            platform=platform,
+            rating=rating.group(1) if rating else "",
+            price=price.group(0) if price else "",
+            duration=duration.group(0) if duration else "",
+            instructor=_text(instructor),
+            url=urljoin(url, link["href"].split("?")[0]),
+        )
+    return fields
+
+
+def _skills_in(text: str) -> List[str]:
+    return [skill for skill, pattern in _SKILL_PATTERNS if pattern.search(text)]
+
+
+def extract_jobs(url: str, html: str) -> Dict[str, Any]:
+    """Job search results as the job extraction schema; empty lists if nothing matched"""
+    site_rules = _domain_rules(url, JOB_SITE_RULES)
+    fields = {
+        "job_titles": [], "required_skills": [], "soft_skills": [],
+        "experience_level": "", "education_requirements": ""
+    }
+    if not html or site_rules is None:
+        return fields
+
+    soup = BeautifulSoup(html, "html.parser")
+    titles, texts, skills = [], [], []
+
+    # 1) schema.org JobPosting objects
+    for obj in extract_json_ld(soup):
+        if "JobPosting" not in _types(obj):
+            continue
+        titles.append(_name(obj.get("title")))
+        skills.extend(s.strip() for value in _as_list(obj.get("skills")) for s in str(value).split(","))
+        texts.append(BeautifulSoup(str(obj.get("description", "")), "html.parser").get_text(" "))
+        texts.extend(_name(v) for v in _as_list(obj.get("experienceRequirements")))
+        texts.extend(_name(v) for v in _as_list(obj.get("educationRequirements")))
+
+    # 2) Result cards
+    titles.extend(_text(node) for node in soup.select(site_rules["title"]))
+    texts.extend(_text(node) for node in soup.select(site_rules["snippet"]))
+
+    titles = list(dict.fromkeys(t for t in titles if t))
+    if not titles:
+        return fields
+
+    # One line per title/snippet, so matches don't run from one posting into the next
+    corpus = "\n".join(titles + texts)
+    experience = _EXPERIENCE_RE.search(corpus)
+    education = _EDUCATION_RE.search(corpus)
+    fields.update({
+        "job_titles": titles,
+        "required_skills": list(dict.fromkeys(s for s in skills + _skills_in(corpus) if s)),
+        "experience_level": experience.group(0) if experience else "",
+        "education_requirements": education.group(0) if education else "",
+    })
+    return fields
+
+
+def get_rule_extractor(url: str, schema: Any) -> Optional[Callable[[str, str], Optional[str]]]:
+    """
+    Rule-based extractor for a URL and LLM schema, or None if no rules cover it.
+    The extractor returns extracted_content (a JSON list, like LLMExtractionStrategy) or None.
+    """
+    if not isinstance(schema, dict):
+        return None
+    if "course_titles" in schema and _domain_rules(url, COURSE_SITE_RULES):
+        extract, key = extract_courses, "course_titles"
+    elif "job_titles" in schema and _domain_rules(url, JOB_SITE_RULES):
+        extract, key = extract_jobs, "job_titles"
+    else:
+        return None
+
+    def _extract(page_url: str, html: str) -> Optional[str]:
+        try:
+            fields = extract(page_url, html)
+        except Exception as e:
+            print(f"Rule extraction failed for {page_url}: {e}")
+            return None
+        return json.dumps([fields]) if fields[key] else None
+
+    return _extract
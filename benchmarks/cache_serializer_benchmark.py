@@ -0,0 +1,87 @@
+"""
+Compare cached-payload size and encode/decode time: the previous JSON text
+format against CacheSerializer with each codec, with and without compression.
+
+Run from the repository root:
+    python -m benchmarks.cache_serializer_benchmark [--courses 60] [--rounds 200]
+"""
+import argparse
+import json
+import random
+import time
+from datetime import datetime
+
+from utils.cache_serializer import CacheSerializer, msgpack
+
+PLATFORMS = ["Coursera", "Udemy", "edX"]
+WORDS = ("learn build deploy data model python cloud analysis project hands-on beginner advanced "
+         "machine learning statistics sql pipeline dashboard api testing production course").split()
+
+
+def _sentence(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+
+def sample_payload(n_courses: int, seed: int = 0) -> dict:
+    """A course-evaluation cache entry shaped like set_cached_courses writes"""
+    rng = random.Random(seed)
+    courses = []
+    for i in range(n_courses):
+        platform = rng.choice(PLATFORMS)
+        courses.append({
+            "course_title": f"{_sentence(rng, 5)[:-1]} {i}",
+            "course_description": " ".join(_sentence(rng, 14) for _ in range(3)),
+            "platform": platform,
+            "rating": f"{rng.uniform(3.5, 5):.1f}",
+            "price": rng.choice(["Free", "$19.99", "$49.99", "$89.99"]),
+            "duration": f"{rng.randint(2, 60)} hours",
+            "instructor": f"{rng.choice(['Andrew', 'Jose', 'Angela', 'Kirill'])} {rng.choice(['Ng', 'Portilla', 'Yu'])}",
+            "course_url": f"https://www.{platform.lower()}.org/learn/course-{i}",
+        })
+    top = rng.sample(courses, min(5, n_courses))
+    return {
+        "courses": courses,
+        "recommendations": {"top_5_courses": top, "reasoning": " ".join(_sentence(rng, 20) for _ in range(5))},
+        "timestamp": datetime(2025, 1, 1).isoformat(),
+        "career_goal": "Data Scientist",
+        "missing_skills": ["Machine Learning", "SQL", "Statistics"],
+    }
+
+
+def _time(fn, rounds: int) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        fn()
+    return (time.perf_counter() - start) / rounds * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--courses", type=int, default=60, help="courses in the sample payload")
+    parser.add_argument("--rounds", type=int, default=200, help="encode/decode repetitions per variant")
+    args = parser.parse_args()
+
+    payload = sample_payload(args.courses)
+    variants = [("json text (previous)", lambda v: json.dumps(v).encode(), json.loads)]
+    codecs = ["json"] + (["msgpack"] if msgpack is not None else [])
+    for codec in codecs:
+        for label, threshold in (("", -1), ("+zlib", 0)):
+            serializer = CacheSerializer(codec=codec, compress_min_bytes=threshold)
+            variants.append((f"{codec}{label}", serializer.dumps, serializer.loads))
+    if msgpack is None:
+        print("msgpack not installed; only the JSON codec is compared\n")
+
+    baseline = None
+    print(f"{len(payload['courses'])} courses, {args.rounds} rounds\n")
+    print(f"{'format':<22}{'bytes':>10}{'ratio':>8}{'encode us':>12}{'decode us':>12}")
+    for name, dumps, loads in variants:
+        encoded = dumps(payload)
+        assert loads(encoded) == payload, name
+        baseline = baseline or len(encoded)
+        encode_us = _time(lambda: dumps(payload), args.rounds)
+        decode_us = _time(lambda: loads(encoded), args.rounds)
+        print(f"{name:<22}{len(encoded):>10}{len(encoded) / baseline:>8.2f}{encode_us:>12.1f}{decode_us:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
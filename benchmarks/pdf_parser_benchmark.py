@@ -0,0 +1,117 @@
+"""
+PDF parsing throughput over a generated corpus: inline on the event loop (the
+old behaviour), a thread pool, and the process pool, for each installed backend.
+While parsing, a probe task measures how late the event loop wakes up, which
+is the latency every other request on the worker would see.
+
+Run from the repository root:
+    python -m benchmarks.pdf_parser_benchmark [--pdfs 40] [--pages 8] [--workers 4]
+"""
+import argparse
+import asyncio
+import io
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from PyPDF2 import PdfWriter
+from PyPDF2.generic import DecodedStreamObject, DictionaryObject, NameObject
+
+from utils.pdf_parser import extract_pdf_text, pymupdf
+from utils.pdf_pool import PDFParserPool
+
+WORDS = ("python sql docker kubernetes machine learning statistics led team built pipeline "
+         "deployed api react aws analysis dashboard designed improved latency project").split()
+
+
+def generate_pdf(pages: int, lines_per_page: int = 45, seed: int = 0) -> bytes:
+    """A text-only resume-like PDF with Helvetica text on every page"""
+    rng = random.Random(seed)
+    writer = PdfWriter()
+    font = writer._add_object(DictionaryObject({
+        NameObject("/Type"): NameObject("/Font"),
+        NameObject("/Subtype"): NameObject("/Type1"),
+        NameObject("/BaseFont"): NameObject("/Helvetica"),
+    }))
+    for _ in range(pages):
+        writer.add_blank_page(612, 792)
+        page = writer.pages[-1]
+        lines = [" ".join(rng.choice(WORDS) for _ in range(12)) for _ in range(lines_per_page)]
+        body = "".join(f"({line}) Tj 0 -15 Td " for line in lines)
+        content = DecodedStreamObject()
+        content.set_data(f"BT /F1 10 Tf 50 750 Td {body}ET".encode())
+        page[NameObject("/Contents")] = writer._add_object(content)
+        page[NameObject("/Resources")] = DictionaryObject({
+            NameObject("/Font"): DictionaryObject({NameObject("/F1"): font})
+        })
+    buffer = io.BytesIO()
+    writer.write(buffer)
+    return buffer.getvalue()
+
+
+async def _probe_loop_lag(stop: asyncio.Event, interval: float = 0.01) -> float:
+    worst = 0.0
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        worst = max(worst, time.perf_counter() - start - interval)
+    return worst
+
+
+async def _run(name: str, corpus, parse_all):
+    stop = asyncio.Event()
+    probe = asyncio.create_task(_probe_loop_lag(stop))
+    await asyncio.sleep(0.05)
+    start = time.perf_counter()
+    results = await parse_all(corpus)
+    elapsed = time.perf_counter() - start
+    stop.set()
+    lag = await probe
+    chars = sum(len(r["text"]) for r in results)
+    print(f"{name:<28}{elapsed:>9.2f}{len(corpus) / elapsed:>10.1f}{lag * 1000:>14.0f}{chars:>12}")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pdfs", type=int, default=40, help="PDFs in the corpus")
+    parser.add_argument("--pages", type=int, default=8, help="pages per PDF")
+    parser.add_argument("--workers", type=int, default=4, help="threads / worker processes")
+    args = parser.parse_args()
+
+    corpus = [generate_pdf(args.pages, seed=i) for i in range(args.pdfs)]
+    max_pages, max_chars = args.pages, 10 ** 9
+    backends = ["pypdf2"] + (["pymupdf"] if pymupdf is not None else [])
+    print(f"{args.pdfs} PDFs x {args.pages} pages, {args.workers} workers\n")
+    print(f"{'mode':<28}{'seconds':>9}{'pdf/s':>10}{'max lag ms':>14}{'chars':>12}")
+
+    for backend in backends:
+        async def inline(pdfs):
+            return [extract_pdf_text(io.BytesIO(d), max_pages, max_chars, backend) for d in pdfs]
+
+        threads = ThreadPoolExecutor(args.workers)
+
+        async def threaded(pdfs):
+            loop = asyncio.get_running_loop()
+            return await asyncio.gather(*[
+                loop.run_in_executor(threads, extract_pdf_text, io.BytesIO(d), max_pages, max_chars, backend)
+                for d in pdfs
+            ])
+
+        pool = PDFParserPool(workers=args.workers, timeout=120, backend=backend)
+        # Warm the workers so process start-up isn't counted
+        await asyncio.gather(*[pool.extract(corpus[0], max_pages, max_chars) for _ in range(args.workers)])
+
+        async def processes(pdfs):
+            return await asyncio.gather(*[pool.extract(d, max_pages, max_chars) for d in pdfs])
+
+        await _run(f"{backend} inline", corpus, inline)
+        await _run(f"{backend} threads", corpus, threaded)
+        await _run(f"{backend} process pool", corpus, processes)
+        threads.shutdown()
+        pool.shutdown()
+    if pymupdf is None:
+        print("\nPyMuPDF not installed; install it to compare PDF_PARSER_BACKEND=pymupdf")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
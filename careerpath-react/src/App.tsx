@@ -29,6 +29,43 @@ type AnalyzeResponse = {
 
 const API_BASE = import.meta.env.VITE_API_BASE || 'http://127.0.0.1:8000';
 
+const emptyResult = (careerGoal: string): AnalyzeResponse => ({
+  career_goal: careerGoal,
+  student_skills: [],
+  ideal_skills: [],
+  missing_skills: [],
+  courses_found: 0,
+  top_5_courses: [],
+});
+
+// POSTs the form to /analyze/stream and calls onEvent for every Server-Sent Event received
+const streamAnalyze = async (form: FormData, onEvent: (event: string, data: any) => void) => {
+  const res = await fetch(`${API_BASE}/analyze/stream`, { method: 'POST', body: form });
+  if (!res.ok || !res.body) throw new Error(await res.text());
+
+  const reader = res.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = '';
+  while (true) {
+    const { done, value } = await reader.read();
+    if (done) break;
+    buffer += decoder.decode(value, { stream: true });
+
+    let boundary;
+    while ((boundary = buffer.indexOf('\n\n')) >= 0) {
+      const block = buffer.slice(0, boundary);
+      buffer = buffer.slice(boundary + 2);
+      let event = 'message';
+      let data = '';
+      for (const line of block.split('\n')) {
+        if (line.startsWith('event:')) event = line.slice(6).trim();
+        else if (line.startsWith('data:')) data += line.slice(5).trim();
+      }
+      if (data) onEvent(event, JSON.parse(data));
+    }
+  }
+};
+
 const pickText = (v: any): string => {
   if (!v && v !== 0) return '';
   if (Array.isArray(v)) return v.filter(Boolean).map(String).join(' • ');
@@ -93,10 +130,29 @@ function App() {
       form.append('career_goal', careerGoal);
       form.append('resume', resumeFile, resumeFile.name);
 
-      const res = await fetch(`${API_BASE}/analyze`, { method: 'POST', body: form });
-      if (!res.ok) throw new Error(await res.text());
-      const data: AnalyzeResponse = await res.json();
-      setResult(data);
+      // Partial results are shown as each pipeline stage finishes
+      let finished = false;
+      setResult(emptyResult(careerGoal));
+      await streamAnalyze(form, (event, data) => {
+        if (event === 'error') throw new Error(data.detail || 'Analysis failed.');
+        if (event === 'result') {
+          finished = true;
+          setResult(data as AnalyzeResponse);
+          return;
+        }
+        setResult(prev => {
+          const next = prev ?? emptyResult(careerGoal);
+          if (event === 'student_skills') return { ...next, student_skills: data.skills };
+          if (event === 'ideal_skills') return { ...next, ideal_skills: data.skills };
+          if (event === 'missing_skills') return { ...next, missing_skills: data.skills };
+          if (event === 'courses') {
+            const found = next.top_5_courses.concat(data.courses || []);
+            return { ...next, courses_found: next.courses_found + (data.courses?.length || 0), top_5_courses: found.slice(0, 5) };
+          }
+          return next;
+        });
+      });
+      if (!finished) throw new Error('Connection closed before the analysis finished.');
 
       setTimeout(() => setShowConfetti(true), 250);
       setTimeout(() => setShowConfetti(false), 3500);
@@ -242,7 +298,7 @@ function App() {
               </div>
             )}
 
-            <h3 className="section-title">Top 5 Recommended Courses</h3>
+            <h3 className="section-title">{loading ? 'Courses Found So Far' : 'Top 5 Recommended Courses'}</h3>
             <div className="courses">
               {(result.top_5_courses || []).map((c, idx) => (
                 <div key={idx} className="course-card reveal" style={stagger(idx)}>
@@ -1,19 +1,45 @@
 # fastapi_app.py
 from fastapi import FastAPI, UploadFile, File, Form, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
 from pydantic import BaseModel
-from typing import List, Any, Dict, Optional
+from typing import List, Any, Dict, Optional, Tuple
+from contextlib import asynccontextmanager
 from utils.cache_manager import cache_manager
+from utils.course_ranker import rank_courses
+import asyncio
+import json
+import os
 import time
+import zipfile
 from functools import wraps
 
-from utils.pdf_parser import extract_text_from_pdf
-from agents.ResumeSkillExtractorAgent import ResumeSkillExtractorAgent
-from agents.CareerGoalAnalyzerAgent import CareerGoalAnalyzerAgent
-from agents.CourseFinderAgent import CourseFinderAgent
-from agents.EvaluatorAgent import EvaluatorAgent
+from utils import pipeline
+from utils.job_queue import job_queue
+from utils.pdf_parser import PDFTooLargeError, SpooledPDF, spool_upload
+from utils.pdf_pool import get_pdf_pool, shutdown_pdf_pool
+from agents.tools.browser_pool import get_browser_pool, shutdown_browser_pool
+from agents.tools.async_worker import get_async_worker, shutdown_async_worker
+from agents.direct_llm import agent_latency
+from utils.course_catalog import COURSE_CATALOG_ENABLED, close_course_catalog, get_course_catalog
 
-app = FastAPI(title="Agentic AI Career Coach API", version="1.0.0")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await cache_manager.connect()
+    await get_pdf_pool().start()
+    await job_queue.start(_run_analysis_job)
+    yield
+    await job_queue.stop()
+    await cache_manager.close()
+    # Close pooled browsers before the executor so in-flight crawls can finish cleanly
+    await asyncio.to_thread(shutdown_browser_pool)
+    await asyncio.to_thread(shutdown_async_worker)
+    await asyncio.to_thread(shutdown_pdf_pool)
+    pipeline.shutdown_executor()
+    close_course_catalog()
+
+app = FastAPI(title="Agentic AI Career Coach API", version="1.0.0", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -31,8 +57,23 @@ class AnalyzeResponse(BaseModel):
     courses_found: int
     top_5_courses: List[Dict[str, Any]]
 
-def _select_top_courses(recommendations: Any, courses: Optional[List[Dict]] = None) -> List[Dict]:
-    # Try evaluator output first
+class JobSubmitResponse(BaseModel):
+    job_id: str
+    status: str
+
+class JobStatusResponse(BaseModel):
+    job_id: str
+    status: str
+    career_goal: str
+    stages: Dict[str, str]
+    result: Optional[AnalyzeResponse] = None
+    error: Optional[str] = None
+    created_at: float
+    updated_at: float
+
+def _select_top_courses(recommendations: Any, courses: Optional[List[Dict]] = None,
+                        missing_skills: Optional[List[str]] = None) -> List[Dict]:
+    # Ranker / evaluator output first
     if isinstance(recommendations, dict):
         if "top_courses" in recommendations and isinstance(recommendations["top_courses"], list):
             return recommendations["top_courses"][:5]
@@ -40,14 +81,38 @@ def _select_top_courses(recommendations: Any, courses: Optional[List[Dict]] = No
             return recommendations["courses"][:5]
     if isinstance(recommendations, list):
         return recommendations[:5]
-    # Fallback to raw courses
+    # Unusable evaluator output: rank the raw courses locally
     if courses:
-        return courses[:5]
+        return rank_courses(missing_skills or [], courses)[:5]
     return []
 
+def _build_response(result: Dict[str, Any]) -> AnalyzeResponse:
+    # Pick top 5 courses
+    top_5 = _select_top_courses(result['recommendations'], result['courses'], result['missing_skills'])
+
+    return AnalyzeResponse(
+        career_goal=result['career_goal'],
+        student_skills=result['student_skills'],
+        ideal_skills=result['ideal_skills'],
+        missing_skills=result['missing_skills'],
+        courses_found=len(result['courses']),
+        top_5_courses=top_5
+    )
+
+async def _run_analysis_job(job: Dict[str, Any], resume_bytes: bytes, on_event) -> Dict[str, Any]:
+    result = await pipeline.run_analysis(job['career_goal'], resume_bytes, on_event=on_event)
+    return _build_response(result).model_dump()
+
 @app.get("/health")
 def health():
-    return {"status": "ok"}
+    return {
+        "status": "ok",
+        "browser_pool": get_browser_pool().stats(),
+        "tool_worker": get_async_worker().stats(),
+        "pdf_parser": get_pdf_pool().stats(),
+        "agents": agent_latency.stats(),
+        "course_catalog": get_course_catalog().stats() if COURSE_CATALOG_ENABLED else None
+    }
 
 def track_performance(func):
     @wraps(func)
@@ -60,79 +125,219 @@ def track_performance(func):
         return result
     return wrapper
 
+async def _spool_resume(resume: UploadFile) -> SpooledPDF:
+    """Read an uploaded resume in chunks, rejecting it as soon as it passes the size limit"""
+    try:
+        return await spool_upload(resume)
+    except PDFTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+
 @app.post("/analyze", response_model=AnalyzeResponse)
 @track_performance
 async def analyze_resume(
     career_goal: str = Form(...),
     resume: UploadFile = File(...)
 ):
+    pdf = await _spool_resume(resume)
     try:
-        # 1) Extract resume text
-        resume_bytes = await resume.read()
-        import io
-        resume_text = extract_text_from_pdf(io.BytesIO(resume_bytes))
+        result = await pipeline.run_analysis(career_goal, pdf)
+        return _build_response(result)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        pdf.close()
 
-        # 2) Run agents
-        resume_agent = ResumeSkillExtractorAgent()
-        student_skills = resume_agent.run(resume_text) or []
+SSE_HEARTBEAT_SECONDS = 15
+BATCH_MAX_RESUMES = int(os.getenv('BATCH_MAX_RESUMES', 500))
+BATCH_MAX_RESUME_BYTES = int(os.getenv('BATCH_MAX_RESUME_MB', 10)) * 1024 * 1024
+BATCH_MAX_ZIP_BYTES = int(os.getenv('BATCH_MAX_ZIP_MB', 100)) * 1024 * 1024
+# Resume bytes held for one batch: plain PDFs plus the PDFs unpacked from zips
+BATCH_MAX_TOTAL_BYTES = int(os.getenv('BATCH_MAX_TOTAL_MB', 200)) * 1024 * 1024
+_ZIP_MAGIC = b"PK\x03\x04"
 
-        goal_agent = CareerGoalAnalyzerAgent()
-        ideal_skills = goal_agent.run(career_goal) or []
+def _sse(event: str, data: Any) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
 
-        # 3) Compute missing skills
-        missing_skills = [s for s in ideal_skills if s not in student_skills]
+class _EventStreamResponse(StreamingResponse):
+    """StreamingResponse whose background task also runs when the client disconnects"""
 
-        # 4) Check cache first
-        cached_data = cache_manager.get_cached_courses(career_goal, missing_skills)
-        
-        if cached_data:
-            print(f"Cache hit for {career_goal}")
-            courses = cached_data['courses']
-            recommendations = cached_data['recommendations']
-        else:
-            print(f"Cache miss for {career_goal}, generating new data")
-            # 5) Find courses
-            course_finder = CourseFinderAgent()
-            courses = course_finder.run(missing_skills) or []
-
-            # 6) Evaluate recommendations
-            evaluator = EvaluatorAgent()
-            recommendations = evaluator.run(missing_skills, courses)
-            
-            # 7) Cache the results
-            cache_manager.set_cached_courses(career_goal, missing_skills, courses, recommendations)
-
-        # 8) Pick top 5 courses
-        top_5 = _select_top_courses(recommendations, courses)
-
-        return AnalyzeResponse(
-            career_goal=career_goal,
-            student_skills=student_skills,
-            ideal_skills=ideal_skills,
-            missing_skills=missing_skills,
-            courses_found=len(courses),
-            top_5_courses=top_5
-        )
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    async def __call__(self, scope, receive, send):
+        try:
+            await super().__call__(scope, receive, send)
+        except BaseException:
+            # Starlette skips the background task when sending fails, and the body
+            # generator (with its finally) may never have started
+            if self.background is not None:
+                await self.background()
+            raise
+
+def _event_stream(run, cleanup=None) -> StreamingResponse:
+    """
+    Serve run(on_event) as Server-Sent Events. Every on_event call becomes an
+    event; run's return value, an (event, data) tuple, is sent last. Failures
+    are sent as an "error" event. cleanup() runs once the response is over,
+    however it ended.
+    """
+    events: asyncio.Queue = asyncio.Queue()
+
+    async def on_event(event: str, data: Dict[str, Any]):
+        await events.put((event, data))
+
+    async def produce():
+        try:
+            await events.put(await run(on_event))
+        except Exception as e:
+            await events.put(("error", {"detail": str(e)}))
+        finally:
+            await events.put(None)
+
+    async def stream():
+        task = asyncio.create_task(produce())
+        try:
+            while True:
+                try:
+                    item = await asyncio.wait_for(events.get(), SSE_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"  # Stops proxies from closing an idle stream
+                    continue
+                if item is None:
+                    break
+                yield _sse(*item)
+        finally:
+            task.cancel()
+
+    return _EventStreamResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        background=BackgroundTask(cleanup) if cleanup else None
+    )
+
+@app.post("/analyze/stream")
+async def analyze_resume_stream(
+    career_goal: str = Form(...),
+    resume: UploadFile = File(...)
+):
+    """
+    Server-Sent Events variant of /analyze. Emits stage_started/stage_completed,
+    student_skills, ideal_skills, missing_skills and courses batches as they are
+    ready, then a final "result" event with the AnalyzeResponse (or "error").
+    """
+    pdf = await _spool_resume(resume)
+
+    async def run(on_event):
+        result = await pipeline.run_analysis(career_goal, pdf, on_event=on_event)
+        return "result", _build_response(result).model_dump()
+
+    # Closed when the response ends, even if the client left before the stream started
+    return _event_stream(run, cleanup=pdf.close)
+
+async def _read_batch_upload(upload: UploadFile, budget: int) -> List[Tuple[str, bytes]]:
+    """
+    Resumes in one upload: the PDF itself, or every PDF inside a zip. The upload is
+    spooled in chunks and rejected with 413 as soon as it passes its per-file limit
+    or the `budget` left for the batch, so an oversized file is never held in memory.
+    """
+    filename = upload.filename or "resume.pdf"
+    is_zip = await upload.read(len(_ZIP_MAGIC)) == _ZIP_MAGIC
+    await upload.seek(0)
+    file_limit = BATCH_MAX_ZIP_BYTES if is_zip else BATCH_MAX_RESUME_BYTES
+    try:
+        spooled = await spool_upload(upload, max_bytes=min(file_limit, budget))
+    except PDFTooLargeError:
+        if budget < file_limit:
+            raise HTTPException(status_code=413, detail=f"Batch is larger than the {BATCH_MAX_TOTAL_BYTES} byte limit")
+        raise HTTPException(status_code=413, detail=f"{filename} is larger than the {file_limit} byte limit")
+
+    try:
+        if not is_zip or not zipfile.is_zipfile(spooled.open()):
+            return [(filename, spooled.read_bytes())]
+        resumes, unpacked = [], 0
+        with zipfile.ZipFile(spooled.open()) as archive:
+            for info in archive.infolist():
+                if info.is_dir() or not info.filename.lower().endswith('.pdf'):
+                    continue
+                # Checked against the declared size so a zip bomb is never inflated
+                if info.file_size > BATCH_MAX_RESUME_BYTES:
+                    raise HTTPException(status_code=413, detail=f"{info.filename} is larger than the per-resume limit")
+                unpacked += info.file_size
+                if unpacked > budget:
+                    raise HTTPException(status_code=413,
+                                        detail=f"Batch is larger than the {BATCH_MAX_TOTAL_BYTES} byte limit")
+                resumes.append((os.path.basename(info.filename), archive.read(info)))
+        return resumes
+    finally:
+        spooled.close()
+
+@app.post("/analyze/batch")
+async def analyze_batch(
+    career_goal: str = Form(...),
+    resumes: List[UploadFile] = File(...)
+):
+    """
+    Analyze a cohort of resumes (PDFs and/or zips of PDFs) against one career goal.
+    Streams Server-Sent Events: ideal_skills once, student_skills per resume,
+    courses batches, then one "resume_result" (AnalyzeResponse + resume_name)
+    or "resume_error" per resume, and a final "summary".
+    """
+    batch: List[Tuple[str, bytes]] = []
+    budget = BATCH_MAX_TOTAL_BYTES
+    for upload in resumes:
+        read = await _read_batch_upload(upload, budget)
+        budget -= sum(len(data) for _, data in read)
+        batch.extend(read)
+        if len(batch) > BATCH_MAX_RESUMES:
+            raise HTTPException(status_code=413, detail=f"At most {BATCH_MAX_RESUMES} resumes per batch")
+    if not batch:
+        raise HTTPException(status_code=400, detail="No PDF resumes found in upload")
+
+    # Resume names identify results in the stream, so make duplicates distinct
+    seen: Dict[str, int] = {}
+    for i, (name, data) in enumerate(batch):
+        seen[name] = seen.get(name, 0) + 1
+        if seen[name] > 1:
+            batch[i] = (f"{name} ({seen[name]})", data)
+
+    async def run(on_event):
+        async def forward(event: str, data: Dict[str, Any]):
+            if event == "resume_result":
+                data = {"resume_name": data["resume_name"], **_build_response(data).model_dump()}
+            await on_event(event, data)
+
+        summary = await pipeline.run_batch_analysis(career_goal, batch, on_event=forward)
+        return "summary", summary
+
+    return _event_stream(run)
+
+@app.post("/jobs", response_model=JobSubmitResponse, status_code=202)
+async def submit_job(
+    career_goal: str = Form(...),
+    resume: UploadFile = File(...)
+):
+    """Queue an analysis and return immediately; poll GET /jobs/{job_id} for progress"""
+    pdf = await _spool_resume(resume)
+    try:
+        job = await job_queue.submit(career_goal, pdf.read_bytes())
+    finally:
+        pdf.close()
+    return JobSubmitResponse(job_id=job['job_id'], status=job['status'])
+
+@app.get("/jobs/{job_id}", response_model=JobStatusResponse)
+async def get_job(job_id: str):
+    job = await job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found or expired")
+    return JobStatusResponse(**job)
 
 # Add cache management endpoints
 @app.post("/cache/clear")
-async def clear_cache(career_goal: str = None):
-    cache_manager.invalidate_cache(career_goal)
-    return {"message": "Cache cleared"}
+async def clear_cache(career_goal: str = None, skill: str = None):
+    cleared = await cache_manager.invalidate_cache(career_goal, skill)
+    # The course catalog is consulted before the per-skill cache, so it has to forget the skill too
+    if COURSE_CATALOG_ENABLED and (skill or not career_goal):
+        cleared += await pipeline.run_blocking(get_course_catalog().invalidate, skill)
+    return {"message": "Cache cleared", "cleared": cleared}
 
 @app.get("/cache/stats")
 async def cache_stats():
-    if hasattr(cache_manager, 'redis_client'):
-        info = cache_manager.redis_client.info('memory')
-        return {
-            "cache_type": "Redis",
-            "memory_usage": info.get('used_memory_human'),
-            "keys": cache_manager.redis_client.dbsize()
-        }
-    else:
-        return {
-            "cache_type": "In-Memory",
-            "cached_entries": len(cache_manager.cache)
-        }
\ No newline at end of file
+    return await cache_manager.stats()
\ No newline at end of file
@@ -5,6 +5,8 @@ from agents.CareerGoalAnalyzerAgent import CareerGoalAnalyzerAgent
 from agents.CourseFinderAgent import CourseFinderAgent
 from agents.EvaluatorAgent import EvaluatorAgent
 from utils.pdf_parser import extract_text_from_pdf
+from utils.resume_preprocessor import preprocess_resume
+from utils.skill_ontology import get_skill_ontology
 import json
 
 # front_end.py - Update the main workflow
@@ -19,7 +21,7 @@ def main():
         if uploaded_resume and career_goal:
             # Step 1: Extract skills from resume
             st.info("Extracting your skills from the resume...")
-            resume_text = extract_text_from_pdf(uploaded_resume)
+            resume_text = preprocess_resume(extract_text_from_pdf(uploaded_resume))["text"]
             
             resume_agent = ResumeSkillExtractorAgent()
             student_skills = resume_agent.run(resume_text)
@@ -41,7 +43,7 @@ def main():
 
             # Step 3: Find missing skills
             st.info("Comparing and identifying missing skills...")
-            missing_skills = [skill for skill in ideal_skills if skill not in student_skills]
+            missing_skills = get_skill_ontology().missing_skills(ideal_skills, student_skills)
 
             if missing_skills:
                 st.write(f"🧩 Missing Skills: {', '.join(missing_skills)}")
@@ -0,0 +1,18 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+
+@pytest.fixture
+def html_fixture():
+    """Contents of a saved page under tests/fixtures/html"""
+    def _load(name: str) -> str:
+        return (FIXTURES / "html" / name).read_text(encoding="utf-8")
+    return _load
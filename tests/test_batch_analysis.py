@@ -0,0 +1,95 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("crewai")
+
+from utils import pipeline
+from utils.cache_manager import InMemoryCacheManager
+from utils.single_flight import SingleFlight
+
+IDEAL_SKILLS = ["Python", "Docker", "Kubernetes"]
+# Resume -> skills it lists; gaps: {Docker, Kubernetes}, {Kubernetes}, {Docker}
+RESUMES = {"ana.pdf": ["Python"], "ben.pdf": ["Python", "Docker"], "cam.pdf": ["Python", "Kubernetes"]}
+
+
+@pytest.fixture
+def batch(monkeypatch):
+    cache = InMemoryCacheManager()
+    monkeypatch.setattr(pipeline, "cache_manager", cache)
+    monkeypatch.setattr(pipeline, "single_flight", SingleFlight(cache))
+    monkeypatch.setattr(pipeline, "COURSE_CATALOG_ENABLED", False)
+
+    async def ideal_skills(career_goal):
+        return IDEAL_SKILLS
+
+    async def extract(resume_bytes, usage=None):
+        return RESUMES[resume_bytes.decode()]
+
+    async def evaluate(missing_skills, courses):
+        return {"top_courses": courses[:5], "ranked_by": "local"}
+
+    monkeypatch.setattr(pipeline, "get_ideal_skills", ideal_skills)
+    monkeypatch.setattr(pipeline, "_extract_student_skills", extract)
+    monkeypatch.setattr(pipeline, "evaluate_courses", evaluate)
+    return monkeypatch
+
+
+def _run():
+    events = []
+
+    async def on_event(event, data):
+        events.append((event, data))
+
+    async def scenario():
+        batch = [(name, name.encode()) for name in RESUMES]
+        return await asyncio.wait_for(pipeline.run_batch_analysis("DevOps Engineer", batch, on_event), 10)
+
+    return asyncio.run(scenario()), events
+
+
+def _course(skill):
+    return [{"course_title": f"{skill} 101", "course_url": f"https://example.com/{skill.lower()}"}]
+
+
+def test_failed_skill_only_fails_the_students_whose_gap_needs_it(batch):
+    async def crawl(skill):
+        if skill == "Kubernetes":
+            raise RuntimeError("crawler down")
+        return _course(skill)
+
+    batch.setattr(pipeline, "_crawl_skill_courses", crawl)
+    summary, events = _run()
+    results = {data["resume_name"]: data for event, data in events if event == "resume_result"}
+    errors = {data["resume_name"]: data["detail"] for event, data in events if event == "resume_error"}
+    assert list(results) == ["cam.pdf"]
+    assert results["cam.pdf"]["courses"] == _course("Docker")
+    assert set(errors) == {"ana.pdf", "ben.pdf"}
+    assert "Kubernetes" in errors["ana.pdf"]
+    assert summary["analyzed"] == 3
+
+
+def test_gaps_are_evaluated_as_soon_as_their_skills_are_crawled(batch):
+    release_kubernetes = asyncio.Event()
+
+    async def crawl(skill):
+        if skill == "Kubernetes":
+            await release_kubernetes.wait()
+        return _course(skill)
+
+    order = []
+
+    async def evaluate(missing_skills, courses):
+        order.append(tuple(missing_skills))
+        if missing_skills == ["Docker"]:
+            # Docker's gap is done while Kubernetes is still being crawled
+            release_kubernetes.set()
+        return {"top_courses": courses, "ranked_by": "local"}
+
+    batch.setattr(pipeline, "evaluate_courses", evaluate)
+    batch.setattr(pipeline, "_crawl_skill_courses", crawl)
+    summary, events = _run()
+    results = [data["resume_name"] for event, data in events if event == "resume_result"]
+    assert order[0] == ("Docker",)
+    assert results[0] == "cam.pdf" and sorted(results) == ["ana.pdf", "ben.pdf", "cam.pdf"]
+    assert summary["distinct_skill_gaps"] == 3
@@ -0,0 +1,68 @@
+import asyncio
+import io
+import zipfile
+
+import pytest
+
+pytest.importorskip("crewai")
+
+from fastapi import HTTPException, UploadFile
+from fastapi.testclient import TestClient
+
+import fastapi_app
+
+
+class CountingFile(io.BytesIO):
+    """Records how many bytes the endpoint actually read"""
+
+    def __init__(self, data):
+        super().__init__(data)
+        self.bytes_read = 0
+
+    def read(self, size=-1):
+        chunk = super().read(size)
+        self.bytes_read += len(chunk)
+        return chunk
+
+
+def _upload(name, data):
+    file = CountingFile(data)
+    return UploadFile(file=file, filename=name), file
+
+
+def _zip(members):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        for name, data in members.items():
+            archive.writestr(name, data)
+    return buffer.getvalue()
+
+
+def _read(upload, budget=None):
+    return asyncio.run(fastapi_app._read_batch_upload(upload, budget or fastapi_app.BATCH_MAX_TOTAL_BYTES))
+
+
+def test_oversized_pdf_is_rejected_without_reading_it_all(monkeypatch):
+    monkeypatch.setattr(fastapi_app, "BATCH_MAX_RESUME_BYTES", 100 * 1024)
+    upload, file = _upload("big.pdf", b"%PDF-" + b"x" * 2 * 1024 * 1024)
+    with pytest.raises(HTTPException) as error:
+        _read(upload)
+    assert error.value.status_code == 413
+    assert file.bytes_read < 512 * 1024
+
+
+def test_zip_members_are_unpacked_within_the_batch_budget():
+    upload, _ = _upload("cohort.zip", _zip({"a.pdf": b"%PDF-a", "dir/b.pdf": b"%PDF-b", "notes.txt": b"x"}))
+    assert _read(upload) == [("a.pdf", b"%PDF-a"), ("b.pdf", b"%PDF-b")]
+
+    upload, _ = _upload("cohort.zip", _zip({"a.pdf": b"%PDF-" + b"a" * 1000, "b.pdf": b"%PDF-" + b"b" * 1000}))
+    with pytest.raises(HTTPException) as error:
+        _read(upload, budget=1500)
+    assert error.value.status_code == 413 and "Batch" in error.value.detail
+
+
+def test_batch_total_is_enforced_across_uploads(monkeypatch):
+    monkeypatch.setattr(fastapi_app, "BATCH_MAX_TOTAL_BYTES", 3000)
+    client_files = [("resumes", (f"r{i}.pdf", b"%PDF-" + b"x" * 1000, "application/pdf")) for i in range(4)]
+    response = TestClient(fastapi_app.app).post("/analyze/batch", data={"career_goal": "Data"}, files=client_files)
+    assert response.status_code == 413
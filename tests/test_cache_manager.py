@@ -0,0 +1,30 @@
+import asyncio
+
+import redis
+
+from utils.cache_manager import CacheManager
+
+
+class FlakyRedis:
+    """MGET works; UNLINK fails as if the connection dropped"""
+
+    def __init__(self, values):
+        self.values = values
+
+    async def mget(self, keys):
+        return [self.values.get(key) for key in keys]
+
+    async def unlink(self, *keys):
+        raise redis.ConnectionError("connection reset")
+
+
+def test_failed_stale_cleanup_does_not_fail_the_read():
+    manager = CacheManager()
+    manager.l1 = None
+    manager.redis_client = FlakyRedis({
+        "careerpath:fresh": manager.serializer.dumps({"ok": True}),
+        "careerpath:stale": b'{"written": "by an older version"}',
+    })
+    values = asyncio.run(manager._get_many(["careerpath:fresh", "careerpath:stale"]))
+    assert values == [{"ok": True}, None]
+    assert not manager.available  # the dropped connection still sends later calls to the fallback
@@ -0,0 +1,96 @@
+import pytest
+
+from utils.course_catalog import CourseCatalog
+
+
+def _courses(prefix, n, description):
+    return [{"course_title": f"{prefix} course {i}", "course_description": description,
+             "course_url": f"https://example.com/{prefix.lower()}-{i}", "rating": "4.5", "price": "Free"}
+            for i in range(n)]
+
+
+def _catalog(tmp_path):
+    return CourseCatalog(path=str(tmp_path / "catalog.sqlite3"), min_courses=5)
+
+
+def test_text_matches_from_other_skills_do_not_count_as_coverage(tmp_path):
+    catalog = _catalog(tmp_path)
+    catalog.ingest("Excel", _courses("Excel", 6, "Go from beginner to pro and help the rest of your team"))
+    assert catalog.lookup("Excel") is not None
+    assert catalog.lookup("Go") is None
+    assert catalog.lookup("REST APIs") is None
+    catalog.close()
+
+
+def test_courses_are_served_for_every_spelling_of_the_skill(tmp_path):
+    catalog = _catalog(tmp_path)
+    courses = _courses("Golang", 5, "Concurrency in Go") + _courses("Misc", 1, "Unrelated")
+    catalog.ingest("Go", courses)
+    found = catalog.lookup("golang")
+    assert found is not None and len(found) == 6
+    assert found[-1]["course_title"] == "Misc course 0"
+    catalog.close()
+
+
+def test_thin_coverage_is_served_only_after_a_recent_crawl(tmp_path):
+    catalog = _catalog(tmp_path)
+    catalog.ingest("Docker", _courses("Docker", 2, "Containers"))
+    assert len(catalog.lookup("Docker")) == 2
+    catalog.fresh_seconds = 0
+    assert catalog.lookup("Docker") is None
+    catalog.close()
+
+
+def test_reingesting_a_course_links_it_to_both_skills(tmp_path):
+    catalog = _catalog(tmp_path)
+    shared = _courses("Kubernetes", 5, "Docker and Kubernetes")
+    catalog.ingest("Kubernetes", shared)
+    catalog.ingest("Docker", shared)
+    assert len(catalog.lookup("Docker")) == 5
+    assert catalog.stats()["courses"] == 5
+    catalog.close()
+
+
+def test_invalidated_skill_is_no_longer_served(tmp_path):
+    catalog = _catalog(tmp_path)
+    catalog.ingest("Docker", _courses("Docker", 5, "Containers"))
+    catalog.ingest("Kubernetes", _courses("Kubernetes", 5, "Clusters"))
+    assert catalog.invalidate("docker") == 6  # five links and the crawl record
+    assert catalog.lookup("Docker") is None
+    assert catalog.lookup("Kubernetes") is not None
+    catalog.invalidate()
+    assert catalog.lookup("Kubernetes") is None
+    assert catalog.stats()["courses"] == 0
+    catalog.close()
+
+
+def test_cleared_skill_is_crawled_again(tmp_path, monkeypatch):
+    pytest.importorskip("crewai")
+    import asyncio
+    from utils import course_catalog, pipeline
+    from utils.cache_manager import InMemoryCacheManager
+
+    catalog = _catalog(tmp_path)
+    monkeypatch.setattr(course_catalog, "_course_catalog", catalog)
+    monkeypatch.setattr(pipeline, "COURSE_CATALOG_ENABLED", True)
+    monkeypatch.setattr(pipeline, "cache_manager", InMemoryCacheManager())
+    crawled = []
+
+    async def crawl(skill):
+        crawled.append(skill)
+        courses = _courses(skill, 5, "Containers")
+        await pipeline.run_blocking(catalog.ingest, skill, courses)
+        return courses
+
+    monkeypatch.setattr(pipeline, "_crawl_skill_courses", crawl)
+
+    async def scenario():
+        await pipeline.find_courses_by_skill(["Docker"])
+        await pipeline.find_courses_by_skill(["Docker"])
+        await pipeline.cache_manager.invalidate_cache(skill="Docker")
+        catalog.invalidate("Docker")
+        await pipeline.find_courses_by_skill(["Docker"])
+
+    asyncio.run(scenario())
+    assert crawled == ["Docker", "Docker"]
+    catalog.close()
@@ -0,0 +1,30 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("crewai")
+
+from agents.CourseFinderAgent import CourseFinderAgent
+from utils.cache_manager import InMemoryCacheManager
+
+
+def _course(url):
+    return {"course_title": url, "course_url": url}
+
+
+def test_unsearched_platforms_are_cached_under_other_and_read_back(monkeypatch):
+    monkeypatch.setattr(CourseFinderAgent, "PLATFORMS_PER_SKILL", 2)
+    finder = CourseFinderAgent.__new__(CourseFinderAgent)
+    courses = [_course("https://www.coursera.org/learn/docker"), _course("https://www.edx.org/learn/docker"),
+               _course("https://example.com/docker")]
+    grouped = finder.group_by_platform(courses)
+    assert set(grouped) == {"coursera", "udemy", "other"}
+    assert [c["course_url"] for c in grouped["other"]] == ["https://www.edx.org/learn/docker",
+                                                          "https://example.com/docker"]
+
+    async def roundtrip():
+        cache = InMemoryCacheManager()
+        await cache.set_cached_skill_courses("Docker", grouped)
+        return await cache.get_cached_skill_courses("Docker", CourseFinderAgent.searched_platforms())
+
+    assert sorted(c["course_url"] for c in asyncio.run(roundtrip())) == sorted(c["course_url"] for c in courses)
@@ -0,0 +1,43 @@
+from utils.course_ranker import rank_courses, skill_relevance
+
+
+def _course(title, description="", rating="4.5", price="Free"):
+    return {"course_title": title, "course_description": description, "rating": rating, "price": price,
+            "course_url": f"https://example.com/{title.lower().replace(' ', '-')}"}
+
+
+def _relevance(skill, courses):
+    return {c["course_title"]: c["relevance"] for c in rank_courses([skill], courses)}
+
+
+def test_aliases_match_as_phrases_not_loose_words():
+    courses = [
+        _course("AWS Cloud Practitioner", "Core services of Amazon Web Services"),
+        _course("Web Development Bootcamp", "Build web sites and deploy web services"),
+    ]
+    relevance = _relevance("Amazon Web Services", courses)
+    assert relevance["AWS Cloud Practitioner"] > 0.9
+    assert relevance["Web Development Bootcamp"] == 0
+
+
+def test_generic_words_of_an_alias_do_not_outrank_the_skill():
+    courses = [
+        _course("Git basics", "Branching and merging with Git"),
+        _course("Quality Control", "Statistical process control for manufacturing"),
+        _course("Version history", "Keep every version of your documents"),
+    ]
+    ranked = rank_courses(["Git"], courses)
+    assert ranked[0]["course_title"] == "Git basics"
+    assert [c["matched_skills"] for c in ranked[1:]] == [[], []]
+
+
+def test_phrases_do_not_span_title_and_description():
+    courses = [_course("Learn Amazon", "Web Services for sellers"), _course("Python", "")]
+    assert skill_relevance(["Amazon Web Services"], courses)[0, 0] == 0
+
+
+def test_best_alias_counts_once_per_skill():
+    courses = [_course("Amazon Web Services", "aws aws amazon aws"), _course("AWS", "")]
+    scores = skill_relevance(["Amazon Web Services"], courses)
+    assert scores.shape == (2, 1)
+    assert (scores > 0).all()
@@ -0,0 +1,30 @@
+import asyncio
+
+from agents.tools.crawl_cache import CrawlCache
+
+
+def test_pages_and_extractions_roundtrip(tmp_path):
+    async def scenario():
+        cache = CrawlCache(str(tmp_path))
+        url = "https://www.coursera.org/search?query=docker"
+        page = await cache.put_page(url, "<html>Docker</html>", "Docker", {"ETag": "v1"})
+        await cache.put_extraction(url, "schema", page, '[{"course_title": "Docker"}]')
+        stored = await cache.get_page(url)
+        return page, stored, await cache.get_extraction(url, "schema", stored)
+
+    page, stored, extraction = asyncio.run(scenario())
+    assert stored["fresh"] and stored["html"] == page["html"] and stored["etag"] == "v1"
+    assert extraction == '[{"course_title": "Docker"}]'
+
+
+def test_extraction_from_an_older_download_is_not_served(tmp_path):
+    async def scenario():
+        cache = CrawlCache(str(tmp_path))
+        url = "https://www.udemy.com/courses/search/?q=go"
+        old = await cache.put_page(url, "<html>v1</html>", "v1")
+        await cache.put_extraction(url, "schema", old, "[]")
+        new = await cache.put_page(url, "<html>v2</html>", "v2")
+        new["page_version"] = old["page_version"] + 1
+        return await cache.get_extraction(url, "schema", new)
+
+    assert asyncio.run(scenario()) is None
@@ -0,0 +1,30 @@
+import json
+
+import pytest
+
+pytest.importorskip("crewai")
+
+from agents import EvaluatorAgent as evaluator_module
+from agents.EvaluatorAgent import EvaluatorAgent
+
+
+def test_direct_prompt_uses_title_and_description_fallbacks(monkeypatch):
+    prompts = []
+
+    def structured_call(llm, prompt, name, schema):
+        prompts.append(prompt)
+        return {"top_courses": [{"index": 1, "score": 9, "strengths": "s", "weaknesses": "w"}],
+                "learning_path": "Start with Docker"}
+
+    monkeypatch.setattr(evaluator_module, "structured_call", structured_call)
+    courses = [
+        {"course_title": "Kubernetes in Practice", "course_description": "Clusters", "rating": "4.6"},
+        {"title": "Docker Fundamentals", "description": "Containers from scratch", "url": "https://example.com/d"},
+    ]
+    result = EvaluatorAgent().run_direct(["Docker"], courses)
+
+    listing = [json.loads(line) for line in prompts[0].splitlines() if line.strip().startswith('{"index"')]
+    assert listing[1] == {"index": 1, "course_title": "Docker Fundamentals",
+                          "course_description": "Containers from scratch"}
+    assert listing[0]["course_title"] == "Kubernetes in Practice" and listing[0]["rating"] == "4.6"
+    assert result["top_courses"][0]["url"] == "https://example.com/d"
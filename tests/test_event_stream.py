@@ -0,0 +1,45 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("crewai")
+
+import fastapi_app
+
+
+def _response(cleaned):
+    async def run(on_event):
+        await on_event("stage_started", {"stage": "resume_skills"})
+        return "result", {"ok": True}
+
+    return fastapi_app._event_stream(run, cleanup=lambda: cleaned.append(True))
+
+
+async def _receive():
+    await asyncio.sleep(3600)
+    return {"type": "http.disconnect"}
+
+
+def test_cleanup_runs_after_a_complete_stream():
+    cleaned, sent = [], []
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {"type": "http", "asgi": {"spec_version": "2.4"}}
+    asyncio.run(_response(cleaned)(scope, _receive, send))
+    body = b"".join(m.get("body", b"") for m in sent)
+    assert b"event: result" in body
+    assert cleaned == [True]
+
+
+def test_cleanup_runs_when_the_client_left_before_the_stream_started():
+    cleaned = []
+
+    async def send(message):
+        raise OSError("client disconnected")
+
+    scope = {"type": "http", "asgi": {"spec_version": "2.4"}}
+    with pytest.raises(Exception):
+        asyncio.run(_response(cleaned)(scope, _receive, send))
+    assert cleaned == [True]
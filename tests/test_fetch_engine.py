@@ -0,0 +1,76 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("crawl4ai")
+
+from agents.tools import fetch_engine
+from agents.tools.crawl_cache import CrawlCache
+from tests.test_structured_extractors import COURSE_SCHEMA
+
+
+class FakeConfig:
+    def __init__(self, schema):
+        self.extraction_strategy = SimpleNamespace(schema=schema, instruction="extract courses")
+
+    def clone(self, **changes):
+        clone = FakeConfig(None)
+        clone.extraction_strategy = changes.get("extraction_strategy", self.extraction_strategy)
+        return clone
+
+
+class FakePool:
+    """Serves saved pages by URL; a URL mapped to None never finishes loading"""
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.calls = []
+
+    async def arun(self, url, config):
+        self.calls.append(url)
+        html = self.pages[url]
+        if html is None:
+            await asyncio.sleep(3600)
+        return SimpleNamespace(success=True, html=html, markdown="", response_headers={}, extracted_content=None)
+
+
+@pytest.fixture
+def crawl_env(monkeypatch, tmp_path):
+    cache = CrawlCache(str(tmp_path))
+    monkeypatch.setattr(fetch_engine, "get_crawl_cache", lambda: cache)
+
+    def _install(pages):
+        pool = FakePool(pages)
+        monkeypatch.setattr(fetch_engine, "get_browser_pool", lambda: pool)
+        return pool
+    return _install
+
+
+def test_iter_crawl_extracts_known_sites_with_rules(crawl_env, html_fixture):
+    url = "https://www.udemy.com/courses/search/?q=python"
+    pool = crawl_env({url: html_fixture("udemy_search.html")})
+
+    outcomes = asyncio.run(fetch_engine.crawl_all([url, url], FakeConfig(COURSE_SCHEMA)))
+
+    assert len(outcomes) == 1  # duplicate URLs are crawled once
+    outcome = outcomes[0]
+    assert outcome["success"] and not outcome["cached"]
+    assert json.loads(outcome["result"].extracted_content)[0]["course_titles"]
+    assert pool.calls == [url]
+
+    # Second crawl is served from the crawl cache without the browser
+    again = asyncio.run(fetch_engine.crawl_all([url], FakeConfig(COURSE_SCHEMA)))
+    assert again[0]["cached"] and pool.calls == [url]
+
+
+def test_iter_crawl_times_out_per_url(crawl_env, html_fixture):
+    slow, fast = "https://www.edx.org/search?q=slow", "https://www.udemy.com/courses/search/?q=fast"
+    crawl_env({slow: None, fast: html_fixture("udemy_search.html")})
+
+    outcomes = asyncio.run(fetch_engine.crawl_all([slow, fast], FakeConfig(COURSE_SCHEMA), url_timeout=0.2))
+
+    by_url = {o["url"]: o for o in outcomes}
+    assert by_url[fast]["success"]
+    assert by_url[slow] == {"url": slow, "error": "timeout", "success": False}
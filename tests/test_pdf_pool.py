@@ -0,0 +1,101 @@
+import asyncio
+import io
+import os
+from concurrent.futures import Future
+
+import pytest
+
+from utils import pdf_pool
+from utils.pdf_parser import spool_upload
+from utils.pdf_pool import PDFParserPool
+
+pymupdf = pytest.importorskip("pymupdf")
+
+
+def _pdf_bytes(text):
+    document = pymupdf.open()
+    document.new_page().insert_text((72, 72), text)
+    return document.tobytes()
+
+
+class FakeUpload:
+    def __init__(self, data):
+        self.stream = io.BytesIO(data)
+
+    async def read(self, size):
+        return self.stream.read(size)
+
+
+def _spool(data, threshold):
+    return asyncio.run(spool_upload(FakeUpload(data), spool_threshold=threshold))
+
+
+def test_large_uploads_are_spooled_to_a_named_file():
+    data = _pdf_bytes("Python and SQL")
+    pdf = _spool(data, threshold=len(data) // 2)
+    try:
+        assert pdf.path and os.path.exists(pdf.path)
+        assert pdf.read_bytes() == data and pdf.size == len(data)
+    finally:
+        pdf.close()
+    assert not os.path.exists(pdf.path)
+
+
+def test_small_uploads_stay_in_memory():
+    data = _pdf_bytes("Python and SQL")
+    pdf = _spool(data, threshold=len(data) * 2)
+    assert pdf.path is None
+    assert pdf.read_bytes() == data
+    pdf.close()
+
+
+class InlineExecutor:
+    """Runs submitted work in-process, recording what would have been sent to the worker"""
+
+    def __init__(self):
+        self.sent = []
+
+    def submit(self, fn, *args):
+        self.sent.append(args[0])
+        future = Future()
+        future.set_result(fn(*args))
+        return future
+
+
+@pytest.mark.parametrize("spooled_to_disk", [True, False])
+def test_workers_get_a_path_for_spooled_uploads_and_bytes_otherwise(spooled_to_disk):
+    data = _pdf_bytes("Python and SQL")
+    pdf = _spool(data, threshold=len(data) // 2 if spooled_to_disk else len(data) * 2)
+    pool = PDFParserPool(workers=1, backend="pypdf2")
+    pool._executor = executor = InlineExecutor()
+    try:
+        result = asyncio.run(pool.extract(pdf))
+    finally:
+        pdf.close()
+    assert "Python and SQL" in result["text"]
+    assert executor.sent == [pdf.path if spooled_to_disk else data]
+
+
+def test_parse_in_worker_reads_from_a_path(tmp_path):
+    path = tmp_path / "resume.pdf"
+    path.write_bytes(_pdf_bytes("Docker"))
+    assert "Docker" in pdf_pool._parse_in_worker(str(path), 5, 1000, "pypdf2")["text"]
+    assert "Docker" in pdf_pool._parse_in_worker(path.read_bytes(), 5, 1000, "pypdf2")["text"]
+
+
+def test_pymupdf_documents_are_closed_after_parsing(monkeypatch):
+    from utils import pdf_parser
+
+    opened = []
+    real_open = pymupdf.open
+
+    def tracking_open(*args, **kwargs):
+        opened.append(real_open(*args, **kwargs))
+        return opened[-1]
+
+    data = _pdf_bytes("Terraform")
+    monkeypatch.setattr(pdf_parser.pymupdf, "open", tracking_open)
+    assert "Terraform" in pdf_parser.extract_pdf_text(io.BytesIO(data), backend="pymupdf")["text"]
+    assert pdf_parser.extract_pdf_text(io.BytesIO(data), max_chars=3, backend="pymupdf")["truncated"]
+    assert ["Terraform" in text for _, text, _ in pdf_parser.iter_pdf_pages(io.BytesIO(data), backend="pymupdf")] == [True]
+    assert len(opened) == 3 and all(document.is_closed for document in opened)
@@ -0,0 +1,70 @@
+import pytest
+
+from utils.resume_preprocessor import preprocess_resume
+
+RESUME = """Jane Doe
+jane.doe@example.com | +1 (555) 123-4567
+linkedin.com/in/janedoe
+
+Skills
+Python, SQL, Docker
+
+Experience
+Acme Corp 2018 - 2022
+2019 - 2021 serving 10M users with C++ 2017 - 2019 services
+Built data pipelines in Python
+
+References
+Available on request
+"""
+
+
+def test_keeps_year_ranges_and_drops_contact_details():
+    result = preprocess_resume(RESUME)
+    text = result["text"]
+    assert "Acme Corp 2018 - 2022" in text
+    assert "2019 - 2021 serving 10M users" in text
+    assert "example.com" not in text
+    assert "555" not in text
+    assert "linkedin" not in text
+    assert "Available on request" not in text
+    assert result["sections"][:2] == ["skills", "experience"]
+
+
+@pytest.mark.parametrize("line", [
+    "+44 20 7946 0958",
+    "(555) 123-4567",
+    "Phone: 555-123-4567",
+    "Tel. 555.123.4567",
+    "Mobile: +91 98765 43210",
+])
+def test_phone_numbers_are_dropped(line):
+    assert preprocess_resume(f"Jane Doe\n{line}\n\nSkills\nPython")["text"] == "SKILLS:\nPython\n\nJane Doe"
+
+
+@pytest.mark.parametrize("line", [
+    "Software Engineer, Acme Corp (2018 - 2022)",
+    "Cut latency 20% across 1,000,000 daily requests",
+    "B.Sc. Computer Science 2014 - 2018, GPA 3.8",
+])
+def test_numbers_that_are_not_phone_numbers_are_kept(line):
+    assert line in preprocess_resume(f"Experience\n{line}")["text"]
+
+
+def test_project_lines_with_links_keep_their_skills():
+    text = preprocess_resume(
+        "Projects\nPortfolio site in React, Node.js and MongoDB - github.com/jane/portfolio\n"
+        "Kafka streaming demo, see https://jane.dev/kafka\nSkills\nPython, SQL"
+    )["text"]
+    assert "Portfolio site in React, Node.js and MongoDB" in text
+    assert "Kafka streaming demo" in text
+    assert "github.com" not in text and "https://" not in text
+
+
+def test_lines_that_are_only_contact_details_are_dropped():
+    text = preprocess_resume(
+        "Jane Doe\nEmail: jane@example.com | Phone: +1 555 123 4567\nLinkedIn: linkedin.com/in/jane\n"
+        "Experience\nOn call for a 24/7 service, phone support +1 555 987 6543 in Python"
+    )["text"]
+    assert "Email" not in text and "LinkedIn" not in text
+    assert "On call for a 24/7 service, phone support in Python" in text
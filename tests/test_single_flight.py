@@ -0,0 +1,126 @@
+import asyncio
+
+import pytest
+
+from utils.cache_manager import InMemoryCacheManager
+from utils.single_flight import SingleFlight
+
+
+def _run(coro):
+    return asyncio.run(coro)
+
+
+def test_concurrent_callers_share_one_computation():
+    async def scenario():
+        flight = SingleFlight(InMemoryCacheManager())
+        calls = []
+
+        async def compute():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return {"value": 42}
+
+        results = await asyncio.gather(*(flight.do("key", compute) for _ in range(5)))
+        return results, calls, flight.stats
+
+    results, calls, stats = _run(scenario())
+    assert results == [{"value": 42}] * 5
+    assert len(calls) == 1
+    assert stats["coalesced"] == 4
+
+
+def test_cancelled_leader_does_not_cancel_followers():
+    async def scenario():
+        flight = SingleFlight(InMemoryCacheManager())
+        release = asyncio.Event()
+
+        async def compute():
+            await release.wait()
+            return "done"
+
+        leader = asyncio.create_task(flight.do("key", compute))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(flight.do("key", compute))
+        await asyncio.sleep(0)
+        leader.cancel()
+        await asyncio.sleep(0)
+        release.set()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await follower
+
+    assert _run(scenario()) == "done"
+
+
+def test_failure_reaches_every_caller_and_is_not_cached():
+    async def scenario():
+        flight = SingleFlight(InMemoryCacheManager())
+
+        async def compute():
+            await asyncio.sleep(0.01)
+            raise ValueError("boom")
+
+        results = await asyncio.gather(flight.do("key", compute), flight.do("key", compute),
+                                       return_exceptions=True)
+        return results, await flight.do("key", lambda: asyncio.sleep(0, result="retried"))
+
+    results, retried = _run(scenario())
+    assert all(isinstance(r, ValueError) for r in results)
+    assert retried == "retried"
+
+
+def test_last_caller_cancelling_stops_the_computation():
+    async def scenario():
+        flight = SingleFlight(InMemoryCacheManager())
+        started, finished = asyncio.Event(), []
+
+        async def compute():
+            started.set()
+            await asyncio.sleep(10)
+            finished.append(1)
+
+        caller = asyncio.create_task(flight.do("key", compute))
+        await started.wait()
+        caller.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await caller
+        await asyncio.sleep(0.01)
+        return finished, dict(flight._inflight)
+
+    finished, inflight = _run(scenario())
+    assert finished == []
+    assert inflight == {}
+
+
+def test_a_new_flight_can_start_while_the_previous_one_is_returning():
+    async def scenario():
+        flight = SingleFlight(InMemoryCacheManager())
+        second = []
+
+        async def compute_second():
+            await asyncio.sleep(0.01)
+            return "second"
+
+        async def compute_first():
+            await asyncio.sleep(0.01)
+            # Starts just as this flight finishes, before its callers have returned
+            second.append(asyncio.create_task(flight.do("key", compute_second)))
+            return "first"
+
+        first = await asyncio.gather(flight.do("key", compute_first), flight.do("key", compute_first))
+        return first, await second[0], flight._waiters, flight._inflight
+
+    first, second, waiters, inflight = _run(scenario())
+    assert first == ["first", "first"]
+    assert second == "second"
+    assert waiters == {} and inflight == {}
+
+
+def test_outcomes_are_published_through_the_cache_api():
+    async def scenario():
+        cache = InMemoryCacheManager()
+        await SingleFlight(cache).do("key", lambda: asyncio.sleep(0, result=[1, 2]))
+        return await cache.get_outcome(SingleFlight._outcome_key("key"))
+
+    outcome = _run(scenario())
+    assert outcome["ok"] and outcome["value"] == [1, 2]
@@ -1,39 +1,251 @@
+import asyncio
 import redis
+import redis.asyncio as aioredis
 import json
 import hashlib
-from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
+from collections import OrderedDict
+from datetime import datetime
+from typing import Optional, Dict, Any, AsyncIterator, Iterable, List, Tuple
 import os
+import re
+import time
+import uuid
+from utils.cache_serializer import CacheSerializer, StaleCacheEntry
+from utils.skill_ontology import get_skill_ontology
+
+def normalize_career_goal(career_goal: str) -> str:
+    """Fold case, punctuation and whitespace, then map known synonyms"""
+    return get_skill_ontology().career_goal_key(career_goal)
+
+def normalize_skill(skill: str) -> str:
+    """Canonical skill key, so 'AWS', 'aws' and 'Amazon Web Services' share cache entries"""
+    return get_skill_ontology().skill_key(skill)
+
+# Keys deleted per UNLINK during invalidation, and the SCAN/SSCAN page size
+INVALIDATE_BATCH_SIZE = int(os.getenv('CACHE_INVALIDATE_BATCH_SIZE', 500))
+
+# Non-cache state under the careerpath: prefix that a full clear must leave alone
+_PRESERVED_PREFIXES = ("careerpath:job:", "careerpath:jobs:", "careerpath:flight:lock:")
+
+# Per-worker L1 in front of Redis: short TTL, invalidated across workers over pub/sub
+L1_CACHE_ENABLED = os.getenv('L1_CACHE_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+L1_CACHE_TTL = int(os.getenv('L1_CACHE_TTL_SECONDS', 60))
+L1_INVALIDATION_CHANNEL = "careerpath:cache:invalidate"
+# Single-flight outcomes must always be read from Redis
+_L1_EXCLUDED_PREFIXES = ("careerpath:flight:",)
+
+# Keys sampled with MEMORY USAGE to estimate per-namespace size on Redis
+STATS_SAMPLE_SIZE = int(os.getenv('CACHE_STATS_SAMPLE_SIZE', 1000))
+
+
+def cache_namespace(key: str) -> str:
+    """Stats bucket for a key: 'careerpath:skill_courses:udemy:ab12' -> 'skill_courses'"""
+    parts = key.split(':')
+    if len(parts) < 2 or parts[0] != 'careerpath':
+        return 'other'
+    # Course evaluations (by gap and by career) are bare hashes
+    return 'courses' if len(parts) == 2 else parts[1]
+
+
+class BaseCacheManager:
+    """Cache tiers shared by the Redis and in-memory backends"""
+
+    # Ideal skill profiles are served fresh for GOAL_PROFILE_TTL_HOURS, then served
+    # stale (while a refresh runs) for another GOAL_PROFILE_STALE_HOURS
+    goal_profile_ttl = int(os.getenv('GOAL_PROFILE_TTL_HOURS', 24)) * 3600
+    goal_profile_stale_ttl = int(os.getenv('GOAL_PROFILE_STALE_HOURS', 168)) * 3600
+
+    # Extracted resume text + skills, keyed by content hash
+    resume_cache_ttl = int(os.getenv('RESUME_CACHE_TTL_HOURS', 72)) * 3600
+    # Course discovery results per (skill, platform)
+    skill_course_ttl = int(os.getenv('SKILL_COURSE_TTL_HOURS', os.getenv('CACHE_TTL_HOURS', 24))) * 3600
+    # Evaluated courses per (career goal, skill gap)
+    cache_ttl = int(os.getenv('CACHE_TTL_HOURS', 24)) * 3600
+
+    name = "base"
 
-class CacheManager:
     def __init__(self):
-        self.redis_client = redis.Redis(
-            host=os.getenv('REDIS_HOST', 'localhost'),
-            port=int(os.getenv('REDIS_PORT', 6379)),
-            db=0,
-            decode_responses=True
+        # Per-namespace hit/miss/eviction counters, as seen by this process
+        self.counters: Dict[str, Dict[str, int]] = {}
+
+    def _count(self, key: str, field: str, n: int = 1):
+        counters = self.counters.setdefault(cache_namespace(key), {'hits': 0, 'misses': 0, 'evictions': 0})
+        counters[field] = counters.get(field, 0) + n
+
+    def _count_reads(self, keys: List[str], values: List[Optional[Any]]):
+        for key, value in zip(keys, values):
+            self._count(key, 'misses' if value is None else 'hits')
+
+    async def _get_many(self, keys: List[str]) -> List[Optional[Any]]:
+        """Values for several keys in one round trip, None where missing"""
+        raise NotImplementedError
+
+    async def _set_many(self, entries: List[Tuple[str, Any, int]], index_keys: Iterable[str] = ()):
+        """Store several (key, value, ttl) entries in one round trip, adding their keys to each index"""
+        raise NotImplementedError
+
+    async def _get_json(self, key: str) -> Optional[Any]:
+        return (await self._get_many([key]))[0]
+
+    async def _set_json(self, key: str, value: Any, ttl: int, index_keys: Iterable[str] = ()):
+        await self._set_many([(key, value, ttl)], index_keys)
+
+    @property
+    def index_ttl(self) -> int:
+        # Indexes outlive every entry they point at; dangling members are harmless
+        return max(self.goal_profile_ttl + self.goal_profile_stale_ttl, self.skill_course_ttl, self.cache_ttl)
+
+    def _goal_index_key(self, career_goal: str) -> str:
+        return f"careerpath:index:goal:{hashlib.md5(normalize_career_goal(career_goal).encode()).hexdigest()}"
+
+    def _skill_index_key(self, skill: str) -> str:
+        return f"careerpath:index:skill:{hashlib.md5(normalize_skill(skill).encode()).hexdigest()}"
+
+    # Short-lived locks (used by single-flight coalescing); token identifies the holder
+    async def acquire_lock(self, name: str, token: str, ttl: float) -> bool:
+        raise NotImplementedError
+
+    async def extend_lock(self, name: str, token: str, ttl: float) -> bool:
+        raise NotImplementedError
+
+    async def release_lock(self, name: str, token: str):
+        raise NotImplementedError
+
+    async def lock_exists(self, name: str) -> bool:
+        raise NotImplementedError
+
+    # Outcomes a single-flight leader publishes for callers waiting in other workers
+    async def publish_outcome(self, name: str, outcome: Dict[str, Any], ttl: int):
+        await self._set_json(name, outcome, ttl)
+
+    async def get_outcome(self, name: str) -> Optional[Dict[str, Any]]:
+        return await self._get_json(name)
+
+    async def invalidate_cache(self, career_goal: str = None, skill: str = None) -> int:
+        """
+        Clear the entries for a career goal and/or a skill, or everything if neither
+        is given. Returns the number of keys removed.
+        """
+        raise NotImplementedError
+
+    async def stats(self) -> Dict[str, Any]:
+        """Backend summary plus per-namespace hits, misses, evictions and approximate bytes"""
+        raise NotImplementedError
+
+    async def connect(self) -> bool:
+        return True
+
+    async def close(self):
+        pass
+
+    def _generate_goal_profile_key(self, career_goal: str) -> str:
+        normalized = normalize_career_goal(career_goal)
+        return f"careerpath:goal_profile:{hashlib.md5(normalized.encode()).hexdigest()}"
+
+    async def get_cached_ideal_skills(self, career_goal: str) -> Optional[Dict[str, Any]]:
+        """
+        Retrieve the cached ideal skill profile for a career goal.
+        The returned entry has 'stale': True once the fresh TTL has passed.
+        """
+        entry = await self._get_json(self._generate_goal_profile_key(career_goal))
+        if not entry:
+            return None
+        entry['stale'] = time.time() - entry.get('cached_at', 0) > self.goal_profile_ttl
+        return entry
+
+    async def set_cached_ideal_skills(self, career_goal: str, ideal_skills: list):
+        """Store the ideal skill profile for a career goal"""
+        cache_data = {
+            'ideal_skills': ideal_skills,
+            'cached_at': time.time(),
+            'career_goal': normalize_career_goal(career_goal)
+        }
+        await self._set_json(
+            self._generate_goal_profile_key(career_goal),
+            cache_data,
+            self.goal_profile_ttl + self.goal_profile_stale_ttl,
+            [self._goal_index_key(career_goal)]
         )
-        self.cache_ttl = int(os.getenv('CACHE_TTL_HOURS', 24)) * 3600  # Convert to seconds
-    
+        print(f"Cached ideal skills for {career_goal}")
+
+    def _generate_resume_pdf_key(self, pdf_bytes) -> str:
+        # SpooledPDF uploads carry the hash computed while they were read
+        digest = getattr(pdf_bytes, 'sha256', None) or hashlib.sha256(pdf_bytes).hexdigest()
+        return f"careerpath:resume:pdf:{digest}"
+
+    def _generate_resume_text_key(self, resume_text: str) -> str:
+        # Whitespace differences between PDF exports of the same resume shouldn't matter
+        normalized = re.sub(r'\s+', ' ', resume_text or '').strip().lower()
+        return f"careerpath:resume:text:{hashlib.sha256(normalized.encode()).hexdigest()}"
+
+    async def get_cached_resume_by_pdf(self, pdf_bytes) -> Optional[Dict[str, Any]]:
+        """Retrieve extracted text and skills for previously uploaded PDF bytes (or a SpooledPDF)"""
+        return await self._get_json(self._generate_resume_pdf_key(pdf_bytes))
+
+    async def get_cached_resume_by_text(self, resume_text: str) -> Optional[Dict[str, Any]]:
+        """Retrieve extracted skills for previously seen resume text"""
+        return await self._get_json(self._generate_resume_text_key(resume_text))
+
+    async def set_cached_resume(self, resume_text: str, student_skills: list, pdf_bytes=None):
+        """Store extracted skills under the normalized-text hash and, if given, the PDF hash"""
+        cache_data = {
+            'resume_text': resume_text,
+            'student_skills': student_skills,
+            'cached_at': time.time()
+        }
+        entries = [(self._generate_resume_text_key(resume_text), cache_data, self.resume_cache_ttl)]
+        if pdf_bytes is not None:
+            entries.append((self._generate_resume_pdf_key(pdf_bytes), cache_data, self.resume_cache_ttl))
+        await self._set_many(entries)
+
+    def _generate_skill_course_key(self, skill: str, platform: str) -> str:
+        return f"careerpath:skill_courses:{platform}:{hashlib.md5(normalize_skill(skill).encode()).hexdigest()}"
+
+    async def get_cached_skill_courses_many(self, skills: list, platforms: list) -> Dict[str, Optional[list]]:
+        """
+        Cached courses for several skills across the given platforms, read in one batch.
+        A skill maps to None unless every platform has an entry, so partial skills get re-crawled.
+        """
+        platforms = list(platforms) + ['other']
+        keys = [self._generate_skill_course_key(skill, platform) for skill in skills for platform in platforms]
+        values = await self._get_many(keys) if keys else []
+        result = {}
+        for i, skill in enumerate(skills):
+            entries = values[i * len(platforms):(i + 1) * len(platforms)]
+            if any(entry is None for entry in entries):
+                result[skill] = None
+            else:
+                result[skill] = [course for entry in entries for course in entry['courses']]
+        return result
+
+    async def get_cached_skill_courses(self, skill: str, platforms: list) -> Optional[list]:
+        """Retrieve cached courses for one skill across the given platforms"""
+        return (await self.get_cached_skill_courses_many([skill], platforms))[skill]
+
+    async def set_cached_skill_courses(self, skill: str, courses_by_platform: Dict[str, list]):
+        """Store course discovery results for one skill, one entry per platform"""
+        await self._set_many([
+            (
+                self._generate_skill_course_key(skill, platform),
+                {'courses': courses, 'skill': normalize_skill(skill), 'platform': platform, 'cached_at': time.time()},
+                self.skill_course_ttl
+            )
+            for platform, courses in courses_by_platform.items()
+        ], [self._skill_index_key(skill)])
+        print(f"Cached courses for skill: {skill}")
+
     def _generate_key(self, career_goal: str, missing_skills: list) -> str:
         """Generate a unique cache key"""
-        key_data = f"{career_goal}:{':'.join(sorted(missing_skills))}"
+        skill_keys = sorted({normalize_skill(s) for s in missing_skills})
+        key_data = f"{normalize_career_goal(career_goal)}:{':'.join(skill_keys)}"
         return f"careerpath:{hashlib.md5(key_data.encode()).hexdigest()}"
-    
-    def get_cached_courses(self, career_goal: str, missing_skills: list) -> Optional[Dict[str, Any]]:
+
+    async def get_cached_courses(self, career_goal: str, missing_skills: list) -> Optional[Dict[str, Any]]:
         """Retrieve cached course data"""
-        key = self._generate_key(career_goal, missing_skills)
-        try:
-            cached_data = self.redis_client.get(key)
-            if cached_data:
-                return json.loads(cached_data)
-        except Exception as e:
-            print(f"Cache get error: {e}")
-        return None
-    
-    def set_cached_courses(self, career_goal: str, missing_skills: list, courses: list, recommendations: dict):
+        return await self._get_json(self._generate_key(career_goal, missing_skills))
+
+    async def set_cached_courses(self, career_goal: str, missing_skills: list, courses: list, recommendations: dict):
         """Store course data in cache"""
-        key = self._generate_key(career_goal, missing_skills)
         cache_data = {
             'courses': courses,
             'recommendations': recommendations,
@@ -41,92 +253,533 @@ class CacheManager:
             'career_goal': career_goal,
             'missing_skills': missing_skills
         }
-        try:
-            self.redis_client.setex(key, self.cache_ttl, json.dumps(cache_data))
-            print(f"Cached courses for {career_goal}")
-        except Exception as e:
-            print(f"Cache set error: {e}")
-    
-    def invalidate_cache(self, career_goal: str = None):
-        """Clear cache entries"""
-        try:
-            if career_goal:
-                pattern = f"careerpath:*{hashlib.md5(career_goal.encode()).hexdigest()[:8]}*"
-            else:
-                pattern = "careerpath:*"
-            
-            keys = self.redis_client.keys(pattern)
-            if keys:
-                self.redis_client.delete(*keys)
-                print(f"Cleared {len(keys)} cache entries")
-        except Exception as e:
-            print(f"Cache invalidation error: {e}")
+        index_keys = [self._goal_index_key(career_goal)] + [self._skill_index_key(s) for s in missing_skills]
+        await self._set_json(self._generate_key(career_goal, missing_skills), cache_data, self.cache_ttl, index_keys)
+        print(f"Cached courses for {career_goal}")
 
     def _generate_career_key(self, career_goal: str) -> str:
         """Generate cache key based only on career goal"""
-        key_data = f"{career_goal}"
+        key_data = f"{normalize_career_goal(career_goal)}"
         return f"careerpath:{hashlib.md5(key_data.encode()).hexdigest()}"
 
-    def get_cached_courses_by_career(self, career_goal: str) -> Optional[Dict[str, Any]]:
+    async def get_cached_courses_by_career(self, career_goal: str) -> Optional[Dict[str, Any]]:
         """Retrieve cached course data by career goal only"""
-        key = self._generate_career_key(career_goal)        
-        try:
-            cached_data = self.redis_client.get(key)
-            if cached_data:
-                return json.loads(cached_data)
-        except Exception as e:
-            print(f"Cache get error: {e}")
-        return None
+        return await self._get_json(self._generate_career_key(career_goal))
 
-    def set_cached_courses_by_career(self, career_goal: str, courses: list, recommendations: dict):
+    async def set_cached_courses_by_career(self, career_goal: str, courses: list, recommendations: dict):
         """Store course data in cache by career goal only"""
-        key = self._generate_career_key(career_goal)
         cache_data = {
             'courses': courses,
             'recommendations': recommendations,
             'timestamp': datetime.now().isoformat(),
             'career_goal': career_goal
         }
+        await self._set_json(self._generate_career_key(career_goal), cache_data, self.cache_ttl,
+                             [self._goal_index_key(career_goal)])
+        print(f"Cached courses for career: {career_goal}")
+
+
+# Errors that mean Redis itself is unreachable, as opposed to a bad value
+_REDIS_DOWN_ERRORS = (redis.ConnectionError, redis.TimeoutError, OSError)
+
+
+class CacheManager(BaseCacheManager):
+    """
+    Redis backend on a pooled asyncio client.
+
+    Multi-key reads go through MGET and multi-key writes through one pipeline.
+    A small per-worker L1 (an InMemoryCacheManager with a TTL of at most
+    L1_CACHE_TTL_SECONDS) sits in front of Redis: it is filled on Redis hits
+    and writes, and /cache/clear invalidates it in every worker via pub/sub.
+    While Redis is unreachable every call is served by an in-process
+    InMemoryCacheManager, and Redis is retried after REDIS_RETRY_SECONDS.
+    """
+
+    name = "redis"
+
+    def __init__(self):
+        super().__init__()
+        self.pool = aioredis.ConnectionPool(
+            host=os.getenv('REDIS_HOST', 'localhost'),
+            port=int(os.getenv('REDIS_PORT', 6379)),
+            db=0,
+            # Values are binary (see CacheSerializer); keys are decoded where they are read back
+            decode_responses=False,
+            max_connections=int(os.getenv('REDIS_MAX_CONNECTIONS', 50)),
+            socket_connect_timeout=float(os.getenv('REDIS_SOCKET_TIMEOUT_SECONDS', 2)),
+            socket_timeout=float(os.getenv('REDIS_SOCKET_TIMEOUT_SECONDS', 2))
+        )
+        self.redis_client = aioredis.Redis(connection_pool=self.pool)
+        self.serializer = CacheSerializer()
+        self.fallback = InMemoryCacheManager()
+        self.l1 = InMemoryCacheManager(
+            max_entries=int(os.getenv('L1_CACHE_MAX_ENTRIES', 1000)),
+            max_bytes=int(float(os.getenv('L1_CACHE_MAX_MB', 64)) * 1024 * 1024)
+        ) if L1_CACHE_ENABLED else None
+        self.instance_id = uuid.uuid4().hex
+        self.retry_interval = float(os.getenv('REDIS_RETRY_SECONDS', 30))
+        self._down_until = 0.0
+        self._listener: Optional[asyncio.Task] = None
+
+    @property
+    def available(self) -> bool:
+        return time.monotonic() >= self._down_until
+
+    def _mark_down(self, error: Exception):
+        if self.available:
+            print(f"Redis unreachable ({error}), using in-memory cache for {self.retry_interval:.0f}s")
+        self._down_until = time.monotonic() + self.retry_interval
+
+    async def connect(self) -> bool:
+        """Ping Redis once so startup logs which backend is in use"""
+        await self.fallback.connect()
+        if self.l1 is not None:
+            await self.l1.connect()
+            self._listener = asyncio.create_task(self._listen_for_invalidations())
+        try:
+            await self.redis_client.ping()
+            print("Using Redis cache" + (" with in-process L1" if self.l1 is not None else ""))
+            return True
+        except _REDIS_DOWN_ERRORS as e:
+            self._mark_down(e)
+            return False
+
+    async def close(self):
+        if self._listener is not None:
+            self._listener.cancel()
+            await asyncio.gather(self._listener, return_exceptions=True)
+            self._listener = None
+        if self.l1 is not None:
+            await self.l1.close()
+        await self.fallback.close()
+        await self.redis_client.aclose()
+        await self.pool.disconnect()
+
+    def _l1_cacheable(self, key: str) -> bool:
+        return self.l1 is not None and not key.startswith(_L1_EXCLUDED_PREFIXES)
+
+    async def _fill_l1(self, entries: List[Tuple[str, Any, int]], index_keys: Iterable[str] = ()):
+        entries = [(key, value, min(ttl, L1_CACHE_TTL)) for key, value, ttl in entries if self._l1_cacheable(key)]
+        if entries:
+            await self.l1._set_many(entries, index_keys)
+
+    async def _publish_invalidation(self, keys: List[str] = None):
+        """Tell the other workers to drop keys (or everything) from their L1"""
+        if self.l1 is None:
+            return
+        message = {'origin': self.instance_id, 'keys': keys} if keys is not None else {'origin': self.instance_id, 'all': True}
+        try:
+            await self.redis_client.publish(L1_INVALIDATION_CHANNEL, json.dumps(message))
+        except Exception as e:
+            print(f"L1 invalidation publish error: {e}")
+
+    async def _drop_from_l1(self, keys: List[str] = None):
+        if keys is None:
+            await self.l1.invalidate_cache()
+        else:
+            for key in keys:
+                self.l1._remove(key)
+
+    async def _listen_for_invalidations(self):
+        while True:
+            pubsub = self.redis_client.pubsub()
+            try:
+                await pubsub.subscribe(L1_INVALIDATION_CHANNEL)
+                # Clears may have been missed while unsubscribed
+                await self.l1.invalidate_cache()
+                while True:
+                    # Short reads stay under the pool's socket timeout
+                    message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                    if not message or message.get('type') != 'message':
+                        continue
+                    data = json.loads(message['data'])
+                    if data.get('origin') != self.instance_id:
+                        await self._drop_from_l1(None if data.get('all') else data.get('keys') or [])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Without invalidations L1 could serve cleared entries, so stop using it until resubscribed
+                await self.l1.invalidate_cache()
+                print(f"L1 invalidation listener error ({e}), resubscribing in {self.retry_interval:.0f}s")
+                await asyncio.sleep(self.retry_interval)
+            finally:
+                await pubsub.aclose()
+
+    async def _get_many(self, keys: List[str]) -> List[Optional[Any]]:
+        if not self.available:
+            return await self.fallback._get_many(keys)
+        results: List[Optional[Any]] = [None] * len(keys)
+        l1_slots = [i for i, key in enumerate(keys) if self._l1_cacheable(key)]
+        if l1_slots:
+            for i, value in zip(l1_slots, await self.l1._get_many([keys[i] for i in l1_slots])):
+                results[i] = value
+        missing = [i for i, value in enumerate(results) if value is None]
+        if not missing:
+            return results
+        missing_keys = [keys[i] for i in missing]
+        try:
+            values = await self.redis_client.mget(missing_keys)
+        except _REDIS_DOWN_ERRORS as e:
+            self._mark_down(e)
+            return await self.fallback._get_many(keys)
+        except Exception as e:
+            print(f"Cache get error: {e}")
+            return results
+        fills, stale = [], []
+        for i, key, value in zip(missing, missing_keys, values):
+            try:
+                results[i] = self.serializer.loads(value)
+            except StaleCacheEntry:
+                stale.append(key)
+            except Exception as e:
+                print(f"Cache decode error: {e}")
+            if results[i] is not None:
+                fills.append((key, results[i], L1_CACHE_TTL))
+        self._count_reads(missing_keys, [results[i] for i in missing])
+        if stale:
+            # Written by another schema version: drop rather than misparse
+            for key in stale:
+                self._count(key, 'stale')
+            try:
+                await self.redis_client.unlink(*stale)
+            except _REDIS_DOWN_ERRORS as e:
+                # The values already read are still good; only the cleanup is lost
+                self._mark_down(e)
+            except Exception as e:
+                print(f"Cache stale-entry cleanup error: {e}")
+        await self._fill_l1(fills)
+        return results
+
+    async def _set_many(self, entries: List[Tuple[str, Any, int]], index_keys: Iterable[str] = ()):
+        if not entries:
+            return
+        if not self.available:
+            return await self.fallback._set_many(entries, index_keys)
         try:
-            self.redis_client.setex(key, self.cache_ttl, json.dumps(cache_data))
-            print(f"Cached courses for career: {career_goal}")
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                for key, value, ttl in entries:
+                    pipe.setex(key, ttl, self.serializer.dumps(value))
+                for index_key in dict.fromkeys(index_keys):
+                    pipe.sadd(index_key, *[key for key, _, _ in entries])
+                    pipe.expire(index_key, self.index_ttl)
+                await pipe.execute()
+            await self._fill_l1(entries, index_keys)
+        except _REDIS_DOWN_ERRORS as e:
+            self._mark_down(e)
+            await self.fallback._set_many(entries, index_keys)
         except Exception as e:
             print(f"Cache set error: {e}")
 
-# Fallback to in-memory cache if Redis unavailable
-class InMemoryCacheManager:
-    def __init__(self):
-        self.cache = {}
-        self.cache_ttl = timedelta(hours=24)
-    
-    def _generate_key(self, career_goal: str, missing_skills: list) -> str:
-        key_data = f"{career_goal}:{':'.join(sorted(missing_skills))}"
-        return hashlib.md5(key_data.encode()).hexdigest()
-    
-    def get_cached_courses(self, career_goal: str, missing_skills: list) -> Optional[Dict[str, Any]]:
-        key = self._generate_key(career_goal, missing_skills)
-        if key in self.cache:
-            cached_data = self.cache[key]
-            if datetime.now() - cached_data['timestamp'] < self.cache_ttl:
-                return cached_data
-            else:
-                del self.cache[key]  # Remove expired entry
-        return None
-    
-    def set_cached_courses(self, career_goal: str, missing_skills: list, courses: list, recommendations: dict):
-        key = self._generate_key(career_goal, missing_skills)
-        self.cache[key] = {
-            'courses': courses,
-            'recommendations': recommendations,
-            'timestamp': datetime.now(),
-            'career_goal': career_goal,
-            'missing_skills': missing_skills
+    # Only the holder may extend or release a lock
+    _EXTEND_LOCK_SCRIPT = """
+    if redis.call('get', KEYS[1]) == ARGV[1] then
+        return redis.call('pexpire', KEYS[1], ARGV[2])
+    end
+    return 0
+    """
+    _RELEASE_LOCK_SCRIPT = """
+    if redis.call('get', KEYS[1]) == ARGV[1] then
+        return redis.call('del', KEYS[1])
+    end
+    return 0
+    """
+
+    async def _lock_call(self, fallback_method, redis_call):
+        if not self.available:
+            return await fallback_method()
+        try:
+            return await redis_call()
+        except _REDIS_DOWN_ERRORS as e:
+            self._mark_down(e)
+            return await fallback_method()
+
+    async def acquire_lock(self, name: str, token: str, ttl: float) -> bool:
+        return bool(await self._lock_call(
+            lambda: self.fallback.acquire_lock(name, token, ttl),
+            lambda: self.redis_client.set(name, token, nx=True, px=int(ttl * 1000))
+        ))
+
+    async def extend_lock(self, name: str, token: str, ttl: float) -> bool:
+        return bool(await self._lock_call(
+            lambda: self.fallback.extend_lock(name, token, ttl),
+            lambda: self.redis_client.eval(self._EXTEND_LOCK_SCRIPT, 1, name, token, int(ttl * 1000))
+        ))
+
+    async def release_lock(self, name: str, token: str):
+        await self._lock_call(
+            lambda: self.fallback.release_lock(name, token),
+            lambda: self.redis_client.eval(self._RELEASE_LOCK_SCRIPT, 1, name, token)
+        )
+
+    async def lock_exists(self, name: str) -> bool:
+        return bool(await self._lock_call(
+            lambda: self.fallback.lock_exists(name),
+            lambda: self.redis_client.exists(name)
+        ))
+
+    async def _unlink_batched(self, keys: AsyncIterator[str], publish: bool = False) -> int:
+        """UNLINK keys from an async iterator in INVALIDATE_BATCH_SIZE chunks"""
+        removed, batch = 0, []
+
+        async def _flush():
+            nonlocal removed
+            removed += await self.redis_client.unlink(*batch)
+            if publish and self.l1 is not None:
+                await self._drop_from_l1(batch)
+                await self._publish_invalidation(batch)
+
+        async for key in keys:
+            batch.append(key)
+            if len(batch) >= INVALIDATE_BATCH_SIZE:
+                await _flush()
+                batch = []
+        if batch:
+            await _flush()
+        return removed
+
+    async def _invalidate_index(self, index_key: str) -> int:
+        async def _members():
+            async for key in self.redis_client.sscan_iter(index_key, count=INVALIDATE_BATCH_SIZE):
+                yield key.decode()
+
+        removed = await self._unlink_batched(_members(), publish=True)
+        await self.redis_client.unlink(index_key)
+        return removed
+
+    async def _scan_cache_keys(self) -> AsyncIterator[str]:
+        async for key in self.redis_client.scan_iter(match="careerpath:*", count=INVALIDATE_BATCH_SIZE):
+            key = key.decode()
+            if not key.startswith(_PRESERVED_PREFIXES):
+                yield key
+
+    async def invalidate_cache(self, career_goal: str = None, skill: str = None) -> int:
+        """Clear cache entries through the goal/skill indexes, or SCAN + UNLINK everything"""
+        removed = await self.fallback.invalidate_cache(career_goal, skill)
+        if not self.available:
+            return removed
+        try:
+            if career_goal:
+                removed += await self._invalidate_index(self._goal_index_key(career_goal))
+            if skill:
+                removed += await self._invalidate_index(self._skill_index_key(skill))
+            if not career_goal and not skill:
+                removed += await self._unlink_batched(self._scan_cache_keys())
+                if self.l1 is not None:
+                    await self.l1.invalidate_cache()
+                    await self._publish_invalidation()
+            print(f"Cleared {removed} cache entries")
+        except _REDIS_DOWN_ERRORS as e:
+            self._mark_down(e)
+        except Exception as e:
+            print(f"Cache invalidation error: {e}")
+        return removed
+
+    async def _sample_namespaces(self, total_keys: int) -> Dict[str, Dict[str, int]]:
+        """Estimate entries and bytes per namespace from a SCAN sample of MEMORY USAGE"""
+        sample = []
+        async for key in self.redis_client.scan_iter(match="careerpath:*", count=INVALIDATE_BATCH_SIZE):
+            sample.append(key.decode())
+            if len(sample) >= STATS_SAMPLE_SIZE:
+                break
+        if not sample:
+            return {}
+        async with self.redis_client.pipeline(transaction=False) as pipe:
+            for key in sample:
+                pipe.memory_usage(key)
+            sizes = await pipe.execute()
+        scale = max(total_keys, len(sample)) / len(sample)
+        namespaces: Dict[str, Dict[str, int]] = {}
+        for key, size in zip(sample, sizes):
+            usage = namespaces.setdefault(cache_namespace(key), {'entries': 0, 'bytes': 0})
+            usage['entries'] += 1
+            usage['bytes'] += size or 0
+        return {
+            name: {'entries': round(usage['entries'] * scale), 'bytes': round(usage['bytes'] * scale)}
+            for name, usage in namespaces.items()
         }
 
-# Initialize cache manager
-try:
-    cache_manager = CacheManager()
-    print("Using Redis cache")
-except:
+    async def stats(self) -> Dict[str, Any]:
+        if not self.available:
+            return {**await self.fallback.stats(), "redis_available": False}
+        try:
+            info = await self.redis_client.info()
+            keys = await self.redis_client.dbsize()
+            usage = await self._sample_namespaces(keys)
+        except _REDIS_DOWN_ERRORS as e:
+            self._mark_down(e)
+            return {**await self.fallback.stats(), "redis_available": False}
+        namespaces = {}
+        for name in set(usage) | set(self.counters):
+            namespaces[name] = {
+                **self.counters.get(name, {'hits': 0, 'misses': 0, 'evictions': 0}),
+                **usage.get(name, {'entries': 0, 'bytes': 0})
+            }
+        return {
+            "cache_type": "Redis",
+            "memory_usage": info.get('used_memory_human'),
+            "keys": keys,
+            "evicted_keys": info.get('evicted_keys', 0),
+            "namespaces": namespaces,
+            "l1": await self.l1.stats() if self.l1 is not None else None
+        }
+
+
+class InMemoryCacheManager(BaseCacheManager):
+    """
+    Bounded in-process cache, used on its own or while Redis is unreachable.
+
+    Entries are evicted least-recently-used once MEMORY_CACHE_MAX_ENTRIES or
+    MEMORY_CACHE_MAX_MB (measured as serialized JSON size) is exceeded, and
+    expired entries are swept every MEMORY_CACHE_SWEEP_SECONDS.
+    """
+
+    name = "in-memory"
+
+    def __init__(self, max_entries: int = None, max_bytes: int = None, sweep_interval: float = None):
+        super().__init__()
+        self.max_entries = max_entries or int(os.getenv('MEMORY_CACHE_MAX_ENTRIES', 10000))
+        self.max_bytes = max_bytes or int(float(os.getenv('MEMORY_CACHE_MAX_MB', 256)) * 1024 * 1024)
+        self.sweep_interval = sweep_interval or float(os.getenv('MEMORY_CACHE_SWEEP_SECONDS', 60))
+        # key -> {'value', 'expires_at', 'size'}, least recently used first
+        self.cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self.bytes = 0
+        self.indexes: Dict[str, set] = {}
+        # Locks live outside the LRU so they are never evicted
+        self.locks: Dict[str, Tuple[str, float]] = {}
+        self._sweeper: Optional[asyncio.Task] = None
+
+    async def connect(self) -> bool:
+        if self._sweeper is None:
+            self._sweeper = asyncio.create_task(self._sweep_loop())
+        return True
+
+    async def close(self):
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            self._sweeper = None
+
+    async def _sweep_loop(self):
+        while True:
+            await asyncio.sleep(self.sweep_interval)
+            try:
+                removed = self.sweep()
+                if removed:
+                    print(f"Swept {removed} expired cache entries")
+            except Exception as e:
+                print(f"Cache sweep error: {e}")
+
+    def sweep(self) -> int:
+        """Drop expired entries and locks, and index members that no longer exist"""
+        now = time.time()
+        expired = [key for key, entry in self.cache.items() if entry['expires_at'] <= now]
+        for key in expired:
+            self._remove(key)
+        for name in [name for name, (_, expires_at) in self.locks.items() if expires_at <= now]:
+            del self.locks[name]
+        for index_key in list(self.indexes):
+            self.indexes[index_key] &= self.cache.keys()
+            if not self.indexes[index_key]:
+                del self.indexes[index_key]
+        return len(expired)
+
+    def _remove(self, key: str) -> bool:
+        entry = self.cache.pop(key, None)
+        if entry is None:
+            return False
+        self.bytes -= entry['size']
+        return True
+
+    def _get(self, key: str) -> Optional[Any]:
+        entry = self.cache.get(key)
+        if entry is None:
+            return None
+        if time.time() >= entry['expires_at']:
+            self._remove(key)  # Remove expired entry
+            return None
+        self.cache.move_to_end(key)
+        value = entry['value']
+        return dict(value) if isinstance(value, dict) else value
+
+    async def _get_many(self, keys: List[str]) -> List[Optional[Any]]:
+        values = [self._get(key) for key in keys]
+        self._count_reads(keys, values)
+        return values
+
+    async def _set_many(self, entries: List[Tuple[str, Any, int]], index_keys: Iterable[str] = ()):
+        for key, value, ttl in entries:
+            self._remove(key)
+            size = len(json.dumps(value, default=str))
+            self.cache[key] = {'value': value, 'expires_at': time.time() + ttl, 'size': size}
+            self.bytes += size
+        for index_key in index_keys:
+            self.indexes.setdefault(index_key, set()).update(key for key, _, _ in entries)
+        self._evict()
+
+    def _evict(self):
+        while self.cache and (len(self.cache) > self.max_entries or self.bytes > self.max_bytes):
+            key, entry = self.cache.popitem(last=False)
+            self.bytes -= entry['size']
+            self._count(key, 'evictions')
+
+    def _lock_holder(self, name: str) -> Optional[str]:
+        token, expires_at = self.locks.get(name, (None, 0))
+        if token is not None and time.time() >= expires_at:
+            del self.locks[name]
+            return None
+        return token
+
+    async def acquire_lock(self, name: str, token: str, ttl: float) -> bool:
+        if self._lock_holder(name) is not None:
+            return False
+        self.locks[name] = (token, time.time() + ttl)
+        return True
+
+    async def extend_lock(self, name: str, token: str, ttl: float) -> bool:
+        if self._lock_holder(name) != token:
+            return False
+        self.locks[name] = (token, time.time() + ttl)
+        return True
+
+    async def release_lock(self, name: str, token: str):
+        if self._lock_holder(name) == token:
+            del self.locks[name]
+
+    async def lock_exists(self, name: str) -> bool:
+        return self._lock_holder(name) is not None
+
+    async def invalidate_cache(self, career_goal: str = None, skill: str = None) -> int:
+        if not career_goal and not skill:
+            keys = [key for key in self.cache if not key.startswith(_PRESERVED_PREFIXES)]
+            self.indexes.clear()
+        else:
+            keys = set()
+            if career_goal:
+                keys |= self.indexes.pop(self._goal_index_key(career_goal), set())
+            if skill:
+                keys |= self.indexes.pop(self._skill_index_key(skill), set())
+        return sum(self._remove(key) for key in keys)
+
+    async def stats(self) -> Dict[str, Any]:
+        namespaces: Dict[str, Dict[str, int]] = {
+            name: {**counters, 'entries': 0, 'bytes': 0} for name, counters in self.counters.items()
+        }
+        for key, entry in self.cache.items():
+            usage = namespaces.setdefault(cache_namespace(key), {'hits': 0, 'misses': 0, 'evictions': 0,
+                                                                 'entries': 0, 'bytes': 0})
+            usage['entries'] += 1
+            usage['bytes'] += entry['size']
+        return {
+            "cache_type": "In-Memory",
+            "cached_entries": len(self.cache),
+            "bytes": self.bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "namespaces": namespaces
+        }
+
+# Redis with automatic in-memory fallback; set CACHE_BACKEND=memory to skip Redis entirely
+if os.getenv('CACHE_BACKEND', 'redis').lower() == 'memory':
     cache_manager = InMemoryCacheManager()
-    print("Using in-memory cache")
\ No newline at end of file
+    print("Using in-memory cache")
+else:
+    cache_manager = CacheManager()
@@ -0,0 +1,105 @@
+import json
+import os
+import zlib
+from typing import Any, Dict, Optional
+
+try:
+    import msgpack
+except ImportError:  # Optional: JSON bytes are used instead
+    msgpack = None
+
+# Bump when the shape of cached payloads changes; entries written under
+# another version are treated as misses and removed instead of being parsed
+CACHE_SCHEMA_VERSION = 1
+
+# Envelope: magic (2 bytes) | schema version | codec id | flags
+_MAGIC = b'\xcaP'
+_HEADER_SIZE = 5
+_FLAG_ZLIB = 0x01
+
+
+class StaleCacheEntry(ValueError):
+    """A cached value from another schema version, or not in the envelope format at all"""
+
+
+class JSONCodec:
+    codec_id = 1
+    name = "json"
+
+    def dumps(self, value: Any) -> bytes:
+        return json.dumps(value, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+    def loads(self, data: bytes) -> Any:
+        return json.loads(data)
+
+
+class MsgpackCodec:
+    codec_id = 2
+    name = "msgpack"
+
+    def dumps(self, value: Any) -> bytes:
+        return msgpack.packb(value, use_bin_type=True, default=str)
+
+    def loads(self, data: bytes) -> Any:
+        return msgpack.unpackb(data, raw=False, strict_map_key=False)
+
+
+def _available_codecs() -> Dict[int, Any]:
+    codecs = [JSONCodec()]
+    if msgpack is not None:
+        codecs.append(MsgpackCodec())
+    return {codec.codec_id: codec for codec in codecs}
+
+
+class CacheSerializer:
+    """
+    Versioned binary encoding for cached values.
+
+    Values are encoded with msgpack (or compact JSON when msgpack isn't
+    installed), zlib-compressed above `compress_min_bytes` when that saves
+    space, and prefixed with a small header carrying the schema version and
+    codec. Any codec can be decoded, so switching CACHE_SERIALIZER doesn't
+    invalidate existing entries; a schema-version change does.
+    """
+
+    def __init__(self, codec: str = None, compress_min_bytes: int = None, compress_level: int = None):
+        self.codecs = _available_codecs()
+        codec = (codec or os.getenv('CACHE_SERIALIZER', 'auto')).lower()
+        by_name = {c.name: c for c in self.codecs.values()}
+        if codec == 'auto':
+            codec = 'msgpack' if 'msgpack' in by_name else 'json'
+        if codec not in by_name:
+            print(f"Cache serializer '{codec}' unavailable, using json")
+            codec = 'json'
+        self.codec = by_name[codec]
+        self.compress_min_bytes = compress_min_bytes if compress_min_bytes is not None else \
+            int(os.getenv('CACHE_COMPRESS_MIN_BYTES', 1024))
+        self.compress_level = compress_level if compress_level is not None else \
+            int(os.getenv('CACHE_COMPRESS_LEVEL', 1))
+
+    def dumps(self, value: Any) -> bytes:
+        payload, flags = self.codec.dumps(value), 0
+        if self.compress_min_bytes >= 0 and len(payload) >= self.compress_min_bytes:
+            compressed = zlib.compress(payload, self.compress_level)
+            if len(compressed) < len(payload):
+                payload, flags = compressed, flags | _FLAG_ZLIB
+        return _MAGIC + bytes([CACHE_SCHEMA_VERSION, self.codec.codec_id, flags]) + payload
+
+    def loads(self, data: Optional[bytes]) -> Any:
+        """Decode a stored value; raises StaleCacheEntry for entries this version can't read"""
+        if data is None:
+            return None
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        if len(data) < _HEADER_SIZE or data[:2] != _MAGIC:
+            raise StaleCacheEntry("unversioned cache entry")
+        version, codec_id, flags = data[2], data[3], data[4]
+        if version != CACHE_SCHEMA_VERSION:
+            raise StaleCacheEntry(f"schema version {version}, expected {CACHE_SCHEMA_VERSION}")
+        codec = self.codecs.get(codec_id)
+        if codec is None:
+            raise StaleCacheEntry(f"unknown codec {codec_id}")
+        payload = data[_HEADER_SIZE:]
+        if flags & _FLAG_ZLIB:
+            payload = zlib.decompress(payload)
+        return codec.loads(payload)
@@ -0,0 +1,268 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from utils.course_ranker import parse_number
+from utils.skill_ontology import get_skill_ontology
+
+COURSE_CATALOG_ENABLED = os.getenv('COURSE_CATALOG_ENABLED', 'true').lower() not in ('0', 'false', 'no')
+COURSE_CATALOG_PATH = os.getenv('COURSE_CATALOG_PATH', '.course_catalog.sqlite3')
+# A skill is served from the catalog when at least this many fresh courses were crawled for it
+COURSE_CATALOG_MIN_COURSES = int(os.getenv('COURSE_CATALOG_MIN_COURSES', 5))
+# Courses not seen in a crawl for this long no longer count towards coverage
+COURSE_CATALOG_FRESH_DAYS = float(os.getenv('COURSE_CATALOG_FRESH_DAYS', 7))
+# Courses returned per skill
+COURSE_CATALOG_LIMIT = int(os.getenv('COURSE_CATALOG_LIMIT', 20))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS courses (
+    id INTEGER PRIMARY KEY,
+    url TEXT NOT NULL UNIQUE,
+    title TEXT NOT NULL DEFAULT '',
+    description TEXT NOT NULL DEFAULT '',
+    platform TEXT,
+    rating REAL,
+    price REAL,
+    duration TEXT,
+    data TEXT NOT NULL,
+    first_seen REAL NOT NULL,
+    last_seen REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS courses_last_seen ON courses(last_seen);
+CREATE VIRTUAL TABLE IF NOT EXISTS courses_fts USING fts5(
+    title, description, content='courses', content_rowid='id', tokenize="unicode61 tokenchars '+#'"
+);
+CREATE TRIGGER IF NOT EXISTS courses_ai AFTER INSERT ON courses BEGIN
+    INSERT INTO courses_fts(rowid, title, description) VALUES (new.id, new.title, new.description);
+END;
+CREATE TRIGGER IF NOT EXISTS courses_ad AFTER DELETE ON courses BEGIN
+    INSERT INTO courses_fts(courses_fts, rowid, title, description) VALUES ('delete', old.id, old.title, old.description);
+END;
+CREATE TRIGGER IF NOT EXISTS courses_au AFTER UPDATE OF title, description ON courses BEGIN
+    INSERT INTO courses_fts(courses_fts, rowid, title, description) VALUES ('delete', old.id, old.title, old.description);
+    INSERT INTO courses_fts(rowid, title, description) VALUES (new.id, new.title, new.description);
+END;
+CREATE TABLE IF NOT EXISTS skill_crawls (
+    skill_key TEXT PRIMARY KEY,
+    skill TEXT NOT NULL,
+    crawled_at REAL NOT NULL,
+    courses INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS skill_courses (
+    skill_key TEXT NOT NULL,
+    course_id INTEGER NOT NULL REFERENCES courses(id),
+    PRIMARY KEY (skill_key, course_id)
+);
+"""
+
+
+def _price_value(price: Any) -> Optional[float]:
+    text = str(price or '').strip().lower()
+    if not text:
+        return None
+    return 0.0 if 'free' in text else parse_number(text)
+
+
+def _fts_query(skill: str) -> str:
+    """FTS5 query matching any known spelling of the skill as a phrase (used for ordering only)"""
+    phrases = []
+    for alias in get_skill_ontology().aliases(skill):
+        alias = ' '.join(str(alias).replace('"', ' ').split())
+        if alias and f'"{alias}"' not in phrases:
+            phrases.append(f'"{alias}"')
+    return ' OR '.join(phrases)
+
+
+class CourseCatalog:
+    """
+    Persistent SQLite catalog of every crawled course, deduplicated by URL,
+    with an FTS5 index over title and description.
+
+    Each course is linked to the skills it was crawled for, and coverage only
+    counts those links: text matches alone would let short aliases ("go",
+    "rest") claim unrelated courses. Course discovery asks the catalog first;
+    a skill is only crawled when fewer than COURSE_CATALOG_MIN_COURSES of its
+    courses were seen within COURSE_CATALOG_FRESH_DAYS and it hasn't itself
+    been crawled in that window.
+    """
+
+    def __init__(self, path: str = COURSE_CATALOG_PATH, min_courses: int = COURSE_CATALOG_MIN_COURSES,
+                 fresh_days: float = COURSE_CATALOG_FRESH_DAYS, limit: int = COURSE_CATALOG_LIMIT):
+        self.path = path
+        self.min_courses = min_courses
+        self.fresh_seconds = fresh_days * 86400
+        self.limit = limit
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self.hits = 0
+        self.misses = 0
+        self.ingested = 0
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            if os.path.dirname(self.path):
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            # One connection shared by the pipeline threads (under self._lock); WAL lets
+            # several uvicorn workers read while one of them writes
+            conn = sqlite3.connect(self.path, timeout=5, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def ingest(self, skill: str, courses: List[Dict[str, Any]]) -> int:
+        """Upsert crawled courses by URL and record the crawl for the skill; returns courses stored"""
+        now = time.time()
+        rows = []
+        for course in courses or []:
+            if not isinstance(course, dict):
+                continue
+            url = course.get('course_url') or course.get('url')
+            if not url:
+                continue
+            rows.append((
+                url,
+                course.get('course_title') or course.get('title') or '',
+                course.get('course_description') or course.get('description') or '',
+                course.get('platform'),
+                parse_number(course.get('rating')),
+                _price_value(course.get('price')),
+                course.get('duration'),
+                json.dumps(course, ensure_ascii=False, default=str),
+                now, now,
+            ))
+        try:
+            self._upsert(skill, rows, now)
+        except sqlite3.Error as e:
+            print(f"Course catalog ingest failed for {skill}: {e}")
+            return 0
+        self.ingested += len(rows)
+        return len(rows)
+
+    def _upsert(self, skill: str, rows: List[tuple], now: float):
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.executemany("""
+                    INSERT INTO courses (url, title, description, platform, rating, price, duration, data,
+                                         first_seen, last_seen)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(url) DO UPDATE SET
+                        title = excluded.title, description = excluded.description,
+                        platform = excluded.platform, rating = excluded.rating, price = excluded.price,
+                        duration = excluded.duration, data = excluded.data, last_seen = excluded.last_seen
+                """, rows)
+                skill_key = get_skill_ontology().skill_key(skill)
+                conn.executemany(
+                    "INSERT OR IGNORE INTO skill_courses (skill_key, course_id) SELECT ?, id FROM courses WHERE url = ?",
+                    [(skill_key, row[0]) for row in rows]
+                )
+                conn.execute(
+                    "INSERT OR REPLACE INTO skill_crawls (skill_key, skill, crawled_at, courses) VALUES (?, ?, ?, ?)",
+                    (skill_key, skill, now, len(rows))
+                )
+
+    def search(self, skill: str, limit: int = None, fresh_only: bool = True) -> List[Dict[str, Any]]:
+        """Courses crawled for the skill, best FTS match of its aliases (title weighted) first"""
+        query = _fts_query(skill)
+        if not query:
+            return []
+        since = time.time() - self.fresh_seconds if fresh_only else 0
+        with self._lock:
+            rows = self._connection().execute("""
+                SELECT c.data FROM skill_courses s
+                JOIN courses c ON c.id = s.course_id
+                LEFT JOIN (
+                    SELECT rowid, bm25(courses_fts, 2.0, 1.0) AS score FROM courses_fts WHERE courses_fts MATCH ?
+                ) f ON f.rowid = c.id
+                WHERE s.skill_key = ? AND c.last_seen >= ?
+                ORDER BY f.score IS NULL, f.score, c.rating DESC
+                LIMIT ?
+            """, (query, get_skill_ontology().skill_key(skill), since, limit or self.limit)).fetchall()
+        return [json.loads(data) for (data,) in rows]
+
+    def _recently_crawled(self, skill: str) -> bool:
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT crawled_at FROM skill_crawls WHERE skill_key = ?",
+                (get_skill_ontology().skill_key(skill),)
+            ).fetchone()
+        return bool(row) and time.time() - row[0] < self.fresh_seconds
+
+    def lookup(self, skill: str) -> Optional[List[Dict[str, Any]]]:
+        """Catalog courses for a skill, or None when coverage is too thin or stale and it should be crawled"""
+        try:
+            courses = self.search(skill)
+            if len(courses) >= self.min_courses or (courses and self._recently_crawled(skill)):
+                self.hits += 1
+                return courses
+        except sqlite3.Error as e:
+            print(f"Course catalog lookup failed for {skill}: {e}")
+        self.misses += 1
+        return None
+
+    def lookup_many(self, skills: List[str]) -> Dict[str, Optional[List[Dict[str, Any]]]]:
+        return {skill: self.lookup(skill) for skill in skills}
+
+    def invalidate(self, skill: str = None) -> int:
+        """
+        Forget what was crawled for a skill, or empty the whole catalog, so those
+        skills are crawled again; returns the number of rows removed.
+        """
+        try:
+            with self._lock:
+                conn = self._connection()
+                with conn:
+                    if skill is None:
+                        removed = sum(conn.execute(f"DELETE FROM {table}").rowcount
+                                      for table in ("skill_courses", "skill_crawls", "courses"))
+                    else:
+                        skill_key = get_skill_ontology().skill_key(skill)
+                        removed = sum(conn.execute(f"DELETE FROM {table} WHERE skill_key = ?", (skill_key,)).rowcount
+                                      for table in ("skill_courses", "skill_crawls"))
+        except sqlite3.Error as e:
+            print(f"Course catalog invalidation failed: {e}")
+            return 0
+        return removed
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def stats(self) -> Dict[str, Any]:
+        stats = {"path": self.path, "hits": self.hits, "misses": self.misses, "ingested": self.ingested}
+        try:
+            with self._lock:
+                conn = self._connection()
+                stats["courses"] = conn.execute("SELECT COUNT(*) FROM courses").fetchone()[0]
+                stats["fresh_courses"] = conn.execute(
+                    "SELECT COUNT(*) FROM courses WHERE last_seen >= ?", (time.time() - self.fresh_seconds,)
+                ).fetchone()[0]
+                stats["skills_crawled"] = conn.execute("SELECT COUNT(*) FROM skill_crawls").fetchone()[0]
+        except sqlite3.Error as e:
+            stats["error"] = str(e)
+        return stats
+
+
+_course_catalog: Optional[CourseCatalog] = None
+
+
+def get_course_catalog() -> CourseCatalog:
+    """Return the process-wide course catalog, opening the database on first use"""
+    global _course_catalog
+    if _course_catalog is None:
+        _course_catalog = CourseCatalog()
+    return _course_catalog
+
+
+def close_course_catalog():
+    global _course_catalog
+    if _course_catalog is not None:
+        _course_catalog.close()
+        _course_catalog = None
@@ -0,0 +1,157 @@
+import math
+import os
+import re
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from utils.skill_ontology import fold, get_skill_ontology
+
+# Weights of the three signals in a course's score (relevance, rating and price are each in [0, 1])
+RANK_RELEVANCE_WEIGHT = float(os.getenv('RANK_RELEVANCE_WEIGHT', 0.7))
+RANK_RATING_WEIGHT = float(os.getenv('RANK_RATING_WEIGHT', 0.2))
+RANK_PRICE_WEIGHT = float(os.getenv('RANK_PRICE_WEIGHT', 0.1))
+# Send the top-k locally ranked courses to EvaluatorAgent for a final rerank; off by default
+COURSE_LLM_RERANK = os.getenv('COURSE_LLM_RERANK', 'false').lower() in ('1', 'true', 'yes')
+COURSE_RERANK_TOP_K = int(os.getenv('COURSE_RERANK_TOP_K', 10))
+
+# BM25 parameters; title terms count TITLE_WEIGHT times
+BM25_K1 = 1.2
+BM25_B = 0.75
+TITLE_WEIGHT = 2
+
+_NUMBER_RE = re.compile(r"\d+(?:[.,]\d+)*")
+
+
+def _tokens(text: Any) -> List[str]:
+    return fold(text).split()
+
+
+# Separates title copies and description so phrases never match across them
+_BOUNDARY = "\x00"
+
+
+def _course_text(course: Dict[str, Any]) -> List[str]:
+    title = course.get('course_title') or course.get('title') or ''
+    description = course.get('course_description') or course.get('description') or ''
+    return ([*_tokens(title), _BOUNDARY] * TITLE_WEIGHT) + _tokens(description)
+
+
+def parse_number(value: Any) -> Optional[float]:
+    """First number in a value like "4.7 (12,345 ratings)" or "$49.99", None if there is none"""
+    if isinstance(value, (int, float)):
+        return float(value)
+    match = _NUMBER_RE.search(str(value or ''))
+    return float(match.group().replace(',', '')) if match else None
+
+
+def _rating_scores(courses: List[Dict[str, Any]]) -> np.ndarray:
+    """Ratings on a 0-5 scale mapped to [0, 1]; unrated courses get the median of the rated ones"""
+    ratings = np.array([
+        r if r is not None and 0 < r <= 5 else np.nan
+        for r in (parse_number(c.get('rating')) for c in courses)
+    ], dtype=float)
+    known = ratings[~np.isnan(ratings)]
+    fill = float(np.median(known)) if known.size else 2.5
+    return np.nan_to_num(ratings, nan=fill) / 5.0
+
+
+def _price_scores(courses: List[Dict[str, Any]]) -> np.ndarray:
+    """Free courses score 1, the most expensive 0 (log scale); unknown prices score 0.5"""
+    prices = []
+    for course in courses:
+        price = str(course.get('price') or '').strip().lower()
+        if not price:
+            prices.append(np.nan)
+        elif 'free' in price:
+            prices.append(0.0)
+        else:
+            number = parse_number(price)
+            prices.append(number if number is not None else np.nan)
+    prices = np.array(prices, dtype=float)
+    known = prices[~np.isnan(prices)]
+    top = float(known.max()) if known.size else 0.0
+    if top <= 0:
+        return np.where(np.isnan(prices), 0.5, 1.0)
+    return np.where(np.isnan(prices), 0.5, 1.0 - np.log1p(prices) / math.log1p(top))
+
+
+def skill_relevance(skills: List[str], courses: List[Dict[str, Any]]) -> np.ndarray:
+    """
+    BM25 score of every course against every skill, as a (courses x skills)
+    matrix. Each ontology alias is matched as a whole phrase and a skill scores
+    its best-matching alias, so generic words in a multi-word alias ("web",
+    "control") can't stand in for the skill. Only the aliases are indexed: the
+    phrase counts form a sparse COO matrix combined with the skill/alias map in one pass.
+    """
+    ontology = get_skill_ontology()
+    vocabulary: Dict[tuple, int] = {}
+    query_rows, query_cols = [], []
+    for column, skill in enumerate(skills):
+        phrases = {tuple(_tokens(alias)) for alias in ontology.aliases(skill)}
+        for phrase in phrases - {()}:
+            query_rows.append(vocabulary.setdefault(phrase, len(vocabulary)))
+            query_cols.append(column)
+    scores = np.zeros((len(courses), len(skills)))
+    if not vocabulary or not courses:
+        return scores
+
+    by_first: Dict[str, List[tuple]] = {}
+    for phrase, phrase_id in vocabulary.items():
+        by_first.setdefault(phrase[0], []).append((phrase, phrase_id))
+    documents = [_course_text(c) for c in courses]
+    lengths = np.array([len(d) - TITLE_WEIGHT for d in documents], dtype=float)
+    doc_ids, phrase_ids = [], []
+    for doc_id, document in enumerate(documents):
+        for start, token in enumerate(document):
+            for phrase, phrase_id in by_first.get(token, ()):
+                if tuple(document[start:start + len(phrase)]) == phrase:
+                    doc_ids.append(doc_id)
+                    phrase_ids.append(phrase_id)
+    if not doc_ids:
+        return scores
+
+    # Collapse (doc, phrase) occurrences into phrase frequencies
+    pairs, tf = np.unique(np.array(doc_ids) * len(vocabulary) + np.array(phrase_ids), return_counts=True)
+    rows, cols = pairs // len(vocabulary), pairs % len(vocabulary)
+    df = np.bincount(cols, minlength=len(vocabulary))
+    n = len(courses)
+    idf = np.log1p((n - df + 0.5) / (df + 0.5))
+    norm = BM25_K1 * (1 - BM25_B + BM25_B * lengths[rows] / max(lengths.mean(), 1.0))
+    weights = idf[cols] * tf * (BM25_K1 + 1) / (tf + norm)
+
+    query = np.zeros((len(vocabulary), len(skills)))
+    query[query_rows, query_cols] = 1.0
+    np.maximum.at(scores, rows, weights[:, None] * query[cols])
+    return scores
+
+
+def rank_courses(skills: List[str], courses: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    All courses, best first, each copied with 'rank_score', 'relevance' and
+    'matched_skills'. Relevance favours the best match for any one skill and
+    then coverage of the rest; rating and price break ties between similar courses.
+    """
+    courses = [c for c in courses or [] if isinstance(c, dict)]
+    if not courses:
+        return []
+    skills = list(skills or [])
+    scores = skill_relevance(skills, courses)
+    if skills:
+        normalized = scores / np.maximum(scores.max(axis=0), 1e-9)
+        relevance = 0.7 * normalized.max(axis=1) + 0.3 * normalized.mean(axis=1)
+    else:
+        relevance = np.zeros(len(courses))
+    total = (RANK_RELEVANCE_WEIGHT * relevance
+             + RANK_RATING_WEIGHT * _rating_scores(courses)
+             + RANK_PRICE_WEIGHT * _price_scores(courses))
+
+    ranked = []
+    for i in np.argsort(-total, kind='stable'):
+        ranked.append({
+            **courses[i],
+            'rank_score': round(float(total[i]), 4),
+            'relevance': round(float(relevance[i]), 4),
+            'matched_skills': [skill for skill, score in zip(skills, scores[i]) if score > 0],
+        })
+    return ranked
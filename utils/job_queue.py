@@ -0,0 +1,215 @@
+import asyncio
+import json
+import os
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import redis.asyncio as aioredis
+
+# Stages reported on GET /jobs/{id}, in pipeline order
+PIPELINE_STAGES = ["resume_skills", "career_goal", "courses"]
+
+JOB_WORKERS = int(os.getenv('JOB_WORKERS', 2))
+JOB_RESULT_TTL = int(os.getenv('JOB_RESULT_TTL_SECONDS', 3600))
+# Queued/running jobs are kept at most this long in case a worker dies mid-job
+JOB_PENDING_TTL = int(os.getenv('JOB_PENDING_TTL_SECONDS', 24 * 3600))
+
+
+def _new_job(career_goal: str) -> Dict[str, Any]:
+    now = time.time()
+    return {
+        'job_id': uuid.uuid4().hex,
+        'status': 'queued',
+        'career_goal': career_goal,
+        'stages': {stage: 'pending' for stage in PIPELINE_STAGES},
+        'result': None,
+        'error': None,
+        'created_at': now,
+        'updated_at': now,
+    }
+
+
+class InProcessJobBackend:
+    """Job records and queue held in this process (used when Redis is unavailable)"""
+
+    name = "in-process"
+
+    def __init__(self):
+        self.jobs: Dict[str, Dict[str, Any]] = {}
+        self.payloads: Dict[str, bytes] = {}
+        self.queue: asyncio.Queue = asyncio.Queue()
+
+    def _purge_expired(self):
+        now = time.time()
+        for job_id in [job_id for job_id, job in self.jobs.items() if job['expires_at'] < now]:
+            del self.jobs[job_id]
+            self.payloads.pop(job_id, None)
+
+    async def enqueue(self, job: Dict[str, Any], payload: bytes):
+        await self.save(job, JOB_PENDING_TTL)
+        self.payloads[job['job_id']] = payload
+        await self.queue.put(job['job_id'])
+
+    async def dequeue(self, timeout: float) -> Optional[str]:
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    async def pop_payload(self, job_id: str) -> Optional[bytes]:
+        return self.payloads.pop(job_id, None)
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        self._purge_expired()
+        job = self.jobs.get(job_id)
+        return {k: v for k, v in job.items() if k != 'expires_at'} if job else None
+
+    async def save(self, job: Dict[str, Any], ttl: int):
+        self._purge_expired()
+        self.jobs[job['job_id']] = {**job, 'expires_at': time.time() + ttl}
+
+    async def close(self):
+        pass
+
+
+class RedisJobBackend:
+    """Job records and queue in Redis, shared by every API worker"""
+
+    name = "redis"
+    queue_key = "careerpath:jobs:queue"
+
+    def __init__(self, client: aioredis.Redis):
+        self.client = client
+
+    @staticmethod
+    def _job_key(job_id: str) -> str:
+        return f"careerpath:job:{job_id}"
+
+    @staticmethod
+    def _payload_key(job_id: str) -> str:
+        return f"careerpath:job:{job_id}:resume"
+
+    async def enqueue(self, job: Dict[str, Any], payload: bytes):
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.setex(self._job_key(job['job_id']), JOB_PENDING_TTL, json.dumps(job))
+            pipe.setex(self._payload_key(job['job_id']), JOB_PENDING_TTL, payload)
+            pipe.lpush(self.queue_key, job['job_id'])
+            await pipe.execute()
+
+    async def dequeue(self, timeout: float) -> Optional[str]:
+        item = await self.client.brpop(self.queue_key, timeout=max(1, int(timeout)))
+        return item[1].decode() if item else None
+
+    async def pop_payload(self, job_id: str) -> Optional[bytes]:
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.get(self._payload_key(job_id))
+            pipe.delete(self._payload_key(job_id))
+            payload, _ = await pipe.execute()
+        return payload
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        data = await self.client.get(self._job_key(job_id))
+        return json.loads(data) if data else None
+
+    async def save(self, job: Dict[str, Any], ttl: int):
+        await self.client.setex(self._job_key(job['job_id']), ttl, json.dumps(job))
+
+    async def close(self):
+        await self.client.aclose()
+
+
+# handler(job, resume_bytes, on_event) -> result dict stored on the job
+JobHandler = Callable[[Dict[str, Any], bytes, Callable[[str, Dict[str, Any]], Awaitable[None]]], Awaitable[Dict[str, Any]]]
+
+
+class JobQueue:
+    """
+    Background analysis jobs: POST /jobs enqueues, a bounded pool of worker
+    tasks runs the pipeline, and GET /jobs/{id} polls the stored record.
+    """
+
+    def __init__(self):
+        self.backend = None
+        self._workers: List[asyncio.Task] = []
+        self._handler: Optional[JobHandler] = None
+
+    async def _connect(self):
+        client = aioredis.Redis(
+            host=os.getenv('REDIS_HOST', 'localhost'),
+            port=int(os.getenv('REDIS_PORT', 6379)),
+            db=0,
+            socket_connect_timeout=2
+        )
+        try:
+            await client.ping()
+            return RedisJobBackend(client)
+        except Exception as e:
+            print(f"Redis unavailable for job queue ({e}), using in-process queue")
+            await client.aclose()
+            return InProcessJobBackend()
+
+    async def start(self, handler: JobHandler, workers: int = JOB_WORKERS):
+        self._handler = handler
+        self.backend = await self._connect()
+        self._workers = [asyncio.create_task(self._worker(i)) for i in range(workers)]
+        print(f"Started {workers} job workers ({self.backend.name} queue)")
+
+    async def stop(self):
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        if self.backend is not None:
+            await self.backend.close()
+
+    async def submit(self, career_goal: str, resume_bytes: bytes) -> Dict[str, Any]:
+        job = _new_job(career_goal)
+        await self.backend.enqueue(job, resume_bytes)
+        return job
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return await self.backend.get(job_id)
+
+    async def _update(self, job: Dict[str, Any], ttl: int = JOB_PENDING_TTL, **changes):
+        job.update(changes, updated_at=time.time())
+        await self.backend.save(job, ttl)
+
+    async def _run_job(self, job_id: str):
+        job = await self.backend.get(job_id)
+        resume_bytes = await self.backend.pop_payload(job_id)
+        if job is None or resume_bytes is None:
+            print(f"Job {job_id} expired before it could run")
+            return
+
+        async def on_event(event: str, data: Dict[str, Any]):
+            if event == 'stage_started' and data.get('stage') in job['stages']:
+                job['stages'][data['stage']] = 'running'
+            elif event in ('stage_completed', 'stage_failed') and data.get('stage') in job['stages']:
+                job['stages'][data['stage']] = event[len('stage_'):]
+            else:
+                return
+            await self._update(job)
+
+        await self._update(job, status='running')
+        try:
+            result = await self._handler(job, resume_bytes, on_event)
+            await self._update(job, JOB_RESULT_TTL, status='completed', result=result)
+        except Exception as e:
+            print(f"Job {job_id} failed: {e}")
+            await self._update(job, JOB_RESULT_TTL, status='failed', error=str(e))
+
+    async def _worker(self, index: int):
+        while True:
+            try:
+                job_id = await self.backend.dequeue(timeout=5)
+                if job_id:
+                    await self._run_job(job_id)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Job worker {index} error: {e}")
+                await asyncio.sleep(1)
+
+
+job_queue = JobQueue()
@@ -1,8 +1,196 @@
+import hashlib
+import io
+import os
+import tempfile
+import time
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
 from PyPDF2 import PdfReader
 
-def extract_text_from_pdf(uploaded_file):
-    reader = PdfReader(uploaded_file)
-    text = ""
-    for page in reader.pages:
-        text += page.extract_text()
-    return text
\ No newline at end of file
+try:
+    import pymupdf
+except ImportError:  # Optional faster backend (PDF_PARSER_BACKEND=pymupdf)
+    try:
+        import fitz as pymupdf
+    except ImportError:
+        pymupdf = None
+
+# Budgets for one resume; parsing stops as soon as the page or character budget is met
+PDF_MAX_BYTES = int(float(os.getenv('PDF_MAX_MB', 10)) * 1024 * 1024)
+PDF_MAX_PAGES = int(os.getenv('PDF_MAX_PAGES', 20))
+PDF_MAX_CHARS = int(os.getenv('PDF_MAX_CHARS', 50000))
+# Uploads larger than this are spooled to a temp file instead of memory
+PDF_SPOOL_THRESHOLD = int(float(os.getenv('PDF_SPOOL_THRESHOLD_MB', 1)) * 1024 * 1024)
+# "pypdf2" (pure Python) or "pymupdf" (MuPDF, much faster; optional dependency)
+PDF_PARSER_BACKEND = os.getenv('PDF_PARSER_BACKEND', 'pypdf2')
+
+_CHUNK_SIZE = 64 * 1024
+
+
+class PDFTooLargeError(ValueError):
+    """The upload exceeds PDF_MAX_MB"""
+
+
+class SpooledPDF:
+    """
+    A PDF upload held in memory or, above the spool threshold, in a named temp
+    file (`path`), with its size and SHA-256 computed while it was read.
+    """
+
+    def __init__(self, file, size: int, sha256: str, path: Optional[str] = None):
+        self.file = file
+        self.size = size
+        self.sha256 = sha256
+        self.path = path
+
+    @classmethod
+    def from_bytes(cls, data: bytes, max_bytes: int = PDF_MAX_BYTES) -> "SpooledPDF":
+        if len(data) > max_bytes:
+            raise PDFTooLargeError(f"PDF is {len(data)} bytes, limit is {max_bytes}")
+        return cls(io.BytesIO(data), len(data), hashlib.sha256(data).hexdigest())
+
+    def open(self):
+        """The underlying file, rewound"""
+        self.file.seek(0)
+        return self.file
+
+    def read_bytes(self) -> bytes:
+        return self.open().read()
+
+    def close(self):
+        self.file.close()
+        if self.path:
+            try:
+                os.unlink(self.path)
+            except OSError:
+                pass
+
+
+async def spool_upload(upload, max_bytes: int = PDF_MAX_BYTES,
+                       spool_threshold: int = PDF_SPOOL_THRESHOLD) -> SpooledPDF:
+    """
+    Read an UploadFile in chunks into memory, moving to a named temp file once it
+    passes spool_threshold (so parser processes can open it by path), hashing as it goes.
+    Raises PDFTooLargeError as soon as the upload passes max_bytes, without reading the rest.
+    """
+    spooled, path = io.BytesIO(), None
+    digest, size = hashlib.sha256(), 0
+    try:
+        while True:
+            chunk = await upload.read(_CHUNK_SIZE)
+            if not chunk:
+                break
+            size += len(chunk)
+            if size > max_bytes:
+                raise PDFTooLargeError(f"PDF is larger than the {max_bytes} byte limit")
+            digest.update(chunk)
+            if path is None and size > spool_threshold:
+                # Not deleted on close, so other processes can open it on every platform; close() unlinks it
+                on_disk = tempfile.NamedTemporaryFile(prefix="resume-", suffix=".pdf", delete=False)
+                path = on_disk.name
+                on_disk.write(spooled.getvalue())
+                spooled = on_disk
+            spooled.write(chunk)
+        spooled.flush()
+    except BaseException:
+        spooled.close()
+        if path:
+            os.unlink(path)
+        raise
+    spooled.seek(0)
+    return SpooledPDF(spooled, size, digest.hexdigest(), path)
+
+
+# A backend returns (page count, lazy per-page text extractors, close); close() releases the
+# document, which matters in long-lived parser workers
+_Pages = Tuple[int, Iterator[Callable[[], str]], Callable[[], None]]
+
+
+def _pypdf2_pages(pdf_file) -> _Pages:
+    # PdfReader reads a path into memory and leaves a passed-in file to its owner
+    reader = pdf_file if isinstance(pdf_file, PdfReader) else PdfReader(pdf_file)
+    return len(reader.pages), (page.extract_text for page in reader.pages), lambda: None
+
+
+def _pymupdf_pages(pdf_file) -> _Pages:
+    if isinstance(pdf_file, (str, os.PathLike)):
+        document = pymupdf.open(pdf_file)
+    else:
+        document = pymupdf.open(stream=pdf_file.read(), filetype="pdf")
+    return (document.page_count, (document.load_page(i).get_text for i in range(document.page_count)),
+            document.close)
+
+
+PDF_BACKENDS = {"pypdf2": _pypdf2_pages, "pymupdf": _pymupdf_pages}
+
+
+def _open_pages(pdf_file, backend: str = None) -> _Pages:
+    """Page count, a lazy iterator of per-page text extractors and a close() for the chosen backend"""
+    if isinstance(pdf_file, SpooledPDF):
+        pdf_file = pdf_file.open()
+    backend = (backend or PDF_PARSER_BACKEND).lower()
+    if backend == "pymupdf" and pymupdf is None:
+        print("PyMuPDF is not installed, parsing with PyPDF2")
+        backend = "pypdf2"
+    if backend not in PDF_BACKENDS:
+        raise ValueError(f"Unknown PDF parser backend: {backend}")
+    return PDF_BACKENDS[backend](pdf_file)
+
+
+def _iter_pages(extractors: Iterator[Callable[[], str]], max_pages: int) -> Iterator[Tuple[int, str, float]]:
+    for number, extract in enumerate(extractors, start=1):
+        if number > max_pages:
+            return
+        start = time.perf_counter()
+        try:
+            # Scanned/image-only pages return None or raise
+            text = extract() or ""
+        except Exception as e:
+            print(f"Could not extract text from page {number}: {e}")
+            text = ""
+        yield number, text, time.perf_counter() - start
+
+
+def iter_pdf_pages(pdf_file, max_pages: int = PDF_MAX_PAGES, backend: str = None) -> Iterator[Tuple[int, str, float]]:
+    """Lazily yield (page_number, text, seconds) for up to max_pages pages"""
+    _, extractors, close = _open_pages(pdf_file, backend)
+    try:
+        yield from _iter_pages(extractors, max_pages)
+    finally:
+        close()
+
+
+def extract_pdf_text(pdf_file, max_pages: int = PDF_MAX_PAGES, max_chars: int = PDF_MAX_CHARS,
+                     backend: str = None) -> Dict[str, Any]:
+    """
+    Extract text from a PDF (path, file-like object or SpooledPDF) within the page and character budgets.
+    Returns {"text", "pages": [{"page", "chars", "seconds"}], "page_count", "truncated", "seconds"}.
+    """
+    start = time.perf_counter()
+    page_count, extractors, close = _open_pages(pdf_file, backend)
+    parts, pages, chars = [], [], 0
+    truncated = page_count > max_pages
+    try:
+        for number, text, seconds in _iter_pages(extractors, max_pages):
+            if len(text) > max_chars - chars:
+                text, truncated = text[:max_chars - chars], True
+            parts.append(text)
+            chars += len(text)
+            pages.append({"page": number, "chars": len(text), "seconds": round(seconds, 4)})
+            if chars >= max_chars:
+                truncated = truncated or number < page_count
+                break
+    finally:
+        close()
+    return {
+        "text": "\n".join(parts),
+        "pages": pages,
+        "page_count": page_count,
+        "truncated": truncated,
+        "seconds": round(time.perf_counter() - start, 4),
+    }
+
+
+def extract_text_from_pdf(uploaded_file, max_pages: Optional[int] = None, max_chars: Optional[int] = None) -> str:
+    """Text of a PDF (path, file-like object or SpooledPDF), within the configured budgets"""
+    return extract_pdf_text(uploaded_file, max_pages or PDF_MAX_PAGES, max_chars or PDF_MAX_CHARS)["text"]
@@ -0,0 +1,162 @@
+import asyncio
+import io
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, Optional, Union
+
+from utils.pdf_parser import PDF_MAX_CHARS, PDF_MAX_PAGES, PDF_PARSER_BACKEND, SpooledPDF, extract_pdf_text
+
+try:
+    import resource
+except ImportError:  # Not available on Windows; the memory cap is skipped there
+    resource = None
+
+# Worker processes for PDF parsing; 0 parses in a thread of the API process instead
+PDF_PARSER_WORKERS = int(os.getenv('PDF_PARSER_WORKERS', 2))
+PDF_PARSE_TIMEOUT = float(os.getenv('PDF_PARSE_TIMEOUT_SECONDS', 30))
+# Address-space cap per worker, so a hostile PDF fails with MemoryError instead of exhausting the host
+PDF_PARSER_MEMORY_MB = int(os.getenv('PDF_PARSER_MEMORY_MB', 1024))
+# Workers are replaced after this many PDFs to bound fragmentation/leaks
+PDF_PARSER_MAX_TASKS_PER_CHILD = int(os.getenv('PDF_PARSER_MAX_TASKS_PER_CHILD', 200))
+
+
+class PDFParseTimeout(TimeoutError):
+    """Parsing one PDF took longer than PDF_PARSE_TIMEOUT_SECONDS"""
+
+
+def _init_worker(memory_mb: int):
+    if resource is not None and memory_mb > 0:
+        limit = memory_mb * 1024 * 1024
+        try:
+            resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+        except (ValueError, OSError) as e:
+            print(f"Could not cap PDF worker memory: {e}")
+
+
+def _ready() -> bool:
+    return True
+
+
+def _parse_in_worker(source: Union[str, bytes], max_pages: int, max_chars: int, backend: str) -> Dict[str, Any]:
+    # A path to a spooled upload, or the bytes of a small in-memory one
+    return extract_pdf_text(source if isinstance(source, str) else io.BytesIO(source), max_pages, max_chars, backend)
+
+
+class PDFParserPool:
+    """
+    Process pool for CPU-bound PDF parsing, so PyPDF2 doesn't hold the API
+    worker's GIL. Each parse has a timeout; a timed-out or crashed pool is
+    torn down and replaced, since a running task can't be cancelled.
+    """
+
+    def __init__(self, workers: int = PDF_PARSER_WORKERS, timeout: float = PDF_PARSE_TIMEOUT,
+                 memory_mb: int = PDF_PARSER_MEMORY_MB, backend: str = PDF_PARSER_BACKEND):
+        self.workers = workers
+        self.timeout = timeout
+        self.memory_mb = memory_mb
+        self.backend = backend
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self.parsed = 0
+        self.timeouts = 0
+        self.failures = 0
+        self.restarts = 0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # spawn: forking a process that runs threads and event loops isn't safe
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_worker,
+                initargs=(self.memory_mb,),
+                max_tasks_per_child=PDF_PARSER_MAX_TASKS_PER_CHILD or None
+            )
+        return self._executor
+
+    def _restart(self):
+        executor, self._executor = self._executor, None
+        if executor is None:
+            return
+        self.restarts += 1
+        # Stuck workers would otherwise keep running after shutdown
+        for process in list((getattr(executor, '_processes', None) or {}).values()):
+            process.terminate()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    async def start(self):
+        """Spawn the workers up front so the first parses don't pay process start-up"""
+        if self.workers > 0:
+            executor = self._get_executor()
+            await asyncio.gather(*[asyncio.wrap_future(executor.submit(_ready)) for _ in range(self.workers)])
+
+    async def extract(self, pdf: Union[bytes, SpooledPDF], max_pages: int = PDF_MAX_PAGES,
+                      max_chars: int = PDF_MAX_CHARS) -> Dict[str, Any]:
+        """
+        extract_pdf_text in a worker process, bounded by the pool's timeout.
+        Uploads spooled to disk are passed to the worker by path rather than copied through a pipe.
+        """
+        if self.workers <= 0:
+            source = pdf if isinstance(pdf, SpooledPDF) else io.BytesIO(pdf)
+            return await asyncio.to_thread(extract_pdf_text, source, max_pages, max_chars, self.backend)
+        if isinstance(pdf, SpooledPDF):
+            source = pdf.path or pdf.read_bytes()
+        else:
+            source = pdf
+
+        for attempt in range(2):
+            executor = self._get_executor()
+            future = executor.submit(_parse_in_worker, source, max_pages, max_chars, self.backend)
+            try:
+                result = await asyncio.wait_for(asyncio.wrap_future(future), self.timeout)
+                self.parsed += 1
+                return result
+            except asyncio.TimeoutError:
+                self.timeouts += 1
+                if self._executor is executor:
+                    self._restart()
+                raise PDFParseTimeout(f"PDF parsing took longer than {self.timeout:g}s")
+            except BrokenProcessPool:
+                # Another task's timeout or a worker crash took the pool down; retry once on a fresh one
+                if self._executor is executor:
+                    self._restart()
+                if attempt:
+                    self.failures += 1
+                    raise
+            except MemoryError:
+                self.failures += 1
+                raise
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "backend": self.backend,
+            "parsed": self.parsed,
+            "timeouts": self.timeouts,
+            "failures": self.failures,
+            "restarts": self.restarts,
+        }
+
+
+_pdf_pool: Optional[PDFParserPool] = None
+
+
+def get_pdf_pool() -> PDFParserPool:
+    """Return the shared PDF parser pool, creating it on first use"""
+    global _pdf_pool
+    if _pdf_pool is None:
+        _pdf_pool = PDFParserPool()
+    return _pdf_pool
+
+
+def shutdown_pdf_pool():
+    global _pdf_pool
+    if _pdf_pool is not None:
+        _pdf_pool.shutdown()
+        _pdf_pool = None
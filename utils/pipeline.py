@@ -0,0 +1,499 @@
+import asyncio
+import functools
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple, Union
+
+from utils.cache_manager import cache_manager, normalize_career_goal
+from utils.course_catalog import COURSE_CATALOG_ENABLED, get_course_catalog
+from utils.course_ranker import COURSE_LLM_RERANK, COURSE_RERANK_TOP_K, rank_courses
+from utils.pdf_parser import SpooledPDF
+from utils.pdf_pool import get_pdf_pool
+from utils.resume_preprocessor import preprocess_resume
+from utils.single_flight import SingleFlight
+from utils.skill_ontology import get_skill_ontology
+from agents.ResumeSkillExtractorAgent import ResumeSkillExtractorAgent
+from agents.CareerGoalAnalyzerAgent import CareerGoalAnalyzerAgent
+from agents.CourseFinderAgent import CourseFinderAgent
+from agents.EvaluatorAgent import EvaluatorAgent
+
+# Bounded pool for the blocking agent stages (crew.kickoff); PDFs are parsed in utils.pdf_pool.
+# Sized so a single uvicorn worker can serve several requests in parallel.
+PIPELINE_MAX_WORKERS = int(os.getenv('PIPELINE_MAX_WORKERS', 8))
+
+# Uncached skills crawled per request. The rest get no courses in this result, and since the
+# result is cached under the (goal, gap) key, later requests for the same gap don't crawl them either
+# until that entry expires or is cleared; other gaps containing those skills do crawl them.
+MAX_SKILLS_TO_CRAWL = int(os.getenv('MAX_SKILLS_TO_CRAWL', 2))
+
+# Resumes extracted in parallel by one batch analysis
+BATCH_RESUME_CONCURRENCY = int(os.getenv('BATCH_RESUME_CONCURRENCY', 4))
+
+_executor: Optional[ThreadPoolExecutor] = None
+
+# Concurrent misses for the same goal profile, skill or skill gap share one crew run
+single_flight = SingleFlight(cache_manager)
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """Return the shared pipeline executor, creating it on first use"""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=PIPELINE_MAX_WORKERS,
+            thread_name_prefix="pipeline"
+        )
+    return _executor
+
+
+def shutdown_executor():
+    """Stop the pipeline executor (called on application shutdown)"""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+async def run_blocking(func: Callable, *args, **kwargs) -> Any:
+    """Run a blocking call on the pipeline executor without blocking the event loop"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_executor(), functools.partial(func, *args, **kwargs))
+
+
+# on_event(event, data) receives pipeline progress, e.g. ("stage_completed", {"stage": "courses", ...})
+EventCallback = Callable[[str, Dict[str, Any]], Awaitable[None]]
+
+
+async def _emit(on_event: Optional[EventCallback], event: str, data: Dict[str, Any]):
+    if on_event is None:
+        return
+    try:
+        await on_event(event, data)
+    except Exception as e:
+        # Progress reporting must never fail the analysis itself
+        print(f"Error reporting {event}: {e}")
+
+
+async def _timed_stage(name: str, timings: Dict[str, float], stage, on_event: Optional[EventCallback] = None,
+                       result_event: Optional[str] = None) -> Any:
+    """Await one pipeline stage, recording its duration and reporting it (and its result) via on_event"""
+    start_time = time.time()
+    await _emit(on_event, "stage_started", {"stage": name})
+    event = "stage_failed"
+    try:
+        result = await stage
+        event = "stage_completed"
+        if result_event:
+            await _emit(on_event, result_event, {"skills": result})
+        return result
+    finally:
+        timings[name] = round(time.time() - start_time, 2)
+        print(f"Stage {name} took {timings[name]:.2f} seconds")
+        await _emit(on_event, event, {"stage": name, "seconds": timings[name]})
+
+
+async def _extract_student_skills(resume: Union[bytes, SpooledPDF],
+                                  usage: Optional[Dict[str, Any]] = None) -> List[str]:
+    """Skills from a resume; fills `usage` with the resume's token counts before and after preprocessing"""
+    pdf = resume if isinstance(resume, SpooledPDF) else SpooledPDF.from_bytes(resume)
+
+    # Same PDF uploaded again: skip parsing and the LLM entirely
+    cached_data = await cache_manager.get_cached_resume_by_pdf(pdf)
+    if cached_data:
+        print("Resume cache hit (pdf)")
+        return cached_data['student_skills']
+
+    extraction = await get_pdf_pool().extract(pdf)
+    slowest = max(extraction['pages'], key=lambda p: p['seconds'], default=None)
+    print(f"Parsed {len(extraction['pages'])}/{extraction['page_count']} PDF pages in {extraction['seconds']:.2f}s"
+          + (f" (slowest: page {slowest['page']}, {slowest['seconds']:.2f}s)" if slowest else "")
+          + (", budget reached" if extraction['truncated'] else ""))
+    if not extraction['text'].strip():
+        print("No extractable text in resume (scanned or image-only PDF)")
+        return []
+
+    # Only the cleaned, skills-first, token-budgeted text reaches the LLM (and keys the text cache)
+    prepared = preprocess_resume(extraction['text'])
+    resume_text = prepared['text']
+    if usage is not None:
+        usage.update({k: prepared[k] for k in ('input_tokens', 'output_tokens', 'sections', 'truncated')})
+    print(f"Resume text: {prepared['input_tokens']} -> {prepared['output_tokens']} tokens "
+          f"({', '.join(prepared['sections']) or 'no sections'})" + (", budget reached" if prepared['truncated'] else ""))
+    if not resume_text:
+        return []
+
+    # Different export of the same resume text: skip the LLM
+    cached_data = await cache_manager.get_cached_resume_by_text(resume_text)
+    if cached_data:
+        print("Resume cache hit (text)")
+        await cache_manager.set_cached_resume(resume_text, cached_data['student_skills'], pdf)
+        return cached_data['student_skills']
+
+    student_skills = await run_blocking(ResumeSkillExtractorAgent().run, resume_text) or []
+    if student_skills:
+        await cache_manager.set_cached_resume(resume_text, student_skills, pdf)
+    return student_skills
+
+
+def _analyze_career_goal(career_goal: str) -> List[str]:
+    return CareerGoalAnalyzerAgent().run(career_goal) or []
+
+
+# Normalized goals with a background refresh in flight, and the tasks themselves
+# (held so they aren't garbage collected before finishing)
+_refreshing_goals = set()
+_background_tasks = set()
+
+
+async def _refresh_ideal_skills(career_goal: str) -> List[str]:
+    async def _compute():
+        ideal_skills = await run_blocking(_analyze_career_goal, career_goal)
+        # Empty results are usually crawl/LLM failures, don't overwrite a good profile with them
+        if ideal_skills:
+            await cache_manager.set_cached_ideal_skills(career_goal, ideal_skills)
+        return ideal_skills
+
+    return await single_flight.do(f"goal_profile:{normalize_career_goal(career_goal)}", _compute)
+
+
+def _schedule_refresh(career_goal: str):
+    normalized = normalize_career_goal(career_goal)
+    if normalized in _refreshing_goals:
+        return
+    _refreshing_goals.add(normalized)
+
+    async def _refresh():
+        try:
+            await _refresh_ideal_skills(career_goal)
+        except Exception as e:
+            print(f"Background refresh failed for {career_goal}: {e}")
+        finally:
+            _refreshing_goals.discard(normalized)
+
+    task = asyncio.create_task(_refresh())
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+
+async def get_ideal_skills(career_goal: str) -> List[str]:
+    """
+    Ideal skills for a career goal, with stale-while-revalidate caching.
+    Fresh entries are returned directly; stale entries are returned while a
+    background refresh runs; misses run the CareerGoalAnalyzerAgent inline.
+    """
+    entry = await cache_manager.get_cached_ideal_skills(career_goal)
+    if entry:
+        if entry['stale']:
+            print(f"Serving stale skill profile for {career_goal}, refreshing in background")
+            _schedule_refresh(career_goal)
+        else:
+            print(f"Skill profile cache hit for {career_goal}")
+        return entry['ideal_skills']
+
+    print(f"Skill profile cache miss for {career_goal}")
+    return await _refresh_ideal_skills(career_goal)
+
+
+async def _crawl_skill_courses(skill: str) -> List[Dict]:
+    course_finder = CourseFinderAgent()
+    courses = await run_blocking(course_finder.run, [skill]) or []
+    # An empty result is usually a failed crawl, so leave it uncached to retry next time
+    if courses:
+        await cache_manager.set_cached_skill_courses(skill, course_finder.group_by_platform(courses))
+        if COURSE_CATALOG_ENABLED:
+            await run_blocking(get_course_catalog().ingest, skill, courses)
+    return courses
+
+
+def compute_missing_skills(ideal_skills: List[str], student_skills: List[str]) -> List[str]:
+    """Ideal skills the student doesn't have yet (canonical names, in ideal-skill order)"""
+    return get_skill_ontology().missing_skills(ideal_skills, student_skills)
+
+
+def merge_courses(skills: List[str], courses_by_skill: Dict[str, List[Dict]]) -> List[Dict]:
+    """Merge per-skill course lists in skill order, dropping courses found for several skills"""
+    courses, seen_urls = [], set()
+    for skill in skills:
+        for course in courses_by_skill.get(skill) or []:
+            url = (course.get('course_url') or course.get('url')) if isinstance(course, dict) else None
+            if url and url in seen_urls:
+                continue
+            if url:
+                seen_urls.add(url)
+            courses.append(course)
+    return courses
+
+
+async def iter_courses_by_skill(skills: List[str], on_event: Optional[EventCallback] = None,
+                                max_crawl: int = None) -> AsyncIterator[Tuple[str, List[Dict], Optional[Exception]]]:
+    """
+    Yield (skill, courses, error) as each skill's course candidates become available:
+    skills in the local course catalog or the per-skill cache at once, then each
+    crawled skill as soon as its crawl finishes. At most `max_crawl` (default
+    MAX_SKILLS_TO_CRAWL) uncached skills are crawled, in parallel; the rest yield no
+    courses. A failed crawl is yielded with its error instead of raised. Each batch
+    of courses is also reported as a "courses" event.
+    """
+    platforms = CourseFinderAgent.searched_platforms()
+    # Skills with enough fresh courses in the catalog are served locally
+    catalogued = await run_blocking(get_course_catalog().lookup_many, skills) if COURSE_CATALOG_ENABLED else {}
+    # One batched read for every (skill, platform) entry of the rest
+    cached = await cache_manager.get_cached_skill_courses_many(
+        [skill for skill in skills if catalogued.get(skill) is None], platforms
+    )
+    courses_by_skill = {
+        skill: catalogued[skill] if catalogued.get(skill) is not None else cached.get(skill) for skill in skills
+    }
+
+    uncached_skills = [skill for skill, courses in courses_by_skill.items() if courses is None]
+    to_crawl = uncached_skills[:MAX_SKILLS_TO_CRAWL if max_crawl is None else max_crawl]
+    n_catalogued = sum(courses is not None for courses in catalogued.values())
+    print(f"Course cache: {n_catalogued} skills from the catalog, "
+          f"{len(skills) - len(uncached_skills) - n_catalogued} cached, crawling {to_crawl}")
+
+    cached_skills = [skill for skill, courses in courses_by_skill.items() if courses is not None]
+    if cached_skills:
+        await _emit(on_event, "courses", {
+            "skills": cached_skills,
+            "courses": [c for skill in cached_skills for c in courses_by_skill[skill]],
+            "cached": True
+        })
+    for skill in cached_skills:
+        yield skill, courses_by_skill[skill], None
+    for skill in uncached_skills[len(to_crawl):]:
+        yield skill, [], None
+
+    async def _crawl(skill: str):
+        key = f"skill_courses:{get_skill_ontology().skill_key(skill)}"
+        try:
+            return skill, await single_flight.do(key, lambda: _crawl_skill_courses(skill)), None
+        except Exception as e:
+            print(f"Course search failed for {skill}: {e}")
+            return skill, [], e
+
+    for next_done in asyncio.as_completed([_crawl(skill) for skill in to_crawl]):
+        skill, skill_courses, error = await next_done
+        if error is None:
+            await _emit(on_event, "courses", {"skills": [skill], "courses": skill_courses, "cached": False})
+        yield skill, skill_courses or [], error
+
+
+async def find_courses_by_skill(skills: List[str], on_event: Optional[EventCallback] = None,
+                                max_crawl: int = None) -> Dict[str, List[Dict]]:
+    """Course candidates per skill from iter_courses_by_skill; raises if a crawl failed"""
+    courses_by_skill: Dict[str, List[Dict]] = {}
+    async for skill, courses, error in iter_courses_by_skill(skills, on_event, max_crawl):
+        if error is not None:
+            raise error
+        courses_by_skill[skill] = courses
+    return {skill: courses_by_skill.get(skill, []) for skill in skills}
+
+
+async def find_courses(missing_skills: List[str], on_event: Optional[EventCallback] = None) -> List[Dict]:
+    """Assemble the course candidate set for one skill gap from per-skill results"""
+    courses_by_skill = await find_courses_by_skill(missing_skills, on_event)
+    return merge_courses(missing_skills, courses_by_skill)
+
+
+async def evaluate_courses(missing_skills: List[str], courses: List[Dict]) -> Dict[str, Any]:
+    """
+    Top courses for a skill gap from the local ranker. With COURSE_LLM_RERANK, only
+    the top COURSE_RERANK_TOP_K ranked courses are sent to EvaluatorAgent.
+    """
+    ranked = await run_blocking(rank_courses, missing_skills, courses)
+    if COURSE_LLM_RERANK and ranked:
+        return await run_blocking(EvaluatorAgent().run, missing_skills, ranked[:COURSE_RERANK_TOP_K])
+    return {"top_courses": ranked[:5], "ranked_by": "local"}
+
+
+async def find_and_evaluate_courses(career_goal: str, missing_skills: List[str],
+                                    on_event: Optional[EventCallback] = None):
+    cached_data = await cache_manager.get_cached_courses(career_goal, missing_skills)
+
+    if cached_data:
+        print(f"Cache hit for {career_goal}")
+        await _emit(on_event, "courses", {"skills": missing_skills, "courses": cached_data['courses'], "cached": True})
+        return cached_data['courses'], cached_data['recommendations']
+
+    print(f"Cache miss for {career_goal}, generating new data")
+
+    computed = False
+
+    async def _compute():
+        nonlocal computed
+        computed = True
+        courses = await find_courses(missing_skills, on_event)
+        recommendations = await evaluate_courses(missing_skills, courses)
+        await cache_manager.set_cached_courses(career_goal, missing_skills, courses, recommendations)
+        return [courses, recommendations]
+
+    # Concurrent requests for the same goal and gap wait for one crawl + evaluation
+    courses, recommendations = await single_flight.do(
+        cache_manager._generate_key(career_goal, missing_skills), _compute
+    )
+    if not computed:
+        await _emit(on_event, "courses", {"skills": missing_skills, "courses": courses, "cached": True})
+    return courses, recommendations
+
+
+async def run_analysis(career_goal: str, resume: Union[bytes, SpooledPDF],
+                       on_event: Optional[EventCallback] = None) -> Dict[str, Any]:
+    """
+    Run the full career analysis pipeline.
+
+    Resume extraction and career-goal analysis don't depend on each other, so they
+    run concurrently; course discovery and evaluation wait for the skill gap.
+    Progress is reported through the optional on_event callback: stage_started /
+    stage_completed / stage_failed, plus student_skills, ideal_skills,
+    missing_skills and per-batch courses as soon as each is known.
+    """
+    timings: Dict[str, float] = {}
+    resume_tokens: Dict[str, Any] = {}
+
+    # 1) Independent stages run side by side
+    student_skills, ideal_skills = await asyncio.gather(
+        _timed_stage("resume_skills", timings, _extract_student_skills(resume, resume_tokens),
+                     on_event, result_event="student_skills"),
+        _timed_stage("career_goal", timings, get_ideal_skills(career_goal),
+                     on_event, result_event="ideal_skills"),
+    )
+
+    # 2) Compute missing skills
+    missing_skills = compute_missing_skills(ideal_skills, student_skills)
+    await _emit(on_event, "missing_skills", {"skills": missing_skills})
+
+    # 3) Courses (cached per skill) + evaluation (cached per goal and skill gap)
+    courses, recommendations = await _timed_stage(
+        "courses", timings, find_and_evaluate_courses(career_goal, missing_skills, on_event), on_event
+    )
+
+    return {
+        'career_goal': career_goal,
+        'student_skills': student_skills,
+        'ideal_skills': ideal_skills,
+        'missing_skills': missing_skills,
+        'courses': courses,
+        'recommendations': recommendations,
+        'timings': timings,
+        'resume_tokens': resume_tokens,
+    }
+
+
+async def run_batch_analysis(career_goal: str, resumes: List[Tuple[str, bytes]],
+                             on_event: Optional[EventCallback] = None) -> Dict[str, Any]:
+    """
+    Analyze many resumes against one career goal.
+
+    The goal profile is computed once, resumes are extracted with bounded
+    parallelism, every distinct missing skill across the cohort is crawled
+    once, and evaluation runs once per distinct skill gap, as soon as that
+    gap's skills have their courses. Each student's result is reported as a
+    "resume_result" event (shaped like run_analysis output plus 'resume_name')
+    as soon as their gap is evaluated; unreadable resumes, and students whose
+    gap couldn't be evaluated, are reported as "resume_error".
+    """
+    timings: Dict[str, float] = {}
+
+    # 1) Goal profile, once for the whole cohort
+    ideal_skills = await _timed_stage("career_goal", timings, get_ideal_skills(career_goal),
+                                      on_event, result_event="ideal_skills")
+
+    # 2) Resume extraction, bounded so a large cohort doesn't starve other requests
+    semaphore = asyncio.Semaphore(BATCH_RESUME_CONCURRENCY)
+
+    async def _extract(resume_name: str, resume_bytes: bytes):
+        async with semaphore:
+            try:
+                student_skills = await _extract_student_skills(resume_bytes)
+            except Exception as e:
+                print(f"Failed to analyze {resume_name}: {e}")
+                await _emit(on_event, "resume_error", {"resume_name": resume_name, "detail": str(e)})
+                return resume_name, None
+            await _emit(on_event, "student_skills", {"resume_name": resume_name, "skills": student_skills})
+            return resume_name, student_skills
+
+    extracted = await _timed_stage(
+        "resume_skills", timings,
+        asyncio.gather(*[_extract(name, data) for name, data in resumes]), on_event
+    )
+    students = {name: skills for name, skills in extracted if skills is not None}
+    gaps = {name: compute_missing_skills(ideal_skills, skills) for name, skills in students.items()}
+
+    students_by_gap: Dict[Tuple[str, ...], List[str]] = {}
+    for name, gap in gaps.items():
+        students_by_gap.setdefault(tuple(gap), []).append(name)
+
+    # Evaluation runs once per distinct skill gap, fanned out to its students
+    courses_by_skill: Dict[str, List[Dict]] = {}
+    failed_skills: Dict[str, Exception] = {}
+
+    async def _evaluate(gap: Tuple[str, ...], names: List[str]):
+        missing_skills = list(gap)
+        try:
+            failed = [skill for skill in missing_skills if skill in failed_skills]
+            if failed:
+                raise RuntimeError(f"Course search failed for {', '.join(failed)}: {failed_skills[failed[0]]}")
+            cached_data = await cache_manager.get_cached_courses(career_goal, missing_skills)
+            if cached_data:
+                courses, recommendations = cached_data['courses'], cached_data['recommendations']
+            else:
+                async def _compute():
+                    courses = merge_courses(missing_skills, courses_by_skill)
+                    recommendations = await evaluate_courses(missing_skills, courses)
+                    await cache_manager.set_cached_courses(career_goal, missing_skills, courses, recommendations)
+                    return [courses, recommendations]
+
+                courses, recommendations = await single_flight.do(
+                    cache_manager._generate_key(career_goal, missing_skills), _compute
+                )
+        except Exception as e:
+            # Only the students with this gap are affected; the rest of the cohort carries on
+            print(f"Failed to evaluate courses for {missing_skills}: {e}")
+            for name in names:
+                await _emit(on_event, "resume_error", {"resume_name": name, "detail": str(e)})
+            return
+        for name in names:
+            await _emit(on_event, "resume_result", {
+                'resume_name': name,
+                'career_goal': career_goal,
+                'student_skills': students[name],
+                'ideal_skills': ideal_skills,
+                'missing_skills': missing_skills,
+                'courses': courses,
+                'recommendations': recommendations,
+            })
+
+    # 3) Crawl each distinct missing skill once, and 4) evaluate each gap as soon as all of its skills are in
+    all_missing = [s for s in get_skill_ontology().canonicalize(ideal_skills) if any(s in gap for gap in gaps.values())]
+    waiting = {gap: set(gap) for gap in students_by_gap}
+    evaluations = [asyncio.create_task(_evaluate(gap, students_by_gap[gap])) for gap in students_by_gap if not gap]
+
+    async def _find_courses():
+        async for skill, courses, error in iter_courses_by_skill(all_missing, on_event, max_crawl=len(all_missing)):
+            if error is not None:
+                failed_skills[skill] = error
+            courses_by_skill[skill] = courses
+            for gap, skills in waiting.items():
+                if skill in skills:
+                    skills.discard(skill)
+                    if not skills:
+                        evaluations.append(asyncio.create_task(_evaluate(gap, students_by_gap[gap])))
+
+    try:
+        await _timed_stage("courses", timings, _find_courses(), on_event)
+        # Most gaps were evaluated while the crawl went on; this times the ones still running
+        await _timed_stage("evaluation", timings, asyncio.gather(*evaluations), on_event)
+    finally:
+        for task in evaluations:
+            task.cancel()
+
+    return {
+        'career_goal': career_goal,
+        'ideal_skills': ideal_skills,
+        'resumes': len(resumes),
+        'analyzed': len(students),
+        'distinct_missing_skills': all_missing,
+        'distinct_skill_gaps': len(students_by_gap),
+        'timings': timings,
+    }
@@ -0,0 +1,194 @@
+import os
+import re
+import unicodedata
+from typing import Any, Dict, List, Tuple
+
+try:
+    import tiktoken
+except ImportError:  # Ships with langchain-openai; estimate from length without it
+    tiktoken = None
+
+# Tokens of resume text sent to the skill extractor
+RESUME_TOKEN_BUDGET = int(os.getenv('RESUME_TOKEN_BUDGET', 1500))
+_ENCODING_NAME = "o200k_base"  # gpt-4o / gpt-4o-mini
+
+# Canonical section -> heading patterns; a heading is a short line that is just the title
+SECTION_HEADINGS = {
+    "skills": r"(technical |key |core )?skills( (and|&) (tools|technologies))?|technologies|tech stack|tools|"
+              r"core competencies|competencies|programming languages|languages and tools",
+    "certifications": r"certifications?|licenses?( (and|&) certifications?)?|courses",
+    "experience": r"(work |professional |relevant )?experience|employment( history)?|work history|internships?",
+    "projects": r"(academic |personal |key )?projects",
+    "summary": r"(professional )?summary|profile|objective|about me",
+    "education": r"education|academic background|qualifications",
+    # Boilerplate: dropped entirely
+    "references": r"references",
+    "interests": r"(hobbies( (and|&) interests)?|interests|extracurricular activities)",
+    "personal": r"personal (details|information|data)|declaration",
+}
+DROPPED_SECTIONS = {"references", "interests", "personal"}
+# Order sections are kept in when trimming to the budget; skills first
+SECTION_PRIORITY = ["skills", "certifications", "experience", "projects", "summary", "header", "education", "other"]
+
+_HEADING_RE = {
+    name: re.compile(rf"^\s*(?:{pattern})\s*:?\s*$", re.IGNORECASE) for name, pattern in SECTION_HEADINGS.items()
+}
+# Lines that are nothing but boilerplate
+_BOILERPLATE_LINE_RE = re.compile(
+    r"^\s*(page \d+( of \d+)?|references available (up)?on request\.?|curriculum vitae|resume)\s*$",
+    re.IGNORECASE
+)
+# Contact details are cut out of a line; the line is only dropped if nothing else is left
+_CONTACT_RE = re.compile(
+    r"[\w.+-]+@[\w-]+\.[\w.]+"               # email
+    r"|https?://\S+|www\.\S+|linkedin\.com/\S*|github\.com/\S*",
+    re.IGNORECASE
+)
+# A phone number needs a country code, a bracketed area code or a label, so
+# year ranges like "2018 - 2022" and figures like "10M users" aren't mistaken for one
+_PHONE_RE = re.compile(
+    r"(?:\+(?=\d)|\(\d{2,3}\)|\b(?:tel|phone|mobile|cell|ph)\b\.?\s*:?\s*\+?)[\d\s().-]*\d",
+    re.IGNORECASE
+)
+_PHONE_DIGITS = (10, 15)
+# What's left of a contact line once its details are removed: labels and separators
+_CONTACT_LABEL_RE = re.compile(
+    r"\b(e-?mail|phone|tel|mobile|cell|linkedin|github|portfolio|website|web|contact|address)\b\.?\s*:?",
+    re.IGNORECASE
+)
+_SEPARATORS = " \t|,;:/•·-–—"
+_BULLET_RE = re.compile(r"^\s*[•●○◦▪■□►▸‣∙·*–-]\s*")
+
+
+def _strip_phone(match: "re.Match") -> str:
+    digits = sum(ch.isdigit() for ch in match.group())
+    return "" if _PHONE_DIGITS[0] <= digits <= _PHONE_DIGITS[1] else match.group()
+
+
+def _strip_contact_details(line: str) -> str:
+    """The line without boilerplate, emails, links or phone numbers; "" if nothing meaningful is left"""
+    if _BOILERPLATE_LINE_RE.search(line):
+        return ""
+    stripped = _PHONE_RE.sub(_strip_phone, _CONTACT_RE.sub("", line))
+    if stripped == line:
+        return line
+    if not re.search(r"\w", _CONTACT_LABEL_RE.sub("", stripped)):
+        return ""
+    return " ".join(stripped.split()).strip(_SEPARATORS)
+
+
+def count_tokens(text: str) -> int:
+    """Prompt tokens for text with the OpenAI tokenizer, or ~4 chars/token without tiktoken"""
+    if not text:
+        return 0
+    encoding = _encoding()
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    return (len(text) + 3) // 4
+
+
+_encoding_cache = []
+
+
+def _encoding():
+    if not _encoding_cache:
+        encoding = None
+        if tiktoken is not None:
+            try:
+                encoding = tiktoken.get_encoding(_ENCODING_NAME)
+            except Exception as e:  # The BPE file is downloaded on first use
+                print(f"tiktoken encoding unavailable, estimating tokens from length: {e}")
+        _encoding_cache.append(encoding)
+    return _encoding_cache[0]
+
+
+def normalize_text(text: str) -> str:
+    """Unicode, hyphenation, bullet and whitespace normalization of extracted PDF text"""
+    text = unicodedata.normalize("NFKC", text or "")
+    text = text.replace("­", "").replace("\r", "\n")
+    # Words split across lines by PDF hyphenation: "develop-\nment" -> "development"
+    text = re.sub(r"(\w)-\n\s*(\w)", r"\1\2", text)
+    lines = []
+    for line in text.split("\n"):
+        line = _BULLET_RE.sub("- ", line)
+        line = re.sub(r"[ \t\f\v]+", " ", line).strip()
+        lines.append(line)
+    return re.sub(r"\n{3,}", "\n\n", "\n".join(lines)).strip()
+
+
+def _heading(line: str) -> str:
+    if not line or len(line) > 50:
+        return ""
+    for name, pattern in _HEADING_RE.items():
+        if pattern.match(line):
+            return name
+    return ""
+
+
+def split_sections(text: str) -> List[Tuple[str, List[str]]]:
+    """(section, lines) in document order; text before the first heading is the 'header'"""
+    sections: List[Tuple[str, List[str]]] = [("header", [])]
+    for line in text.split("\n"):
+        name = _heading(line)
+        if name:
+            sections.append((name, []))
+        elif line:
+            sections[-1][1].append(line)
+    return [(name, lines) for name, lines in sections if lines]
+
+
+def _trim_lines(lines: List[str], budget: int) -> Tuple[List[str], int]:
+    kept, used = [], 0
+    for line in lines:
+        tokens = count_tokens(line) + 1  # newline
+        if used + tokens > budget:
+            break
+        kept.append(line)
+        used += tokens
+    return kept, used
+
+
+def preprocess_resume(text: str, token_budget: int = None) -> Dict[str, Any]:
+    """
+    Clean resume text for the skill extractor and fit it to a token budget.
+
+    Boilerplate (contact details, references, hobbies) is dropped, sections are
+    ordered skills-first, and lower-priority sections are cut once the budget
+    is spent. Returns {"text", "sections", "input_tokens", "output_tokens", "truncated"}.
+    """
+    token_budget = token_budget or RESUME_TOKEN_BUDGET
+    input_tokens = count_tokens(text)
+    sections = split_sections(normalize_text(text))
+
+    merged: Dict[str, List[str]] = {}
+    for name, lines in sections:
+        if name in DROPPED_SECTIONS:
+            continue
+        lines = [line for line in map(_strip_contact_details, lines) if line]
+        key = name if name in SECTION_PRIORITY else "other"
+        merged.setdefault(key, []).extend(lines)
+
+    parts, kept, used, truncated = [], [], 0, False
+    for name in SECTION_PRIORITY:
+        lines = merged.get(name)
+        if not lines:
+            continue
+        heading = "" if name == "header" else f"{name.upper()}:"
+        remaining = token_budget - used - count_tokens(heading) - 1
+        section_lines, section_tokens = _trim_lines(lines, remaining)
+        if section_lines:
+            parts.append("\n".join(([heading] if heading else []) + section_lines))
+            kept.append(name)
+            used += section_tokens + count_tokens(heading) + 1
+        if len(section_lines) < len(lines):
+            truncated = True
+            break
+
+    output = "\n\n".join(parts)
+    return {
+        "text": output,
+        "sections": kept,
+        "input_tokens": input_tokens,
+        "output_tokens": count_tokens(output),
+        "truncated": truncated,
+    }
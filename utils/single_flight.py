@@ -0,0 +1,156 @@
+import asyncio
+import os
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict
+
+# Lock held by the worker doing the work; renewed while it runs, so a crashed
+# worker only blocks the others for one TTL
+SINGLE_FLIGHT_LOCK_TTL = float(os.getenv('SINGLE_FLIGHT_LOCK_TTL_SECONDS', 30))
+# How long callers wait for someone else's result before doing the work themselves
+SINGLE_FLIGHT_WAIT = float(os.getenv('SINGLE_FLIGHT_WAIT_SECONDS', 900))
+SINGLE_FLIGHT_POLL_INTERVAL = float(os.getenv('SINGLE_FLIGHT_POLL_SECONDS', 1))
+# How long the outcome is published for callers in other workers to pick up
+SINGLE_FLIGHT_RESULT_TTL = 60
+
+
+class SingleFlightError(Exception):
+    """The coalesced computation failed in another worker"""
+
+
+class SingleFlight:
+    """
+    Request coalescing for concurrent cache misses.
+
+    The first caller for a key runs compute(); concurrent callers in the same
+    process await the same task, and callers in other workers wait on a
+    short-lived lock in the cache backend and pick up the published outcome.
+    Failures propagate to every waiter. If the leader disappears or the wait
+    times out, a waiter falls back to computing the value itself.
+    Results must be JSON-serializable.
+    """
+
+    def __init__(self, cache, lock_ttl: float = SINGLE_FLIGHT_LOCK_TTL, wait_timeout: float = SINGLE_FLIGHT_WAIT,
+                 poll_interval: float = SINGLE_FLIGHT_POLL_INTERVAL):
+        self.cache = cache
+        self.lock_ttl = lock_ttl
+        self.wait_timeout = wait_timeout
+        self.poll_interval = poll_interval
+        self._inflight: Dict[str, asyncio.Task] = {}
+        # Callers awaiting each flight; counted per flight, since a new flight for the
+        # same key can start while the previous one's callers are still returning
+        self._waiters: Dict[asyncio.Task, int] = {}
+        self.stats = {"leader": 0, "coalesced": 0, "remote_waits": 0, "fallbacks": 0}
+
+    @staticmethod
+    def _lock_key(key: str) -> str:
+        return f"careerpath:flight:lock:{key}"
+
+    @staticmethod
+    def _outcome_key(key: str) -> str:
+        return f"careerpath:flight:outcome:{key}"
+
+    async def do(self, key: str, compute: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run compute() once per key across concurrent callers and return its result.
+
+        The computation runs in its own task, so cancelling one caller (e.g. a
+        client that disconnected) doesn't cancel it for the others; it is only
+        cancelled once every caller waiting on it has gone.
+        """
+        flight = self._inflight.get(key)
+        leader = flight is None
+        if leader:
+            flight = asyncio.ensure_future(self._fly(key, compute))
+            self._inflight[key] = flight
+        else:
+            self.stats["coalesced"] += 1
+
+        self._waiters[flight] = self._waiters.get(flight, 0) + 1
+        try:
+            if leader:
+                return await asyncio.shield(flight)
+            try:
+                return await asyncio.wait_for(asyncio.shield(flight), self.wait_timeout)
+            except asyncio.TimeoutError:
+                self.stats["fallbacks"] += 1
+                return await compute()
+        except asyncio.CancelledError:
+            if self._waiters[flight] == 1 and not flight.done():
+                # Nobody else is waiting: stop the work, and make sure no new caller joins it
+                if self._inflight.get(key) is flight:
+                    del self._inflight[key]
+                flight.cancel()
+            raise
+        finally:
+            self._waiters[flight] -= 1
+            if not self._waiters[flight]:
+                del self._waiters[flight]
+
+    async def _fly(self, key: str, compute: Callable[[], Awaitable[Any]]) -> Any:
+        try:
+            return await self._do_distributed(key, compute)
+        finally:
+            if self._inflight.get(key) is asyncio.current_task():
+                del self._inflight[key]
+
+    async def _renew_lock(self, lock_key: str, token: str):
+        while True:
+            await asyncio.sleep(self.lock_ttl / 3)
+            try:
+                await self.cache.extend_lock(lock_key, token, self.lock_ttl)
+            except Exception as e:
+                print(f"Single-flight lock renewal failed for {lock_key}: {e}")
+
+    async def _lead(self, key: str, lock_key: str, token: str, compute: Callable[[], Awaitable[Any]]) -> Any:
+        self.stats["leader"] += 1
+        renewer = asyncio.create_task(self._renew_lock(lock_key, token))
+        outcome = None
+        try:
+            result = await compute()
+            outcome = {'ok': True, 'value': result, 'at': time.time()}
+            return result
+        except Exception as e:
+            outcome = {'ok': False, 'error': str(e), 'at': time.time()}
+            raise
+        finally:
+            renewer.cancel()
+            try:
+                if outcome is not None:
+                    await self.cache.publish_outcome(self._outcome_key(key), outcome, SINGLE_FLIGHT_RESULT_TTL)
+                await self.cache.release_lock(lock_key, token)
+            except Exception as e:
+                print(f"Single-flight cleanup failed for {key}: {e}")
+
+    async def _do_distributed(self, key: str, compute: Callable[[], Awaitable[Any]]) -> Any:
+        lock_key, token = self._lock_key(key), uuid.uuid4().hex
+        try:
+            acquired = await self.cache.acquire_lock(lock_key, token, self.lock_ttl)
+        except Exception as e:
+            # Lock backend unavailable: in-process coalescing still applies
+            print(f"Single-flight lock unavailable for {key}: {e}")
+            return await compute()
+        if acquired:
+            return await self._lead(key, lock_key, token, compute)
+
+        # Another worker is computing it; wait for its published outcome
+        self.stats["remote_waits"] += 1
+        waiting_since = time.time()
+        deadline = time.monotonic() + self.wait_timeout
+        while time.monotonic() < deadline:
+            await asyncio.sleep(self.poll_interval)
+            outcome = await self.cache.get_outcome(self._outcome_key(key))
+            # Outcomes published before we started waiting belong to an earlier flight
+            if outcome is not None and outcome.get('at', 0) >= waiting_since:
+                if outcome.get('ok'):
+                    return outcome.get('value')
+                raise SingleFlightError(outcome.get('error') or "Coalesced computation failed")
+            if not await self.cache.lock_exists(lock_key):
+                # Leader vanished without publishing; try to take over
+                acquired = await self.cache.acquire_lock(lock_key, token, self.lock_ttl)
+                if acquired:
+                    return await self._lead(key, lock_key, token, compute)
+
+        self.stats["fallbacks"] += 1
+        print(f"Single-flight wait timed out for {key}, computing locally")
+        return await compute()
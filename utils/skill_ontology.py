@@ -0,0 +1,109 @@
+import difflib
+import json
+import os
+import re
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+DEFAULT_ONTOLOGY_PATH = Path(__file__).resolve().parent.parent / "data" / "skill_ontology.json"
+
+
+def fold(text: str) -> str:
+    """Case, punctuation and whitespace folding: 'Node.JS' -> 'node js', 'C++' stays 'c++'"""
+    text = str(text or '').lower().replace('&', ' and ')
+    text = re.sub(r"[^\w\s+#]", ' ', text)
+    return re.sub(r'\s+', ' ', text).strip()
+
+
+class SkillOntology:
+    """
+    Canonicalization index for skills and career goals.
+
+    Aliases map to one canonical name ('AWS' -> 'Amazon Web Services'); anything
+    unknown is matched fuzzily against the known names when a threshold is set,
+    and otherwise kept as-is. Skill gaps are computed on canonical keys, so
+    'python' vs 'Python' or 'ML' vs 'Machine Learning' no longer count as missing.
+    """
+
+    def __init__(self, skills: Dict[str, List[str]] = None, career_goals: Dict[str, List[str]] = None,
+                 fuzzy_threshold: float = 0.0):
+        self.fuzzy_threshold = fuzzy_threshold
+        self._skill_index: Dict[str, str] = {}
+        self._goal_index: Dict[str, str] = {}
+        self._skill_aliases: Dict[str, List[str]] = {}
+        for canonical, aliases in (skills or {}).items():
+            self._skill_aliases[canonical] = [canonical] + list(aliases)
+            for name in [canonical] + list(aliases):
+                self._skill_index.setdefault(fold(name), canonical)
+        for canonical, aliases in (career_goals or {}).items():
+            for name in [canonical] + list(aliases):
+                self._goal_index.setdefault(fold(name), fold(canonical))
+        self._skill_keys = list(self._skill_index)
+        # Per-instance memo; agent output repeats the same few hundred skill names
+        self.canonical_skill = lru_cache(maxsize=4096)(self._canonical_skill)
+
+    @classmethod
+    def load(cls, path: str = None, fuzzy_threshold: float = None) -> "SkillOntology":
+        """Build the ontology from a JSON data file ({"skills": {...}, "career_goals": {...}})"""
+        path = Path(path or os.getenv('SKILL_ONTOLOGY_PATH', DEFAULT_ONTOLOGY_PATH))
+        if fuzzy_threshold is None:
+            fuzzy_threshold = float(os.getenv('SKILL_FUZZY_THRESHOLD', 0.9))
+        try:
+            with open(path, encoding='utf-8') as f:
+                data = json.load(f)
+        except Exception as e:
+            print(f"Could not load skill ontology from {path}: {e}")
+            data = {}
+        return cls(data.get('skills'), data.get('career_goals'), fuzzy_threshold)
+
+    def _canonical_skill(self, skill: str) -> str:
+        folded = fold(skill)
+        if not folded:
+            return ''
+        if folded in self._skill_index:
+            return self._skill_index[folded]
+        if self.fuzzy_threshold > 0:
+            match = difflib.get_close_matches(folded, self._skill_keys, n=1, cutoff=self.fuzzy_threshold)
+            if match:
+                return self._skill_index[match[0]]
+        return str(skill).strip()
+
+    def skill_key(self, skill: str) -> str:
+        """Stable key for a skill, shared by all of its spellings"""
+        return fold(self.canonical_skill(str(skill)))
+
+    def aliases(self, skill: str) -> List[str]:
+        """Every known spelling of a skill, canonical name first ([skill] when it's unknown)"""
+        canonical = self.canonical_skill(str(skill))
+        return self._skill_aliases.get(canonical) or [canonical or str(skill)]
+
+    def canonicalize(self, skills: Iterable[str]) -> List[str]:
+        """Canonical names, de-duplicated, in first-seen order"""
+        result: Dict[str, str] = {}
+        for skill in skills or []:
+            canonical = self.canonical_skill(str(skill))
+            if canonical:
+                result.setdefault(fold(canonical), canonical)
+        return list(result.values())
+
+    def missing_skills(self, ideal_skills: Iterable[str], student_skills: Iterable[str]) -> List[str]:
+        """Set-based gap: canonical ideal skills whose key the student doesn't have"""
+        student_keys = {self.skill_key(s) for s in student_skills or []}
+        return [s for s in self.canonicalize(ideal_skills) if fold(s) not in student_keys]
+
+    def career_goal_key(self, career_goal: str) -> str:
+        """Folded career goal with known synonyms merged ('Data Scientists' -> 'data scientist')"""
+        folded = fold(career_goal)
+        return self._goal_index.get(folded, folded)
+
+
+_ontology: Optional[SkillOntology] = None
+
+
+def get_skill_ontology() -> SkillOntology:
+    """Return the process-wide ontology, loading the data file on first use"""
+    global _ontology
+    if _ontology is None:
+        _ontology = SkillOntology.load()
+    return _ontology